@@ -0,0 +1,150 @@
+"""
+Servidor HTTP local que imita un webhook de Discord para probar DiscordSender.
+
+Registra cada payload recibido, aplica un límite de peticiones por ventana y responde
+429 con retry_after (y cabeceras X-RateLimit-*) cuando se supera, como hace Discord.
+Ejecutado como script envía una ráfaga de mensajes a través de DiscordSender y
+comprueba que llegan todos, en orden, agrupados en menos peticiones y sin violar el
+límite.
+
+Uso:
+    python benchmarks/discord_sender/stub_webhook.py --messages 200 --limit 5 --window 1.0
+    python benchmarks/discord_sender/stub_webhook.py --limit 1 --coalesce-ms 0 --interval-ms 20 --no-ratelimit-headers
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.abspath(os.path.join(BENCH_DIR, '..', '..'))
+sys.path.insert(0, os.path.join(REPO_ROOT, 'src'))
+
+
+class StubWebhookServer(ThreadingHTTPServer):
+    """Records payloads and enforces ``limit`` requests per ``window`` seconds."""
+
+    daemon_threads = True
+
+    def __init__(self, limit=5, window=1.0, send_headers=True, address=('127.0.0.1', 0)):
+        super().__init__(address, _StubHandler)
+        self.limit = limit
+        self.window = window
+        self.send_headers = send_headers  # Without X-RateLimit-* only 429 responses slow the client down
+        self.lock = threading.Lock()
+        self.payloads = []  # (time, payload)
+        self.rejected = 0
+        self.window_start = time.monotonic()
+        self.window_count = 0
+
+    @property
+    def url(self):
+        host, port = self.server_address
+        return f"http://{host}:{port}/api/webhooks/1/stub"
+
+    def admit(self):
+        """Returns (accepted, remaining, reset_after)."""
+        with self.lock:
+            now = time.monotonic()
+            if now - self.window_start >= self.window:
+                self.window_start = now
+                self.window_count = 0
+            reset_after = self.window - (now - self.window_start)
+            if self.window_count >= self.limit:
+                self.rejected += 1
+                return False, 0, reset_after
+            self.window_count += 1
+            return True, self.limit - self.window_count, reset_after
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        accepted, remaining, reset_after = self.server.admit()
+        headers = {}
+        if self.server.send_headers:
+            headers.update({
+                'X-RateLimit-Bucket': 'stub-bucket',
+                'X-RateLimit-Limit': str(self.server.limit),
+                'X-RateLimit-Remaining': str(remaining),
+                'X-RateLimit-Reset-After': f"{reset_after:.3f}",
+            })
+        if not accepted:
+            response = json.dumps({'message': 'You are being rate limited.', 'retry_after': reset_after,
+                                   'global': False}).encode()
+            self.send_response(429)
+            headers['Content-Type'] = 'application/json'
+            headers['Retry-After'] = str(max(1, round(reset_after)))
+        else:
+            with self.server.lock:
+                self.server.payloads.append((time.monotonic(), json.loads(body)))
+            response = b''
+            self.send_response(204)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(response)))
+        self.end_headers()
+        self.wfile.write(response)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def run(messages, limit, window, coalesce_ms, send_headers=True, interval_ms=0):
+    from helpers.core.discord_sender import DiscordSender
+
+    server = StubWebhookServer(limit=limit, window=window, send_headers=send_headers)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    sender = DiscordSender(coalesce_ms=coalesce_ms)
+    sent = [f"kill #{i}: Player_{i} killed by NPC_{i % 17}" for i in range(messages)]
+
+    start = time.perf_counter()
+    for line in sent:
+        sender.send(server.url, line)
+        if interval_ms:
+            time.sleep(interval_ms / 1000.0)
+    enqueue_s = time.perf_counter() - start
+    delivered = sender.stop(timeout=120)
+    total_s = time.perf_counter() - start
+    server.shutdown()
+
+    received = [line for _t, payload in server.payloads for line in payload['content'].split('\n')]
+    return {
+        'messages': messages,
+        'payloads': len(server.payloads),
+        'rejected_429': server.rejected,
+        'in_order': received == sent,
+        'all_delivered': delivered and len(received) == len(sent),
+        'max_content': max((len(payload['content']) for _t, payload in server.payloads), default=0),
+        'enqueue_us_per_msg': enqueue_s / messages * 1e6,
+        'total_s': total_s,
+        'sender_stats': sender.stats,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Exercise DiscordSender against a local stub webhook")
+    parser.add_argument('--messages', type=int, default=200, help='Messages to send')
+    parser.add_argument('--limit', type=int, default=5, help='Requests allowed per window')
+    parser.add_argument('--window', type=float, default=1.0, help='Rate limit window in seconds')
+    parser.add_argument('--coalesce-ms', type=int, default=250, help='Sender coalescing window')
+    parser.add_argument('--interval-ms', type=float, default=0, help='Delay between messages')
+    parser.add_argument('--no-ratelimit-headers', action='store_true',
+                        help='Omit X-RateLimit-* headers so only 429 responses throttle the sender')
+    parser.add_argument('-o', '--output', help='Write results as JSON to this file')
+    args = parser.parse_args()
+
+    result = run(args.messages, args.limit, args.window, args.coalesce_ms,
+                 send_headers=not args.no_ratelimit_headers, interval_ms=args.interval_ms)
+    print(json.dumps(result, indent=2))
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2)
+    sys.exit(0 if result['all_delivered'] and result['in_order'] else 1)
+
+
+if __name__ == "__main__":
+    main()
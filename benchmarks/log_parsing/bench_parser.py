@@ -0,0 +1,264 @@
+"""
+Benchmark del parser de Game.log (LogFileHandler) sin GUI, Discord ni proveedores de datos.
+
+Genera un Game.log sintético con semilla fija, construye un LogFileHandler en modo
+--no-discord/--process-once sobre un directorio temporal y mide:
+  - líneas/segundo de parse_log_entry (y de process_entire_log)
+  - coste por patrón: prefiltro (--no-prefilter en revisiones sin él), búsqueda sobre todas las líneas y sobre las que encajan
+  - coste de detect_generic, clean_trailing_ids y add_state_data
+  - asignaciones de memoria con tracemalloc
+El resultado se escribe en JSON y puede compararse con el de otro commit (--compare).
+
+Uso:
+    python benchmarks/log_parsing/bench_parser.py --lines 200000 -o bench.json
+    python benchmarks/log_parsing/bench_parser.py --compare bench_before.json
+    python benchmarks/log_parsing/bench_parser.py --no-prefilter -o bench_before.json   # commits sin prefiltro
+"""
+import argparse
+import json
+import os
+import platform
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.abspath(os.path.join(BENCH_DIR, '..', '..'))
+SRC_DIR = os.path.join(REPO_ROOT, 'src')
+sys.path.insert(0, SRC_DIR)
+sys.path.insert(0, BENCH_DIR)
+
+from generate_log import generate_game_log  # noqa: E402
+
+
+def _git_revision():
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_ROOT, stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _timed(func, repeat):
+    """Best wall time (seconds) of ``repeat`` runs of ``func``."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def build_handler(workdir, log_path):
+    """
+    Create a headless LogFileHandler that reads ``log_path`` and never leaves ``workdir``.
+
+    The application path is derived from sys.argv[0], so it is pointed at the work
+    directory to keep the error log and read checkpoint out of the repository.
+    """
+    sys.argv[0] = os.path.join(workdir, 'bench_parser.py')
+
+    from helpers.core import config_utils
+    from helpers.core.message_bus import message_bus
+
+    with open(os.path.join(SRC_DIR, 'config.json.template'), 'r', encoding='utf-8') as f:
+        config = json.load(f)
+    config.update({
+        'log_file_path': log_path,
+        'discord_webhook_url': '',
+        'google_sheets_webhook': '',
+        'datasource': 'googlesheets',
+        'username': 'BenchUser',
+    })
+    config_path = os.path.join(workdir, 'config.json')
+    with open(config_path, 'w', encoding='utf-8') as f:
+        json.dump(config, f)
+
+    config_manager = config_utils.ConfigManager(config_path=config_path)
+    config_utils._config_manager_instance = config_manager
+    config_manager.override_with_parameters(
+        process_all=False, use_discord=False, process_once=True,
+        datasource='googlesheets', log_file_path=log_path
+    )
+
+    from helpers.core.log_analyzer import LogFileHandler
+    handler = LogFileHandler()
+    # Revisions before the tail reader checkpoint have no tail_reader to disable
+    tail_reader = getattr(handler, 'tail_reader', None)
+    if tail_reader is not None:
+        tail_reader.checkpoint_path = None
+    return handler, message_bus
+
+
+def bench_parse(handler, lines, repeat):
+    def run():
+        for line in lines:
+            handler.parse_log_entry(line, send_message=False)
+    elapsed = _timed(run, repeat)
+    return {'seconds': elapsed, 'lines_per_sec': len(lines) / elapsed if elapsed else None}
+
+
+def bench_replay(handler, repeat):
+    def run():
+        handler.reset_state()
+        handler.process_entire_log()
+    elapsed = _timed(run, repeat)
+    return {'seconds': elapsed}
+
+
+def _compiled_patterns(handler):
+    """regex_patterns of the handler (public config attribute), compiled, in config order."""
+    return {name: re.compile(pattern) for name, pattern in (handler.regex_patterns or {}).items()}
+
+
+def bench_patterns(handler, lines, repeat, prefilter=True):
+    """Per-pattern cost: regex over every line and over matching lines only (plus the prefilter, if enabled).
+
+    Pass ``prefilter=False`` (``--no-prefilter``) when measuring revisions that predate the literal prefilter.
+    """
+    results = {}
+    pattern_set = handler._get_pattern_set() if prefilter else None
+    if pattern_set is not None:
+        prefilter = _timed(lambda: [pattern_set.candidates(line) for line in lines], repeat)
+        results['_prefilter'] = {'seconds': prefilter, 'ns_per_line': prefilter / len(lines) * 1e9}
+    for name, regex in _compiled_patterns(handler).items():
+        matching = [line for line in lines if regex.search(line)]
+        all_lines = _timed(lambda: [regex.search(line) for line in lines], repeat)
+        matched = _timed(lambda: [handler.detect_generic(line, regex) for line in matching], repeat) if matching else 0.0
+        results[name] = {
+            'anchor': pattern_set.anchor(name) if pattern_set is not None and name in pattern_set.names else None,
+            'matches': len(matching),
+            'scan_ns_per_line': all_lines / len(lines) * 1e9,
+            'match_us_per_hit': (matched / len(matching) * 1e6) if matching else None,
+        }
+    return results
+
+
+def bench_helpers(handler, lines, repeat):
+    patterns = _compiled_patterns(handler)
+    samples = []
+    for line in lines:
+        for regex in patterns.values():
+            data = handler.detect_generic(line, regex)
+            if data:
+                samples.append(data)
+                break
+    if not samples:
+        return {}
+    clean = _timed(lambda: [handler.clean_trailing_ids(dict(sample)) for sample in samples], repeat)
+    state = _timed(lambda: [handler.add_state_data(sample) for sample in samples], repeat)
+    return {
+        'samples': len(samples),
+        'clean_trailing_ids_us': clean / len(samples) * 1e6,
+        'add_state_data_us': state / len(samples) * 1e6,
+    }
+
+
+def bench_allocations(handler, lines):
+    tracemalloc.start(10)
+    before = tracemalloc.take_snapshot()
+    for line in lines:
+        handler.parse_log_entry(line, send_message=False)
+    current, peak = tracemalloc.get_traced_memory()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    stats = after.compare_to(before, 'lineno')
+    top = [
+        {'location': str(stat.traceback[0]), 'size_diff': stat.size_diff, 'count_diff': stat.count_diff}
+        for stat in stats[:10]
+    ]
+    return {
+        'current_bytes': current,
+        'peak_bytes': peak,
+        'allocated_blocks': sum(stat.count_diff for stat in stats if stat.count_diff > 0),
+        'top': top,
+    }
+
+
+def compare(current, baseline):
+    """Print the relative change of the headline metrics against a previous run."""
+    def pct(new, old):
+        if not old or new is None:
+            return 'n/a'
+        return f"{(new - old) / old * 100:+.1f}%"
+
+    rows = [
+        ('parse lines/sec', current['parse']['lines_per_sec'], baseline['parse']['lines_per_sec']),
+        ('replay seconds', current['replay']['seconds'], baseline['replay']['seconds']),
+        ('peak bytes', current['allocations']['peak_bytes'], baseline['allocations']['peak_bytes']),
+    ]
+    for name, data in current['patterns'].items():
+        old = baseline.get('patterns', {}).get(name, {})
+        key = 'ns_per_line' if name == '_prefilter' else 'scan_ns_per_line'
+        rows.append((f"{name} ns/line", data.get(key), old.get(key)))
+    def fmt(value):
+        return f"{value:.1f}" if value is not None else '-'
+
+    print(f"Comparison {baseline['meta'].get('revision')} -> {current['meta'].get('revision')}")
+    for name, new, old in rows:
+        print(f"  {name:<32} {fmt(old):>14} -> {fmt(new):>14} {pct(new, old)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark LogFileHandler parsing on a synthetic Game.log")
+    parser.add_argument('--lines', type=int, default=100000, help='Number of synthetic log lines')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed for the generator')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per measurement (best is kept)')
+    parser.add_argument('-o', '--output', help='Write results as JSON to this file')
+    parser.add_argument('--compare', help='Previous JSON result to compare against')
+    parser.add_argument('--no-prefilter', action='store_true',
+                        help='Skip the literal prefilter measurement (revisions without LogFileHandler._get_pattern_set)')
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='sclog_bench_')
+    try:
+        log_path = os.path.join(workdir, 'Game.log')
+        size = generate_game_log(log_path, lines=args.lines, seed=args.seed)
+        with open(log_path, 'r', encoding='utf-8') as f:
+            lines = f.readlines()
+
+        handler, message_bus = build_handler(workdir, log_path)
+        results = {
+            'meta': {
+                'revision': _git_revision(),
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'lines': len(lines),
+                'bytes': size,
+                'seed': args.seed,
+                'repeat': args.repeat,
+            },
+            'parse': bench_parse(handler, lines, args.repeat),
+            'replay': bench_replay(handler, args.repeat),
+            'patterns': bench_patterns(handler, lines, args.repeat, prefilter=not args.no_prefilter),
+            'helpers': bench_helpers(handler, lines, args.repeat),
+            'allocations': bench_allocations(handler, lines),
+        }
+        handler.stop()
+        message_bus.stop()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print(f"parse_log_entry: {results['parse']['lines_per_sec']:.0f} lines/sec "
+          f"({results['meta']['lines']} lines, {size / (1024 * 1024):.1f} MB)")
+    print(f"process_entire_log: {results['replay']['seconds']:.3f} s")
+    print(f"peak traced memory: {results['allocations']['peak_bytes'] / 1024:.0f} KiB")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            compare(results, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
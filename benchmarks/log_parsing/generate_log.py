@@ -0,0 +1,189 @@
+"""
+Generador determinista de Game.log sintéticos para los benchmarks del parser.
+
+Las líneas siguen las mismas formas que los regex_patterns de config.json.template y las
+regex de cambio de modo de LogFileHandler, mezcladas con ruido típico del juego.
+Uso: python benchmarks/log_parsing/generate_log.py --lines 200000 --seed 42 -o Game.log
+"""
+import argparse
+import random
+import sys
+from datetime import datetime, timedelta
+
+# Relative weights of each line kind; noise dominates like in a real Game.log
+DEFAULT_MIX = {
+    'noise': 900,
+    'actor_death': 12,
+    'player_death': 6,
+    'actor_stall': 15,
+    'vehicle_destruction': 8,
+    'corpse': 6,
+    'connection_flow': 20,
+    'quantum_jump': 10,
+    'connected': 1,
+    'mode_change': 2,
+    'lobby': 1,
+}
+
+PLAYERS = ['ElKoukra', 'ChiviGR', 'Nacho_SC', 'Rook_Pilot', 'Vex-Marauder', 'Tessa_77', 'Dusk']
+NPCS = ['PU_Human_Enemy_GroundCombat_NPC_123456789', 'NPC_Archetypes_Pilot_987654321', 'Kopion_Legacy_4455667']
+ZONES = ['OOC_Stanton_1_Hurston', 'AEGS_Gladius_4412345678', 'Stanton2_Orison', 'RSI_Constellation_Andromeda_9981']
+WEAPONS = ['KLWE_LaserRepeater_S3_5512345', 'BEHR_Rifle_Ballistic_01_7788990', 'unknown']
+DAMAGE_TYPES = ['Bullet', 'Explosion', 'Crash', 'Energy', 'VehicleDestruction']
+VEHICLES = ['AEGS_Gladius_4412345678', 'ANVL_Arrow_5512345678', 'DRAK_Cutlass_Black_1122334455']
+MODES = ['SC_Default', 'SC_Frontend', 'EA_FreeFlight', 'EA_SquadronBattle']
+NOISE = [
+    '[Notice] <Entity Spawn> CEntitySystem::SpawnEntity: spawned entity {n} class "AIModule_Trader" [Team_GameServices][Entity]',
+    '[Notice] <Physics> pe_status update for {n} took {f}ms [Team_Physics]',
+    '[Notice] <Inventory> Requesting inventory for player [{n}] [Team_CoreGameplayFeatures][Inventory]',
+    '[Notice] <StatObjLoad 0x{n:x} Format> Failed to load object objects/props/crate_{n}.cga [Team_Assets]',
+    '[Notice] <Streaming> CStreamEngine::Update streamed {n} bytes in {f}ms [Team_Engine][Streaming]',
+    '[Warning] <Shader> Missing shader permutation 0x{n:x} [Team_Renderer]',
+    '[Notice] <Net> Packet loss {f}% over last window [Team_Network][Network]',
+]
+
+
+class GameLogGenerator:
+    """Seeded generator of synthetic Game.log lines."""
+
+    def __init__(self, seed=42, mix=None, start=None):
+        self.random = random.Random(seed)
+        self.mix = dict(mix or DEFAULT_MIX)
+        self.kinds = list(self.mix)
+        self.weights = [self.mix[kind] for kind in self.kinds]
+        self.now = start or datetime(2025, 5, 9, 17, 0, 0)
+        self.nickname = self.random.choice(PLAYERS)
+        self.mode = None
+        self.counter = 0
+
+    def _timestamp(self):
+        self.now += timedelta(milliseconds=self.random.randint(1, 250))
+        return self.now.strftime('%Y-%m-%dT%H:%M:%S.') + f"{self.now.microsecond // 1000:03d}Z"
+
+    def _id(self):
+        return self.random.randint(100000000, 9999999999)
+
+    def _actor(self, npc_ratio=0.5):
+        if self.random.random() < npc_ratio:
+            return self.random.choice(NPCS)
+        return self.random.choice(PLAYERS)
+
+    def _direction(self):
+        return ', '.join(f"{axis}: {self.random.uniform(-1, 1):.6f}" for axis in ('x', 'y', 'z'))
+
+    def preamble(self):
+        """Lines every real session starts with: endpoint, nickname and first mode."""
+        mode = 'SC_Default'
+        self.mode = mode
+        return [
+            self._endpoint(),
+            self._channel_complete(mode),
+            self._mode_start(mode),
+        ]
+
+    def _endpoint(self):
+        return (f"<{self._timestamp()}> [Notice] <ReuseChannel> Reusing channel for Hub to endpoint "
+                f"dns:///pub-sc-alpha-410.cloudimperiumgames.com (transport security: 1)")
+
+    def _connection_fields(self, mode):
+        return (f"map=\"megamap\" gamerules=\"{mode}\" remoteAddr=35.1.2.3:64300 localAddr=10.0.0.2:64090 "
+                f"connection={{1, {self.random.randint(1, 9)}}} session=ab12-cd34 node_id=node-7f2e "
+                f"nickname=\"{self.nickname}\" playerGEID={self._id()} uptime_secs={self.random.uniform(1, 900):.3f}")
+
+    def _channel_complete(self, mode):
+        return f"<{self._timestamp()}> [Notice] <Channel Connection Complete> {self._connection_fields(mode)}"
+
+    def _mode_start(self, mode):
+        return (f"<{self._timestamp()}> [Notice] <Context Establisher Done> establisher=\"CReplicationModel\" "
+                f"runningTime={self.random.uniform(1, 60):.6f} map=\"megamap\" gamerules=\"{mode}\" "
+                f"sessionId=\"ab12-cd34\" [Team_Network][Network][Replication][Loading][Persistence]")
+
+    def _mode_end(self, mode):
+        return (f"<{self._timestamp()}> [Notice] <Channel Disconnected> cause=0 reason=\"Disconnected by user\" "
+                f"frame={self._id()} {self._connection_fields(mode)} [Team_Network][Network]")
+
+    def line(self):
+        """Return one synthetic log line (without newline)."""
+        self.counter += 1
+        kind = self.random.choices(self.kinds, weights=self.weights)[0]
+        ts = self._timestamp()
+        if kind == 'actor_death' or kind == 'player_death':
+            npc_ratio = 0.6 if kind == 'actor_death' else 0.0
+            damage = self.random.choice(DAMAGE_TYPES) if kind == 'actor_death' else 'Bullet'
+            return (f"<{ts}> [Notice] <Actor Death> CActor::Kill: '{self._actor(npc_ratio)}' [{self._id()}] "
+                    f"in zone '{self.random.choice(ZONES)}' killed by '{self._actor(npc_ratio)}' [{self._id()}] "
+                    f"using '{self.random.choice(WEAPONS)}' [Class unknown] with damage type '{damage}' "
+                    f"from direction {self._direction()} [Team_ActorTech][Actor]")
+        if kind == 'actor_stall':
+            return (f"<{ts}> [Notice] <Actor stall> Actor stall detected, Player: {self._actor(0)}, "
+                    f"Type: downstream, Length: {self.random.uniform(1, 30):.6f}. [Team_ActorTech][Actor]")
+        if kind == 'vehicle_destruction':
+            return (f"<{ts}> [Notice] <Vehicle Destruction> CVehicle::OnAdvanceDestroyLevel: "
+                    f"Vehicle '{self.random.choice(VEHICLES)}' [{self._id()}] in zone '{self.random.choice(ZONES)}' "
+                    f"[pos x: {self.random.uniform(-1e5, 1e5):.3f}, y: {self.random.uniform(-1e5, 1e5):.3f}, "
+                    f"z: {self.random.uniform(-1e5, 1e5):.3f} vel x: 0.1, y: -0.2, z: 0.0] "
+                    f"driven by '{self._actor()}' [{self._id()}] advanced from destroy level 0 to "
+                    f"{self.random.randint(1, 2)} caused by '{self._actor()}' [{self._id()}] "
+                    f"with 'Combat' [Team_VehicleFeatures][Vehicle]")
+        if kind == 'corpse':
+            return (f"<{ts}> [Notice] <[ActorState] Corpse> [ACTOR STATE][SSCActorStateCVars::LogCorpse] "
+                    f"Player '{self._actor(0)}' <remote client>: Running corpsify for corpse. [Team_ActorFeatures][Actor]")
+        if kind == 'connection_flow':
+            return (f"<{ts}> [Notice] <Connection Flow> CSCCommsComponent::DoEstablishCommunicationCommon: "
+                    f"Update bubble created for communication connection '{self._id()}' on channel "
+                    f"'{self.random.randint(1, 99)}' for {self.nickname} [{self._id()}] to track their "
+                    f"communication partner {self._actor(0.3)} [{self._id()}] [Team_CoreGameplayFeatures][Comms]")
+        if kind == 'quantum_jump':
+            return f"<{ts}> -- Entity Trying To QT: {self.random.choice(VEHICLES)}"
+        if kind == 'connected':
+            return f"<{ts}> [CSessionManager::OnClientConnected] Connected!"
+        if kind == 'mode_change':
+            old_mode = self.mode
+            self.mode = self.random.choice([m for m in MODES if m != old_mode])
+            return self._mode_end(old_mode) if old_mode and self.random.random() < 0.3 else self._mode_start(self.mode)
+        if kind == 'lobby':
+            network = self.random.choice(['Online', 'Custom'])
+            return (f"<{ts}> [Notice] <[EALobby] NotifyServiceRequestResponse> "
+                    f"[EALobby][CEALobby::NotifyServiceRequestResponse] Notifying Service Response. "
+                    f"Response[1][Ok] Network[{network}][2] Mode[GameMode.{self.random.choice(MODES[2:])}][3] "
+                    f"Map[Map_Dying_Star][4]")
+        template = self.random.choice(NOISE)
+        return f"<{ts}> " + template.format(n=self._id(), f=self.random.uniform(0, 50))
+
+    def lines(self, count):
+        """Return ``count`` lines (preamble included), each terminated with CRLF like the game."""
+        result = [line + '\r\n' for line in self.preamble()]
+        while len(result) < count:
+            result.append(self.line() + '\r\n')
+        return result[:count]
+
+
+def generate_game_log(path, lines=100000, seed=42, mix=None):
+    """
+    Write a synthetic Game.log.
+
+    Returns:
+        int: Size of the generated file in bytes.
+    """
+    content = ''.join(GameLogGenerator(seed=seed, mix=mix).lines(lines))
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        f.write(content)
+    return len(content.encode('utf-8'))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic Star Citizen Game.log")
+    parser.add_argument('-o', '--output', default='-', help='Output file (default: stdout)')
+    parser.add_argument('--lines', type=int, default=100000, help='Number of lines to generate')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed')
+    args = parser.parse_args()
+
+    if args.output == '-':
+        sys.stdout.writelines(GameLogGenerator(seed=args.seed).lines(args.lines))
+    else:
+        size = generate_game_log(args.output, lines=args.lines, seed=args.seed)
+        print(f"Generated {args.lines} lines ({size / (1024 * 1024):.1f} MB) at {args.output}")
+
+
+if __name__ == "__main__":
+    main()
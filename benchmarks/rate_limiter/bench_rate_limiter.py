@@ -0,0 +1,88 @@
+"""
+Microbenchmark de MessageRateLimiter.
+
+Mide el coste por llamada de should_send con 1k, 10k y 100k claves distintas en tres
+fases: primera aparición (alta de la clave), repetición bloqueada y caducidad (el reloj
+avanza más allá del timeout y la rueda de tiempos purga las entradas). Con un coste
+constante por llamada, los ns/llamada no deben crecer con el número de claves.
+
+Uso:
+    python benchmarks/rate_limiter/bench_rate_limiter.py --keys 1000 10000 100000 -o bench.json
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.abspath(os.path.join(BENCH_DIR, '..', '..'))
+sys.path.insert(0, os.path.join(REPO_ROOT, 'src'))
+
+from helpers.core.rate_limiter import MessageRateLimiter  # noqa: E402
+
+
+class FakeClock:
+    """Manually advanced clock so expiry can be exercised without waiting."""
+
+    def __init__(self, start=1_000_000.0):
+        self.now = start
+
+    def __call__(self):
+        return self.now
+
+
+def _ns_per_call(func, items):
+    start = time.perf_counter()
+    for item in items:
+        func(item)
+    return (time.perf_counter() - start) / len(items) * 1e9
+
+
+def bench_keys(count, timeout=300, global_limit=True):
+    clock = FakeClock()
+    limiter = MessageRateLimiter(
+        timeout=timeout, max_duplicates=1,
+        global_limit_count=10 ** 9 if global_limit else None,
+        global_limit_window=30 if global_limit else None,
+        clock=clock
+    )
+    messages = [f"<Actor Death> CActor::Kill: 'Player_{i}' killed by 'NPC_{i * 7919 % count}'" for i in range(count)]
+
+    def send(message):
+        clock.now += 0.0001
+        limiter.should_send(message, 'discord')
+
+    first = _ns_per_call(send, messages)
+    repeat = _ns_per_call(send, messages)
+    clock.now += timeout + 1
+    expire = _ns_per_call(send, messages)  # The first call purges every key through the wheel
+    return {
+        'keys': count,
+        'first_ns': first,
+        'repeat_ns': repeat,
+        'after_expiry_ns': expire,
+        'live_entries': len(limiter.messages),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Microbenchmark MessageRateLimiter.should_send")
+    parser.add_argument('--keys', type=int, nargs='+', default=[1000, 10000, 100000], help='Distinct key counts')
+    parser.add_argument('--timeout', type=int, default=300, help='Limiter timeout in seconds')
+    parser.add_argument('-o', '--output', help='Write results as JSON to this file')
+    args = parser.parse_args()
+
+    results = [bench_keys(count, timeout=args.timeout) for count in args.keys]
+    print(f"{'keys':>8} {'first ns':>10} {'repeat ns':>10} {'expiry ns':>10}")
+    for row in results:
+        print(f"{row['keys']:>8} {row['first_ns']:>10.0f} {row['repeat_ns']:>10.0f} {row['after_expiry_ns']:>10.0f}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
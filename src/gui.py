@@ -13,6 +13,7 @@ import wx
 import sys
 import os
 import traceback
+import multiprocessing
 from helpers.ui.main_frame import LogAnalyzerFrame, main
 
 def global_exception_handler(exc_type, exc_value, exc_traceback):
@@ -47,6 +48,8 @@ def global_exception_handler(exc_type, exc_value, exc_traceback):
 # for better organization and maintainability.
 
 if __name__ == "__main__":
+    # Required by the process pool used when replaying the whole log in frozen builds
+    multiprocessing.freeze_support()
     # Install global exception handler
     sys.excepthook = global_exception_handler
     from helpers.core.message_bus import message_bus, MessageLevel
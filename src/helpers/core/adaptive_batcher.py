@@ -0,0 +1,218 @@
+"""
+AdaptiveBatcher: cola de lotes para el hilo que envía datos al proveedor.
+
+Sustituye el bucle de sondeo (get con timeout + sleep) por una threading.Condition:
+el consumidor duerme hasta que hay un lote completo, se alcanza el límite de bytes o
+vence el plazo máximo de latencia del elemento más antiguo. El tamaño de lote se ajusta
+con AIMD según la latencia del proveedor: crece de forma aditiva mientras hay atraso y
+las escrituras son rápidas, y se reduce a la mitad cuando son lentas o fallan.
+"""
+import json
+import time
+import threading
+from collections import deque
+
+from helpers.core.bus_metrics import LatencyHistogram
+
+DEFAULT_MIN_BATCH_SIZE = 20
+DEFAULT_MAX_BATCH_SIZE = 500
+DEFAULT_MAX_LATENCY_MS = 500
+DEFAULT_MAX_BYTES = 1024 * 1024
+DEFAULT_TARGET_FLUSH_MS = 1000
+
+
+def _json_size(item):
+    try:
+        return len(json.dumps(item, default=str))
+    except (TypeError, ValueError):
+        return 0
+
+
+class AdaptiveBatcher:
+    """
+    Thread-safe FIFO handing out batches to a single consumer.
+
+    ``get_batch`` returns a list of items, ``[]`` when its timeout expires with nothing
+    to flush and ``None`` once the batcher is closed and drained.
+    """
+
+    def __init__(self, max_batch_size=DEFAULT_MAX_BATCH_SIZE, max_latency_ms=DEFAULT_MAX_LATENCY_MS,
+                 max_bytes=DEFAULT_MAX_BYTES, min_batch_size=DEFAULT_MIN_BATCH_SIZE,
+                 target_flush_ms=DEFAULT_TARGET_FLUSH_MS, sizeof=None):
+        """
+        Args:
+            max_batch_size: Upper bound of the adaptive batch size.
+            max_latency_ms: Longest time an item waits for its batch to fill.
+            max_bytes: Flush once the pending items add up to this many bytes.
+            min_batch_size: Starting (and lower bound of the) batch size.
+            target_flush_ms: Provider latency above which the batch size is halved.
+            sizeof: Callable estimating the size of an item in bytes (JSON length by default).
+        """
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.min_batch_size = max(1, min(int(min_batch_size), self.max_batch_size))
+        self.max_latency = max(0.0, float(max_latency_ms)) / 1000.0
+        self.max_bytes = max(1, int(max_bytes))
+        self.target_flush = max(0.001, float(target_flush_ms) / 1000.0)
+        self.sizeof = sizeof or _json_size
+        self.batch_size = self.min_batch_size
+        self._condition = threading.Condition()
+        self._items = deque()  # (enqueued_at, size, item)
+        self._bytes = 0
+        self._unfinished = 0
+        self.closed = False
+        self._reset_metrics()
+
+    def _reset_metrics(self):
+        self.batches = 0
+        self.items_flushed = 0
+        self.failed_batches = 0
+        self.last_batch_size = 0
+        self.largest_batch = 0
+        self.backlog_high_water = 0
+        self.flush_latency = LatencyHistogram()  # process_data() duration
+        self.queue_latency = LatencyHistogram()  # Enqueue -> flush of the oldest item in a batch
+
+    def __len__(self):
+        return len(self._items)
+
+    def qsize(self):
+        return len(self._items)
+
+    def empty(self):
+        return not self._items
+
+    def put(self, item, size=None):
+        """
+        Add an item; wakes the consumer only when it has something new to decide.
+
+        Returns:
+            bool: False if the batcher is already closed.
+        """
+        if size is None:
+            size = self.sizeof(item)
+        with self._condition:
+            if self.closed:
+                return False
+            self._items.append((time.monotonic(), size, item))
+            self._bytes += size
+            self._unfinished += 1
+            depth = len(self._items)
+            if depth > self.backlog_high_water:
+                self.backlog_high_water = depth
+            # First item starts the latency deadline; a full batch can be flushed right away
+            if depth == 1 or depth >= self.batch_size or self._bytes >= self.max_bytes:
+                self._condition.notify_all()
+        return True
+
+    def get_batch(self, timeout=None):
+        """
+        Wait for the next batch.
+
+        Args:
+            timeout: Seconds to wait while nothing is pending (None waits indefinitely).
+
+        Returns:
+            List of items, [] on timeout, None when closed and drained.
+        """
+        with self._condition:
+            idle_deadline = None if timeout is None else time.monotonic() + max(0.0, timeout)
+            while True:
+                now = time.monotonic()
+                if self._items:
+                    if self.closed or len(self._items) >= self.batch_size or self._bytes >= self.max_bytes:
+                        break
+                    remaining = self._items[0][0] + self.max_latency - now
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+                else:
+                    if self.closed:
+                        return None
+                    if idle_deadline is None:
+                        self._condition.wait()
+                        continue
+                    remaining = idle_deadline - now
+                    if remaining <= 0:
+                        return []
+                    self._condition.wait(remaining)
+            batch = []
+            batch_bytes = 0
+            oldest = self._items[0][0]
+            while self._items and len(batch) < self.batch_size:
+                _enqueued_at, size, item = self._items[0]
+                if batch and batch_bytes + size > self.max_bytes:
+                    break
+                self._items.popleft()
+                self._bytes -= size
+                batch_bytes += size
+                batch.append(item)
+        self.queue_latency.record((time.monotonic() - oldest) * 1000.0)
+        return batch
+
+    def record_flush(self, count, elapsed, ok=True):
+        """
+        Feed back the outcome of a flush and adapt the batch size (AIMD).
+
+        Args:
+            count: Number of items in the flushed batch.
+            elapsed: Seconds spent by the provider.
+            ok: Whether the provider accepted the batch.
+        """
+        with self._condition:
+            self.batches += 1
+            self.items_flushed += count
+            self.last_batch_size = count
+            if count > self.largest_batch:
+                self.largest_batch = count
+            self.flush_latency.record(elapsed * 1000.0)
+            if not ok:
+                self.failed_batches += 1
+            if not ok or elapsed > self.target_flush:
+                self.batch_size = max(self.min_batch_size, self.batch_size // 2)
+            elif count >= self.batch_size and len(self._items) >= self.batch_size:
+                # Still behind and the provider keeps up: grow by one step
+                self.batch_size = min(self.max_batch_size, self.batch_size + self.min_batch_size)
+
+    def task_done(self, count=1):
+        """Mark ``count`` items returned by ``get_batch`` as processed."""
+        with self._condition:
+            self._unfinished = max(0, self._unfinished - count)
+            if not self._unfinished:
+                self._condition.notify_all()
+
+    def join(self, timeout=None):
+        """
+        Block until every queued item has been marked done.
+
+        Returns:
+            bool: False if the timeout expired first.
+        """
+        with self._condition:
+            return self._condition.wait_for(lambda: not self._unfinished, timeout)
+
+    def close(self):
+        """Stop accepting items and let the consumer flush what is left immediately."""
+        with self._condition:
+            self.closed = True
+            self._condition.notify_all()
+
+    def get_metrics(self):
+        with self._condition:
+            return {
+                'batch_size': self.batch_size,
+                'batches': self.batches,
+                'failed_batches': self.failed_batches,
+                'items_flushed': self.items_flushed,
+                'avg_batch_size': self.items_flushed / self.batches if self.batches else 0.0,
+                'last_batch_size': self.last_batch_size,
+                'largest_batch': self.largest_batch,
+                'backlog': len(self._items),
+                'backlog_bytes': self._bytes,
+                'backlog_high_water': self.backlog_high_water,
+                'flush_latency': self.flush_latency.snapshot(),
+                'queue_latency': self.queue_latency.snapshot(),
+            }
+
+    def reset_metrics(self):
+        with self._condition:
+            self._reset_metrics()
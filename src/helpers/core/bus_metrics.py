@@ -0,0 +1,152 @@
+"""
+Métricas del MessageBus: latencia de callbacks por suscriptor, profundidad de colas,
+eventos por segundo y contadores de mensajes descartados/filtrados.
+
+Los histogramas usan cubetas fijas en milisegundos para que registrar una muestra sea
+O(1) y sin asignaciones; los percentiles se estiman a partir de las cubetas.
+"""
+import time
+import threading
+from bisect import bisect_left
+
+# Upper bounds (ms) of the latency buckets; the last bucket is open-ended
+LATENCY_BUCKETS_MS = (0.1, 0.5, 1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram (milliseconds)."""
+
+    __slots__ = ('counts', 'total', 'max', 'samples')
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.total = 0.0
+        self.max = 0.0
+        self.samples = 0
+
+    def record(self, elapsed_ms):
+        self.counts[bisect_left(LATENCY_BUCKETS_MS, elapsed_ms)] += 1
+        self.total += elapsed_ms
+        self.samples += 1
+        if elapsed_ms > self.max:
+            self.max = elapsed_ms
+
+    def percentile(self, fraction):
+        """Upper bound of the bucket holding the given fraction of samples, capped at the observed max."""
+        if not self.samples:
+            return 0.0
+        target = fraction * self.samples
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                return min(LATENCY_BUCKETS_MS[index], self.max) if index < len(LATENCY_BUCKETS_MS) else self.max
+        return self.max
+
+    def snapshot(self):
+        return {
+            'count': self.samples,
+            'avg_ms': self.total / self.samples if self.samples else 0.0,
+            'p50_ms': self.percentile(0.5),
+            'p95_ms': self.percentile(0.95),
+            'p99_ms': self.percentile(0.99),
+            'max_ms': self.max,
+            'total_ms': self.total,
+            'buckets': dict(zip([f"<={bound}" for bound in LATENCY_BUCKETS_MS] + ['>'], self.counts)),
+        }
+
+
+class BusMetrics:
+    """Counters and histograms fed by the MessageBus dispatcher and workers."""
+
+    def __init__(self, lane_names):
+        self.lane_names = tuple(lane_names)
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.started_at = time.time()
+            self.callbacks = {}  # {subscriber label: LatencyHistogram}
+            self.callback_errors = {}  # {subscriber label: count}
+            self.delivery = {name: LatencyHistogram() for name in self.lane_names}  # publish -> callback start
+            self.lane_high_water = {name: 0 for name in self.lane_names}
+            self.worker_high_water = {}  # {worker index: max pending}
+            self.published = {name: 0 for name in self.lane_names}
+            self.skipped = 0  # Returned early by publish()/emit(): nobody would consume them
+            self.filtered = 0  # Deliveries rejected by subscriber filters
+            self._rate_marks = {}  # {reader: (time, event counts)} so each reader gets its own rate window
+
+    def record_publish(self, lane, depth):
+        name = self.lane_names[lane]
+        self.published[name] += 1
+        if depth > self.lane_high_water[name]:
+            self.lane_high_water[name] = depth
+
+    def record_skipped(self):
+        with self._lock:
+            self.skipped += 1
+
+    def record_filtered(self):
+        with self._lock:
+            self.filtered += 1
+
+    def record_worker_depth(self, index, depth):
+        if depth > self.worker_high_water.get(index, 0):
+            self.worker_high_water[index] = depth
+
+    def record_callback(self, label, lane, delivery_ms, elapsed_ms, failed=False):
+        with self._lock:
+            histogram = self.callbacks.get(label)
+            if histogram is None:
+                histogram = self.callbacks[label] = LatencyHistogram()
+            histogram.record(elapsed_ms)
+            if delivery_ms is not None:
+                self.delivery[self.lane_names[lane]].record(delivery_ms)
+            if failed:
+                self.callback_errors[label] = self.callback_errors.get(label, 0) + 1
+
+    def event_rates(self, event_counts, reader='default'):
+        """
+        Events per second for each event name since the previous call by the same reader.
+
+        Args:
+            event_counts: {event_name: total emitted so far}
+            reader: Key of the rate window; callers polling independently must use different keys
+        """
+        now = time.time()
+        with self._lock:
+            mark_time, mark_counts = self._rate_marks.get(reader, (self.started_at, {}))
+            counts = dict(event_counts)
+            self._rate_marks[reader] = (now, counts)
+        elapsed = max(now - mark_time, 1e-6)
+        return {name: (count - mark_counts.get(name, 0)) / elapsed for name, count in counts.items()}
+
+    def snapshot(self, event_counts, reader='default'):
+        """
+        Args:
+            event_counts: {event_name: total emitted so far}, used for events/sec
+            reader: Rate window key passed to event_rates()
+        """
+        with self._lock:
+            callbacks = {label: histogram.snapshot() for label, histogram in self.callbacks.items()}
+            delivery = {name: histogram.snapshot() for name, histogram in self.delivery.items()}
+            errors = dict(self.callback_errors)
+        return {
+            'uptime_s': time.time() - self.started_at,
+            'callbacks': callbacks,
+            'callback_errors': errors,
+            'delivery_latency': delivery,
+            'lane_high_water': dict(self.lane_high_water),
+            'worker_high_water': dict(self.worker_high_water),
+            'published': dict(self.published),
+            'events_per_sec': self.event_rates(event_counts, reader),
+            'skipped': self.skipped,
+            'filtered': self.filtered,
+        }
+
+    def slowest(self, limit=5):
+        """Labels of the subscribers with the highest total callback time."""
+        with self._lock:
+            ranked = sorted(self.callbacks.items(), key=lambda item: item[1].total, reverse=True)
+            return [(label, histogram.total, histogram.max, histogram.samples) for label, histogram in ranked[:limit]]
@@ -389,7 +389,11 @@ class ConfigManager:
         with self._lock:
             try:
                 if '.' not in key_path:
+                    # ConfigDialog.save_config sets every key: only announce real changes
+                    changed = key_path not in self._config or self._config[key_path] != value
                     self._config[key_path] = value
+                    if changed:
+                        message_bus.emit('config_updated', key_path)
                 else:
                     keys = key_path.split('.')
                     config = self._config
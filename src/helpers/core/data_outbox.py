@@ -0,0 +1,214 @@
+"""
+DataOutbox: cola persistente (SQLite en modo WAL) para los eventos que van al proveedor de datos.
+
+Cada evento se guarda en disco antes de darse por encolado. El hilo de envío lo borra
+cuando el proveedor confirma la escritura; si falla, queda pendiente con un reintento
+programado (backoff exponencial). Al arrancar, todo lo que quedó sin confirmar en la
+sesión anterior vuelve a estar disponible para enviarse, de modo que una caída de
+Supabase/Google Sheets o un cierre de la aplicación no pierde bajas.
+
+Un evento que el proveedor rechaza una y otra vez (max_attempts) se aparca en la propia
+tabla (parked = 1): deja de reintentarse y de bloquear el envío, pero sigue en disco
+para revisarlo o volver a encolarlo con requeue_parked().
+"""
+import json
+import time
+import sqlite3
+import threading
+
+DEFAULT_BACKOFF_BASE = 2.0
+DEFAULT_BACKOFF_MAX = 300.0
+DEFAULT_MAX_ATTEMPTS = 10
+
+
+class DataOutbox:
+    """
+    Write-ahead outbox of data provider items.
+
+    Rows are either held by the in-memory queue (``queued = 1``) or waiting for a retry
+    (``queued = 0``). Only the latter are returned by ``take_due``, so an item is never
+    handed to the sender twice at the same time. Items that failed ``max_attempts`` times
+    are parked (``parked = 1``, dead letters) and no longer returned.
+    """
+
+    def __init__(self, path, backoff_base=DEFAULT_BACKOFF_BASE, backoff_max=DEFAULT_BACKOFF_MAX,
+                 max_attempts=DEFAULT_MAX_ATTEMPTS):
+        """
+        Args:
+            path: SQLite database file.
+            backoff_base: Delay in seconds before the first retry (doubles per attempt).
+            backoff_max: Upper bound of the retry delay in seconds.
+            max_attempts: Failed deliveries after which an item is parked instead of retried.
+        """
+        self.path = path
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.max_attempts = max(1, int(max_attempts))
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS outbox ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " sheet TEXT,"
+            " event_type TEXT,"
+            " payload TEXT NOT NULL,"
+            " created REAL NOT NULL,"
+            " attempts INTEGER NOT NULL DEFAULT 0,"
+            " next_attempt REAL NOT NULL DEFAULT 0,"
+            " queued INTEGER NOT NULL DEFAULT 0,"
+            " last_error TEXT,"
+            " parked INTEGER NOT NULL DEFAULT 0)"
+        )
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(outbox)")}
+        if 'parked' not in columns:
+            # Outbox files written before dead letters existed
+            self._conn.execute("ALTER TABLE outbox ADD COLUMN parked INTEGER NOT NULL DEFAULT 0")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS outbox_due ON outbox (queued, next_attempt)")
+        # Anything left from a previous session is no longer in memory
+        self._conn.execute("UPDATE outbox SET queued = 0 WHERE queued = 1")
+        self.recovered = self._conn.execute("SELECT COUNT(*) FROM outbox WHERE parked = 0").fetchone()[0]
+
+    def append(self, data, sheet=None, event_type=None):
+        """
+        Persist an item that is about to be put in the in-memory queue.
+
+        Returns:
+            int: Outbox id to pass to ``commit``/``fail``.
+        """
+        payload = json.dumps(data, default=str)
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT INTO outbox (sheet, event_type, payload, created, queued) VALUES (?, ?, ?, ?, 1)",
+                (sheet, event_type, payload, time.time())
+            )
+            return cursor.lastrowid
+
+    def take_due(self, limit, now=None):
+        """
+        Claim up to ``limit`` items whose retry time has come.
+
+        Returns:
+            List of (id, data, sheet, event_type), oldest first.
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, payload, sheet, event_type FROM outbox"
+                " WHERE queued = 0 AND parked = 0 AND next_attempt <= ? ORDER BY id LIMIT ?",
+                (now, int(limit))
+            ).fetchall()
+            if not rows:
+                return []
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany("UPDATE outbox SET queued = 1 WHERE id = ?", [(row[0],) for row in rows])
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        items = []
+        for outbox_id, payload, sheet, event_type in rows:
+            try:
+                items.append((outbox_id, json.loads(payload), sheet, event_type))
+            except ValueError:
+                self.commit([outbox_id])  # Unreadable payload, drop it
+        return items
+
+    def commit(self, ids):
+        """Remove delivered items."""
+        ids = [outbox_id for outbox_id in ids if outbox_id is not None]
+        if not ids:
+            return
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany("DELETE FROM outbox WHERE id = ?", [(outbox_id,) for outbox_id in ids])
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def fail(self, ids, error=None, transient=False):
+        """
+        Schedule failed items for a later retry with exponential backoff.
+
+        Items reaching ``max_attempts`` are parked instead of rescheduled, unless the
+        failure is ``transient`` (provider unreachable): an outage never parks items.
+
+        Returns:
+            int: Number of items parked by this call.
+        """
+        ids = [outbox_id for outbox_id in ids if outbox_id is not None]
+        if not ids:
+            return 0
+        now = time.time()
+        error = str(error) if error else None
+        parked = 0
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                for outbox_id in ids:
+                    row = self._conn.execute("SELECT attempts FROM outbox WHERE id = ?", (outbox_id,)).fetchone()
+                    if row is None:
+                        continue
+                    attempts = row[0] + 1
+                    if attempts >= self.max_attempts and not transient:
+                        self._conn.execute(
+                            "UPDATE outbox SET attempts = ?, queued = 0, parked = 1, last_error = ? WHERE id = ?",
+                            (attempts, error, outbox_id)
+                        )
+                        parked += 1
+                        continue
+                    delay = min(self.backoff_max, self.backoff_base * (2 ** (attempts - 1)))
+                    self._conn.execute(
+                        "UPDATE outbox SET attempts = ?, next_attempt = ?, queued = 0, last_error = ? WHERE id = ?",
+                        (attempts, now + delay, error, outbox_id)
+                    )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return parked
+
+    def requeue_parked(self):
+        """
+        Give every parked item a fresh set of attempts.
+
+        Returns:
+            int: Number of items requeued.
+        """
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE outbox SET parked = 0, attempts = 0, next_attempt = 0 WHERE parked = 1"
+            )
+            return cursor.rowcount
+
+    def next_retry_in(self, now=None):
+        """Seconds until the next waiting item is due (None when nothing is waiting)."""
+        now = time.time() if now is None else now
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT MIN(next_attempt) FROM outbox WHERE queued = 0 AND parked = 0"
+            ).fetchone()
+        if row is None or row[0] is None:
+            return None
+        return max(0.0, row[0] - now)
+
+    def pending_count(self):
+        """Number of items not yet delivered (parked items excluded)."""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM outbox WHERE parked = 0").fetchone()[0]
+
+    def parked_count(self):
+        """Number of items given up after ``max_attempts`` failed deliveries."""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM outbox WHERE parked = 1").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            try:
+                self._conn.close()
+            except sqlite3.Error:
+                pass
@@ -1,17 +1,260 @@
+import os
 import requests
 import json
+import sqlite3
 import time
+import hashlib
+import threading
+import functools
 import traceback
 import re
 from abc import ABC, abstractmethod
-from typing import Dict, List, Any, Optional, Tuple, Union
+from typing import Dict, List, Any, Optional, Tuple, Union, Iterator
 from helpers.core.message_bus import message_bus, MessageLevel
-from helpers.core.supabase_manager import supabase_manager
+from helpers.core.supabase_manager import supabase_manager, CONFLICT_COLUMN, SupabaseTransportError
+from helpers.core.result_cache import ResultCache
+from helpers.core.bus_metrics import LatencyHistogram
+from helpers.core.tab_query import TabQueryEngine, TabQueryError, tab_order_by
+from helpers.core.hash_index import RecordHashIndex, HASH_FIELDS, record_hash
+
+# PostgREST returns at most this many rows per request
+DEFAULT_PAGE_SIZE = 1000
+
+# Query results shared by every SupabaseDataProvider, keyed on (sheet, username, filters)
+result_cache = ResultCache()
+message_bus.on("schema_change", result_cache.clear)
+
+
+def _invalidate_table_results(sheets, derived=True):
+    """
+    Drop the cached results that may include rows of the given sheets.
+
+    Plain tables are matched by name. Summaries, views and dynamic tabs aggregate other
+    tables and are dropped too unless ``derived`` is False (they then expire with the TTL).
+    """
+    tables = {supabase_manager._sanitize_table_name(sheet or "game_logs") for sheet in sheets}
+    derived_names = set()
+    if derived:
+        derived_names.update(SUMMARY_SHEETS)
+        try:
+            from helpers.core.config_utils import get_config_manager
+            derived_names.update(str(tab).lower() for tab in get_config_manager().get('tabs', {}) or {})
+        except Exception:
+            pass
+
+    def affected(key):
+        name = key[0]
+        if derived and (name == 'tab' or name in derived_names or name.endswith('_view')):
+            return True
+        return supabase_manager._sanitize_table_name(name) in tables
+
+    return result_cache.invalidate(affected)
+
+
+def _on_remote_data_event(username, event_data):
+    """
+    Another client stored a log event: cached results of the table it went to are stale.
+
+    Only events in google_sheets_mapping are stored (in the table named after the mode);
+    chat, pings, stalls and the like change no table and leave the cache alone.
+    """
+    if not isinstance(event_data, dict) or not isinstance(event_data.get('raw_data'), dict):
+        return
+    from helpers.core.config_utils import get_config_manager
+    if event_data.get('type') not in (get_config_manager().get('google_sheets_mapping', []) or []):
+        return
+    raw_data = event_data['raw_data']
+    sheet = raw_data.get('sheet') or raw_data.get('mode')
+    if sheet:
+        _invalidate_table_results([sheet], derived=False)
+
+
+message_bus.on("remote_realtime_event", _on_remote_data_event)
+
+
+def _supabase_rpc(function_name, params):
+    """Call a database function through PostgREST and return its rows."""
+    result = supabase_manager.supabase.rpc(function_name, params).execute()
+    if getattr(result, 'error', None):
+        raise TabQueryError(result.error)
+    return result.data
+
+
+# Dynamic tabs run as named, parameterized functions created once per tab query
+tab_query_engine = TabQueryEngine(rpc=_supabase_rpc, execute_sql=lambda sql: supabase_manager._execute_sql(sql),
+                                  cache=result_cache)
+
+RECORD_HASH_INDEX_FILE = "record_hash_index.db"
+_record_hash_index = None  # RecordHashIndex, False once it could not be opened
+_record_hash_index_lock = threading.Lock()
+
+
+def _fetch_hash_page(table, column, watermark_column, since, offset, limit):
+    """One page of (key, watermark) rows for RecordHashIndex.refresh."""
+    query = supabase_manager.supabase.table(table).select(f"{column},{watermark_column}")
+    if since is not None:
+        query = query.gte(watermark_column, since)
+    result = query.order(watermark_column).order(column).range(offset, offset + limit - 1).execute()
+    if getattr(result, 'error', None):
+        raise RuntimeError(result.error)
+    return result.data or []
+
+
+def _count_table_rows(table):
+    """Remote row count, computed by the server (no rows are downloaded)."""
+    result = supabase_manager.supabase.table(table).select("*", count="exact").limit(1).execute()
+    return getattr(result, 'count', None)
+
+
+def get_record_hash_index() -> Optional[RecordHashIndex]:
+    """
+    Shared local index of the record hashes stored in Supabase.
+
+    Returns:
+        RecordHashIndex, or None when config 'record_hash_index' is off or the file cannot be opened
+    """
+    global _record_hash_index
+    if _record_hash_index is None:
+        with _record_hash_index_lock:
+            if _record_hash_index is None:
+                try:
+                    from helpers.core.config_utils import get_config_manager, get_application_path
+                    if not get_config_manager().get('record_hash_index', True):
+                        return None
+                    path = os.path.join(get_application_path(), RECORD_HASH_INDEX_FILE)
+                    _record_hash_index = RecordHashIndex(path, _fetch_hash_page, _count_table_rows)
+                except (sqlite3.Error, OSError) as e:
+                    message_bus.publish(
+                        content=f"Record hash index unavailable, duplicates are checked on the server: {e}",
+                        level=MessageLevel.WARNING,
+                        metadata={"source": "data_provider"}
+                    )
+                    _record_hash_index = False
+    return _record_hash_index or None
+
+
+# Month filter each Resumen view applies when it aggregates resumen_stats (resumen_mode "incremental")
+SUMMARY_MONTH_FILTERS = {
+    "resumen_view": "",
+    "resumen_mes_actual_view": " AND month = DATE_TRUNC('month', NOW())::date",
+    "resumen_mes_anterior_view": " AND month = DATE_TRUNC('month', NOW() - INTERVAL '1 month')::date",
+}
+SUMMARY_SHEETS = ("resumen", "resumen_mes_actual", "resumen_mes_anterior")
+
+
+class _FetchFailed(Exception):
+    """A query still failed after every retry (already reported on the message bus)."""
+
+
+class DataProviderUnavailable(Exception):
+    """
+    deliver_batch() could not reach the data source: the undelivered items were not
+    rejected and should be retried without counting towards giving up on them.
+
+    Attributes:
+        delivered: Positions of the items stored before the failure.
+    """
+
+    def __init__(self, message, delivered=None):
+        super().__init__(message)
+        self.delivered = list(delivered or [])
+
+
+def _project_rows(rows, columns):
+    """Copies of the rows (optionally restricted to ``columns``), so cached rows are never handed out."""
+    if not columns:
+        return (dict(row) for row in rows)
+    return ({column: row.get(column) for column in columns} for row in rows)
+
+
+class ProviderHealth:
+    """Call counts, failures and latency per operation of one provider instance."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.created_at = time.time()
+        self.operations = {}  # {operation: {'calls', 'failures', 'latency'}}
+        self.last_success = None
+        self.last_error = None
+        self.last_error_at = None
+        self.consecutive_failures = 0
+
+    def record(self, operation, elapsed, ok, error=None):
+        with self._lock:
+            stats = self.operations.get(operation)
+            if stats is None:
+                stats = self.operations[operation] = {'calls': 0, 'failures': 0, 'latency': LatencyHistogram()}
+            stats['calls'] += 1
+            stats['latency'].record(elapsed * 1000.0)
+            if ok:
+                self.last_success = time.time()
+                self.consecutive_failures = 0
+            else:
+                stats['failures'] += 1
+                self.consecutive_failures += 1
+                self.last_error_at = time.time()
+                if error is not None:
+                    self.last_error = str(error)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'uptime_s': time.time() - self.created_at,
+                'last_success': self.last_success,
+                'last_error': self.last_error,
+                'last_error_at': self.last_error_at,
+                'consecutive_failures': self.consecutive_failures,
+                'operations': {
+                    operation: {
+                        'calls': stats['calls'],
+                        'failures': stats['failures'],
+                        **{key: value for key, value in stats['latency'].snapshot().items() if key not in ('buckets', 'count')},
+                    }
+                    for operation, stats in self.operations.items()
+                },
+            }
+
+
+def _timed(operation, succeeded=lambda result: result is not False):
+    """
+    Record latency and outcome of a provider method in its ProviderHealth.
+
+    ``succeeded`` maps the method result to the outcome (by default False means failure).
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            started = time.perf_counter()
+            try:
+                result = method(self, *args, **kwargs)
+            except Exception as e:
+                self.health.record(operation, time.perf_counter() - started, False, e)
+                raise
+            self.health.record(operation, time.perf_counter() - started, succeeded(result))
+            return result
+        return wrapper
+    return decorator
+
 
 class DataProvider(ABC):
     """
     Abstract base class for data providers (Google Sheets or Supabase).
     """
+
+    @property
+    def health(self) -> ProviderHealth:
+        """Health and latency statistics of this instance (created on first use)."""
+        health = self.__dict__.get('_health')
+        if health is None:
+            health = self.__dict__.setdefault('_health', ProviderHealth())
+        return health
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Health/latency snapshot plus connection state."""
+        stats = self.health.snapshot()
+        stats['provider'] = self.__class__.__name__
+        stats['connected'] = self.is_connected()
+        return stats
     SOURCE = "data_provider"
     
     @abstractmethod
@@ -28,6 +271,28 @@ class DataProvider(ABC):
         """
         pass
     
+    def fetch_data_iter(self, table_name: str, page_size: int = DEFAULT_PAGE_SIZE,
+                        columns: Optional[List[str]] = None, username: Optional[str] = None,
+                        filters: Optional[Dict[str, Any]] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Stream the rows of a table. Providers without server-side paging fetch everything
+        and yield it row by row.
+        
+        Args:
+            table_name: The table name to fetch from
+            page_size: Rows requested per round-trip, where supported
+            columns: Only return these columns (all when None)
+            username: Optional username filter
+            filters: Optional {column: value} equality filters
+            
+        Yields:
+            Row dictionaries
+        """
+        rows = self.fetch_data(table_name, username)
+        if filters:
+            rows = [row for row in rows if all(row.get(column) == value for column, value in filters.items())]
+        yield from _project_rows(rows, columns)
+    
     @abstractmethod
     def is_connected(self) -> bool:
         """
@@ -51,6 +316,25 @@ class DataProvider(ABC):
         """
         pass
     
+    def deliver_batch(self, batch: List[Dict[str, Any]]) -> List[int]:
+        """
+        Process a batch and report which items were stored.
+        
+        Providers without per-item results deliver all or nothing.
+        
+        Args:
+            batch: List of dictionaries with 'data' and 'sheet' keys
+            
+        Returns:
+            List[int]: Positions (in batch) of the delivered items, ascending; the
+            others were rejected
+            
+        Raises:
+            DataProviderUnavailable: If the data source could not be reached (only
+                raised by providers able to tell an outage from a rejection)
+        """
+        return list(range(len(batch))) if self.process_data(batch) else []
+    
     @abstractmethod
     def fetch_config(self) -> Dict[str, Any]:
         """
@@ -95,14 +379,18 @@ class GoogleSheetsDataProvider(DataProvider):
         self.max_retries = max_retries
         self.retry_delay = retry_delay
         self._session = None
+        self._session_lock = threading.Lock()
             
     @property
     def session(self):
         """Lazy initialization of requests session"""
         if self._session is None:
-            self._session = requests.Session()
+            with self._session_lock:
+                if self._session is None:
+                    self._session = requests.Session()
         return self._session
             
+    @_timed('fetch_data')
     def fetch_data(self, table_name: str, username: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         Fetch data from Google Sheets.
@@ -131,7 +419,8 @@ class GoogleSheetsDataProvider(DataProvider):
             
         return self._make_request("GET", params=params)
     
-    def _make_request(self, method: str, params: Dict = None, data: Any = None) -> List[Dict[str, Any]]:
+    def _make_request(self, method: str, params: Dict = None, data: Any = None,
+                      raise_unavailable: bool = False) -> List[Dict[str, Any]]:
         """
         Make an HTTP request to the Google Sheets webhook with retry logic.
         
@@ -139,12 +428,18 @@ class GoogleSheetsDataProvider(DataProvider):
             method: HTTP method (GET, POST)
             params: URL parameters for the request
             data: JSON data for POST requests
+            raise_unavailable: Raise instead of returning [] when the last attempt failed
+                because the webhook was unreachable (connection error, timeout, 5xx/408/429)
             
         Returns:
             List of dictionaries with the response data or empty list on failure
+            
+        Raises:
+            DataProviderUnavailable: If raise_unavailable is set and the webhook could not be reached
         """
         attempt = 0
         last_error = None
+        unreachable = False
         
         while attempt < self.max_retries:
             try:
@@ -166,6 +461,7 @@ class GoogleSheetsDataProvider(DataProvider):
                         metadata={"source": self.SOURCE}
                     )
                     last_error = f"HTTP {response.status_code}"
+                    unreachable = response.status_code >= 500 or response.status_code in (408, 429)
                     attempt += 1
                     time.sleep(self.retry_delay)
                     continue
@@ -196,6 +492,7 @@ class GoogleSheetsDataProvider(DataProvider):
                     
             except requests.RequestException as e:
                 last_error = str(e)
+                unreachable = isinstance(e, (requests.ConnectionError, requests.Timeout))
                 message_bus.publish(
                     content=f"Network error (attempt {attempt+1}/{self.max_retries}): {e}",
                     level=MessageLevel.WARNING,
@@ -203,6 +500,7 @@ class GoogleSheetsDataProvider(DataProvider):
                 )
             except Exception as e:
                 last_error = str(e)
+                unreachable = False
                 message_bus.publish(
                     content=f"Unexpected error (attempt {attempt+1}/{self.max_retries}): {e}",
                     level=MessageLevel.ERROR,
@@ -225,6 +523,8 @@ class GoogleSheetsDataProvider(DataProvider):
             level=MessageLevel.ERROR,
             metadata={"source": self.SOURCE}
         )
+        if raise_unavailable and unreachable:
+            raise DataProviderUnavailable(f"Google Sheets webhook unreachable: {last_error}")
         return []
     
     def is_connected(self) -> bool:
@@ -248,10 +548,31 @@ class GoogleSheetsDataProvider(DataProvider):
         """
         if not batch:
             return True  # Empty batch is considered successful
+        try:
+            return len(self.deliver_batch(batch)) == len(batch)
+        except DataProviderUnavailable:
+            return False
+    
+    @_timed('process_data', succeeded=bool)
+    def deliver_batch(self, batch: List[Dict[str, Any]]) -> List[int]:
+        """
+        Send a batch to the Google Sheets webhook (all or nothing).
+        
+        Args:
+            batch: List of dictionaries with 'data' and 'sheet' keys
+            
+        Returns:
+            List[int]: Positions of every item if the webhook accepted the batch, else []
+            
+        Raises:
+            DataProviderUnavailable: If the webhook could not be reached
+        """
+        if not batch:
+            return []
             
         try:
             # Send the batch data to Google Sheets webhook
-            result = self._make_request("POST", data=batch)
+            result = self._make_request("POST", data=batch, raise_unavailable=True)
             
             # Check if the request was successful (non-empty result list)
             success = len(result) > 0 if result else False
@@ -268,7 +589,9 @@ class GoogleSheetsDataProvider(DataProvider):
                     metadata={"source": self.SOURCE}
                 )
             
-            return success
+            return list(range(len(batch))) if success else []
+        except DataProviderUnavailable:
+            raise
         except Exception as e:
             message_bus.publish(
                 content=f"Unhandled exception during batch processing: {e}",
@@ -280,8 +603,9 @@ class GoogleSheetsDataProvider(DataProvider):
                 level=MessageLevel.DEBUG,
                 metadata={"source": self.SOURCE}
             )
-            return False
+            return []
 
+    @_timed('fetch_config')
     def fetch_config(self) -> Dict[str, Any]:
         """
         Fetch configuration data from Google Sheets.
@@ -328,6 +652,7 @@ class GoogleSheetsDataProvider(DataProvider):
             )
             return {}
 
+    @_timed('purge')
     def purge(self, table_name: str, username: Optional[str] = None) -> bool:
         """
         No-op implementation for Google Sheets as purging is not needed.
@@ -372,7 +697,13 @@ class SupabaseDataProvider(DataProvider):
         self.retry_delay = retry_delay
         # Single list of excluded fields for all tables
         self.excluded_fields = ['direction_x', 'direction_y', 'direction_z']
-        
+        # Resumen views: mode each one was (re)created with in this process, and the last
+        # result of each summary sheet with the resumen_stats freshness it was read at
+        self._summary_view_modes = {}
+        self._summary_snapshots = {}
+        self._resumen_stats_ready = False
+        self._generic_query_function_ready = False  # Checked (or created) once per instance
+
         # Ensure generic query function exists on initialization
         try:
             self._ensure_generic_query_function_exists()
@@ -386,7 +717,11 @@ class SupabaseDataProvider(DataProvider):
     def _ensure_generic_query_function_exists(self):
         """
         Ensure the execute_generic_query function exists by testing it, create if it fails.
+        
+        The probe runs once per instance; later calls return right away.
         """
+        if self._generic_query_function_ready:
+            return True
         if not supabase_manager.is_connected():
             return False
         
@@ -398,6 +733,7 @@ class SupabaseDataProvider(DataProvider):
             ).execute()
             
             # If we get here without exception, function exists and works
+            self._generic_query_function_ready = True
             return True
             
         except Exception as e:
@@ -408,6 +744,7 @@ class SupabaseDataProvider(DataProvider):
                 metadata={"source": self.SOURCE}
             )
             self._create_generic_query_function()
+            self._generic_query_function_ready = True
             return True
     
     def _create_generic_query_function(self):
@@ -458,22 +795,89 @@ class SupabaseDataProvider(DataProvider):
             )
             raise
     
-    def _execute_dynamic_query(self, tab_name: str, query: str, username: Optional[str] = None) -> List[Dict[str, Any]]:
-        """Execute a dynamic query using the generic query function."""
+    def _execute_dynamic_query(self, tab_name: str, query: str, username: Optional[str] = None,
+                               limit: Optional[int] = None, offset: int = 0) -> List[Dict[str, Any]]:
+        """Execute a dynamic tab query with bound parameters."""
+        rows = self._run_tab_query(tab_name, query, username, limit=limit, offset=offset)
+        return rows if rows is not None else []
+
+    def fetch_tab(self, tab_name: str, username: Optional[str] = None, date_from=None, date_to=None,
+                  limit: Optional[int] = None, offset: int = 0) -> List[Dict[str, Any]]:
+        """
+        Run a dynamic tab from config['tabs'] with typed parameters.
+        
+        Args:
+            tab_name: Tab name as configured
+            username: Only rows of this user (tabs with a username column)
+            date_from: Inclusive start of the date range (date, datetime or ISO string)
+            date_to: Exclusive end of the date range
+            limit: Maximum number of rows
+            offset: Rows to skip
+            
+        Returns:
+            List of dictionaries containing the fetched data
+        """
+        source = self._resolve_source(tab_name)
+        if source is None or source[0] != 'dynamic':
+            message_bus.publish(
+                content=f"'{tab_name}' is not a dynamic tab",
+                level=MessageLevel.WARNING,
+                metadata={"source": self.SOURCE}
+            )
+            return []
+        rows = self._run_tab_query(tab_name, source[1], username, date_from, date_to, limit, offset)
+        return rows if rows is not None else []
+
+    def _run_tab_query(self, tab_name: str, query: str, username: Optional[str] = None, date_from=None, date_to=None,
+                       limit: Optional[int] = None, offset: int = 0) -> Optional[List[Dict[str, Any]]]:
+        """Rows of a dynamic tab, or None if the query failed (already reported)."""
+        # Only apply username filter to tabs with "user" in the name
+        if not ('user' in tab_name.lower()):
+            username = None
+        try:
+            return tab_query_engine.execute(tab_name, query, username=username, date_from=date_from,
+                                            date_to=date_to, limit=limit, offset=offset)
+        except (TypeError, ValueError) as e:
+            message_bus.publish(
+                content=f"Invalid parameters for tab '{tab_name}': {e}",
+                level=MessageLevel.ERROR,
+                metadata={"source": self.SOURCE}
+            )
+            return None
+        except TabQueryError as e:
+            if date_from is not None or date_to is not None:
+                message_bus.publish(
+                    content=f"Failed to execute dynamic query for tab '{tab_name}': {e}",
+                    level=MessageLevel.ERROR,
+                    metadata={"source": self.SOURCE}
+                )
+                return None
+            message_bus.publish(
+                content=f"Parameterized query unavailable for tab '{tab_name}', using the generic function: {e}",
+                level=MessageLevel.WARNING,
+                metadata={"source": self.SOURCE}
+            )
+        return self._execute_generic_query(tab_name, query, username, limit, offset)
+
+    def _execute_generic_query(self, tab_name: str, query: str, username: Optional[str] = None,
+                               limit: Optional[int] = None, offset: int = 0) -> Optional[List[Dict[str, Any]]]:
+        """Fallback: run the tab SQL through execute_generic_query (no plan reuse)."""
         try:
             # Ensure generic function exists
             self._ensure_generic_query_function_exists()
             
             # Clean query to single line and wrap with subquery for username filtering if needed
-            # Only apply username filter to tabs with "user" in the name
             clean_base_query = ' '.join(query.split())
             
-            if username and 'user' in tab_name.lower():
-                wrapped_query = f"SELECT * FROM ({clean_base_query}) subq WHERE username = '{username}'"
+            if username:
+                # Quote the literal: the generic function has no bind parameters
+                wrapped_query = f"SELECT * FROM ({clean_base_query}) subq WHERE username = '{str(username).replace(chr(39), chr(39) * 2)}'"
             else:
                 wrapped_query = clean_base_query
-            
-            # Call generic function directly via RPC
+            if limit is not None:
+                # Same deterministic order as the parameterized functions, so pages never overlap
+                wrapped_query = (f"SELECT * FROM ({wrapped_query}) paged ORDER BY {tab_order_by(clean_base_query, 'paged')} "
+                                 f"LIMIT {int(limit)} OFFSET {int(offset or 0)}")
             
             try:
                 # Call the function directly via RPC
@@ -509,7 +913,7 @@ class SupabaseDataProvider(DataProvider):
                     level=MessageLevel.ERROR,
                     metadata={"source": self.SOURCE}
                 )
-                return []
+                return None
             
             # Parse JSON results 
             return self._parse_json_recordset(result)
@@ -520,8 +924,7 @@ class SupabaseDataProvider(DataProvider):
                 level=MessageLevel.ERROR,
                 metadata={"source": self.SOURCE}
             )
-            # Return empty result in expected format
-            return []
+            return None
     
     def _parse_json_recordset(self, json_results):
         """Parse JSON recordset from generic function into expected list of dicts format."""
@@ -568,10 +971,30 @@ class SupabaseDataProvider(DataProvider):
             batch: List of dictionaries with 'data' and 'sheet' keys
             
         Returns:
-            bool: True if processing was successful, False otherwise
+            bool: True if every item was stored, False otherwise
+        """
+        try:
+            return len(self.deliver_batch(batch)) == len(batch)
+        except DataProviderUnavailable:
+            return False
+    
+    @_timed('process_data', succeeded=bool)
+    def deliver_batch(self, batch: List[Dict[str, Any]]) -> List[int]:
+        """
+        Insert a batch into Supabase and report which items were stored.
+        
+        Args:
+            batch: List of dictionaries with 'data' and 'sheet' keys
+            
+        Returns:
+            List[int]: Positions (in batch) of the delivered items, ascending; the
+            others were rejected
+            
+        Raises:
+            DataProviderUnavailable: If Supabase could not be reached
         """
         if not batch:
-            return True  # Empty batch is considered successful
+            return []
             
         if not supabase_manager.is_connected():
             message_bus.publish(
@@ -579,40 +1002,58 @@ class SupabaseDataProvider(DataProvider):
                 level=MessageLevel.ERROR,
                 metadata={"source": self.SOURCE}
             )
-            return False
+            raise DataProviderUnavailable("Supabase is not connected")
+        
+        # Every item is sent: the server dedups on hash_value, while the local index may be
+        # stale (rows purged by another client). It only learns what we store, for DataTransfer.
+        index = get_record_hash_index()
+        keys = self._index_keys(batch) if index is not None else [None] * len(batch)
         
+        written = []
+        unavailable = None
         try:
-            success_count = 0
-            for item in batch:
-                data = item.get('data', {})
-                sheet = item.get('sheet', 'game_logs')
-                
-                if supabase_manager.insert_data(sheet, 
-                                                {k.lower(): v for k, v in data.items() if k not in self.excluded_fields}):
-                    success_count += 1
+            # One multi-row request per table instead of one round-trip per item
+            try:
+                written = supabase_manager.insert_batch(batch, self.excluded_fields)
+            except SupabaseTransportError as e:
+                # Rows stored before the failure are delivered; the rest is retried later
+                written, unavailable = e.written, e
+            if written:
+                # Our own inserts change tables and the summaries built on them
+                _invalidate_table_results({batch[position].get('sheet') for position in written})
+                tables = {}
+                for position in written:
+                    key = keys[position]
+                    if key is not None:
+                        tables.setdefault(key[0], []).append(key[1])
+                for table, table_keys in tables.items():
+                    index.add(table, table_keys)
             
             # Report results
-            if success_count == len(batch):
+            if unavailable is not None:
+                message_bus.publish(
+                    content=f"Supabase unavailable, {len(batch) - len(written)} items will be retried: {unavailable}",
+                    level=MessageLevel.WARNING,
+                    metadata={"source": self.SOURCE}
+                )
+            elif len(written) == len(batch):
                 message_bus.publish(
                     content=f"Successfully processed all {len(batch)} items",
                     level=MessageLevel.INFO,
                     metadata={"source": self.SOURCE}
                 )
-                return True
-            elif success_count > 0:
+            elif written:
                 message_bus.publish(
-                    content=f"Partially successful: processed {success_count}/{len(batch)} items",
+                    content=f"Partially successful: processed {len(written)}/{len(batch)} items",
                     level=MessageLevel.WARNING,
                     metadata={"source": self.SOURCE}
                 )
-                return success_count > 0  # Consider partial success as success
             else:
                 message_bus.publish(
                     content="Failed to process any items in the batch",
                     level=MessageLevel.ERROR,
                     metadata={"source": self.SOURCE}
                 )
-                return False
                 
         except Exception as e:
             message_bus.publish(
@@ -625,12 +1066,40 @@ class SupabaseDataProvider(DataProvider):
                 level=MessageLevel.DEBUG,
                 metadata={"source": self.SOURCE}
             )
-            return False
+            return written
+        if unavailable is not None:
+            raise DataProviderUnavailable(str(unavailable), written) from unavailable
+        return written
         
+    def _index_keys(self, batch: List[Dict[str, Any]]) -> List[Optional[Tuple[str, str]]]:
+        """
+        (table, record hash) of each item going to a table that dedups on CONFLICT_COLUMN.
+
+        Returns:
+            One entry per item; None for items the hash index does not apply to
+        """
+        tables = {}  # {sheet: sanitized table name, or None if it has no hash_value conflict target}
+        keys = []
+        for item in batch:
+            data = item.get('data', {})
+            if not all(field in data for field in HASH_FIELDS):
+                keys.append(None)
+                continue
+            sheet = item.get('sheet') or "game_logs"
+            if sheet not in tables:
+                table_name = supabase_manager._sanitize_table_name(sheet)
+                tables[sheet] = table_name if supabase_manager._conflict_target(table_name) == CONFLICT_COLUMN else None
+            keys.append((tables[sheet], record_hash(data)) if tables[sheet] else None)
+        return keys
+
+    @_timed('fetch_data')
     def fetch_data(self, table_name: str, username: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         Fetch data from Supabase.
         
+        Results are served from the shared result cache while fresh; every page of the
+        table is read on a miss, so results are no longer truncated at 1000 rows.
+        
         Args:
             table_name: The table name to fetch from
             username: Optional username filter
@@ -644,47 +1113,106 @@ class SupabaseDataProvider(DataProvider):
                 level=MessageLevel.ERROR,
                 metadata={"source": self.SOURCE}
             )
-            return []        # Special handling for "Resumen" (summary) table
-        if table_name.lower() == "resumen":
-            # Check if view exists, create it if it doesn't
-            if not self._ensure_resumen_view_exists():
-                message_bus.publish(
-                    content="Failed to create or verify Resumen view",
-                    level=MessageLevel.ERROR,
-                    metadata={"source": self.SOURCE}
-                )
-                return []
-            
-            # Use the view directly - table_name is already "resumen_view" in the database
-            return self._execute_table_query("resumen_view")
-            
-        # Special handling for "Resumen_Mes_Actual" (current month summary) table
-        if table_name.lower() == "resumen_mes_actual":
-            # Check if view exists, create it if it doesn't
-            if not self._ensure_resumen_mes_actual_view_exists():
+            return []
+
+        cache_key = (table_name.lower(), username, None)
+        hit, rows = result_cache.get(cache_key)
+        if hit:
+            message_bus.publish(
+                content=f"Served {len(rows)} records for '{table_name}' from the result cache",
+                level=MessageLevel.DEBUG,
+                metadata={"source": self.SOURCE}
+            )
+            return [dict(row) for row in rows]
+
+        # Incremental summaries: one cheap freshness read tells whether the last result still holds
+        freshness = None
+        if table_name.lower() in SUMMARY_SHEETS and self._summary_mode() == 'incremental':
+            freshness = self._summary_freshness()
+            snapshot = self._summary_snapshots.get(cache_key)
+            if freshness is not None and snapshot is not None and snapshot[0] == freshness:
                 message_bus.publish(
-                    content="Failed to create or verify Resumen Mes Actual view",
-                    level=MessageLevel.ERROR,
+                    content=f"'{table_name}' unchanged since {freshness[0]}, reusing {len(snapshot[1])} records",
+                    level=MessageLevel.DEBUG,
                     metadata={"source": self.SOURCE}
                 )
-                return []
-            
-            # Use the view directly
-            return self._execute_table_query("resumen_mes_actual_view")
+                result_cache.put(cache_key, snapshot[1])
+                return [dict(row) for row in snapshot[1]]
+
+        try:
+            rows = list(self._iter_rows(table_name, username=username))
+        except _FetchFailed:
+            return []
+        result_cache.put(cache_key, rows)
+        if freshness is not None:
+            self._summary_snapshots[cache_key] = (freshness, rows)
+        # Callers get their own dicts: the cached rows are shared
+        return [dict(row) for row in rows]
+
+    def fetch_data_iter(self, table_name: str, page_size: int = DEFAULT_PAGE_SIZE,
+                        columns: Optional[List[str]] = None, username: Optional[str] = None,
+                        filters: Optional[Dict[str, Any]] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Stream the rows of a table, view or dynamic tab one page at a time.
+        
+        Args:
+            table_name: The table name to fetch from
+            page_size: Rows requested per round-trip (PostgREST caps it at 1000)
+            columns: Only select these columns (all when None)
+            username: Optional username filter
+            filters: Optional {column: value} equality filters
             
-        # Special handling for "Resumen_Mes_Anterior" (previous month summary) table
-        if table_name.lower() == "resumen_mes_anterior":
-            # Check if view exists, create it if it doesn't
-            if not self._ensure_resumen_mes_anterior_view_exists():
+        Yields:
+            Row dictionaries
+        """
+        if not supabase_manager.is_connected():
+            message_bus.publish(
+                content="Supabase is not connected",
+                level=MessageLevel.ERROR,
+                metadata={"source": self.SOURCE}
+            )
+            return
+
+        # A fresh full result already answers an unfiltered request
+        if not filters:
+            hit, rows = result_cache.get((table_name.lower(), username, None))
+            if hit:
+                yield from _project_rows(rows, columns)
+                return
+
+        try:
+            yield from self._iter_rows(table_name, page_size, columns, username, filters)
+        except _FetchFailed:
+            return
+
+    def _resolve_source(self, table_name: str) -> Optional[Tuple[str, str]]:
+        """
+        Work out what a sheet name refers to.
+        
+        Returns:
+            ('view', view name), ('dynamic', query) or ('table', sanitized table name);
+            None if a summary view could not be created
+        """
+        # Special handling for the summary tables: check the view exists, create it if it doesn't
+        summary_views = {
+            "resumen": ("resumen_view", self._ensure_resumen_view_exists, "Resumen"),
+            "resumen_mes_actual": ("resumen_mes_actual_view", self._ensure_resumen_mes_actual_view_exists,
+                                   "Resumen Mes Actual"),
+            "resumen_mes_anterior": ("resumen_mes_anterior_view", self._ensure_resumen_mes_anterior_view_exists,
+                                     "Resumen Mes Anterior"),
+        }
+        summary = summary_views.get(table_name.lower())
+        if summary:
+            view_name, ensure_view, label = summary
+            if not ensure_view():
                 message_bus.publish(
-                    content="Failed to create or verify Resumen Mes Anterior view",
+                    content=f"Failed to create or verify {label} view",
                     level=MessageLevel.ERROR,
                     metadata={"source": self.SOURCE}
                 )
-                return []
-            
+                return None
             # Use the view directly
-            return self._execute_table_query("resumen_mes_anterior_view")
+            return 'view', view_name
             
         # Check if this is a dynamic tab from config (not a standard table)
         config_tabs = {}
@@ -702,22 +1230,41 @@ class SupabaseDataProvider(DataProvider):
         
         # Check if this is a dynamic tab from the config
         if table_name in config_tabs:
-            # This is a dynamic tab, create or verify the view exists
-            query = config_tabs[table_name]
-            
             message_bus.publish(
                 content=f"Found dynamic tab '{table_name}', executing via generic function",
                 level=MessageLevel.DEBUG,
                 metadata={"source": self.SOURCE}
             )
-            
-            # Execute dynamic query via generic function
-            return self._execute_dynamic_query(table_name, query, username)
+            return 'dynamic', config_tabs[table_name]
             
         # Standard table query for regular tables
         # Sanitize the table name to match how it would be stored
-        sanitized_table = supabase_manager._sanitize_table_name(table_name)
-        return self._execute_table_query(sanitized_table, username=username)
+        return 'table', supabase_manager._sanitize_table_name(table_name)
+
+    def _iter_rows(self, table_name: str, page_size: int = DEFAULT_PAGE_SIZE, columns: Optional[List[str]] = None,
+                   username: Optional[str] = None, filters: Optional[Dict[str, Any]] = None) -> Iterator[Dict[str, Any]]:
+        """Rows of a sheet; raises _FetchFailed when a page cannot be read."""
+        source = self._resolve_source(table_name)
+        if source is None:
+            raise _FetchFailed(table_name)
+        kind, target = source
+        if kind == 'dynamic':
+            # Dynamic tabs run as parameterized functions, paged with LIMIT/OFFSET
+            offset = 0
+            while True:
+                rows = self._run_tab_query(table_name, target, username, limit=page_size, offset=offset)
+                if rows is None:
+                    raise _FetchFailed(table_name)
+                matching = rows
+                if filters:
+                    matching = [row for row in rows if all(row.get(column) == value for column, value in filters.items())]
+                yield from _project_rows(matching, columns)
+                if len(rows) < page_size:
+                    return
+                offset += page_size
+        # Summary views aggregate every user, they are not filtered by username
+        for page in self._iter_table_pages(target, None if kind == 'view' else username, page_size, columns, filters):
+            yield from page
    
     def has_column(self, table_name: str, column_name: str) -> bool:
         """
@@ -739,7 +1286,7 @@ class SupabaseDataProvider(DataProvider):
     
     def _execute_table_query(self, table_name: str, username: Optional[str] = None) -> List[Dict[str, Any]]:
         """
-        Execute a query against a Supabase table with retry logic.
+        Execute a query against a Supabase table with retry logic, reading every page.
         
         Args:
             table_name: The sanitized table name to query
@@ -748,93 +1295,105 @@ class SupabaseDataProvider(DataProvider):
         Returns:
             List of dictionaries containing the fetched data
         """
+        rows = []
+        try:
+            for page in self._iter_table_pages(table_name, username):
+                rows.extend(page)
+        except _FetchFailed:
+            return []
+        return rows
+
+    def _page_order(self, table_name: str) -> List[Tuple[str, bool]]:
+        """(column, descending) pairs giving a stable order for range pagination."""
+        if table_name.endswith("_view"):
+            # Summary views with kdr_live are ranked by it; other views may not have created_at
+            if "resumen" in table_name.lower() and self.has_column(table_name, 'kdr_live'):
+                return [('kdr_live', True)]
+            return []
+        order = [('created_at', True)]
+        if self.has_column(table_name, 'id'):
+            order.append(('id', True))  # Tie-breaker so rows sharing created_at are not skipped between pages
+        return order
+
+    def _iter_table_pages(self, table_name: str, username: Optional[str] = None, page_size: int = DEFAULT_PAGE_SIZE,
+                          columns: Optional[List[str]] = None,
+                          filters: Optional[Dict[str, Any]] = None) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Yield a table or view in pages using range() requests.
+        
+        Raises:
+            _FetchFailed: When a page still fails after max_retries attempts.
+        """
         # Check if the table exists before attempting to query it
-        # Skip check for resumen_view which is created on demand with _ensure_resumen_view_exists
         if not supabase_manager._table_exists(table_name):
             message_bus.publish(
                 content=f"Table '{table_name}' does not exist yet. It will be created when data is first inserted.",
                 level=MessageLevel.INFO,
                 metadata={"source": self.SOURCE}
             )
-            return []  # Return empty results instead of attempting to query a non-existent table
+            return  # No rows instead of attempting to query a non-existent table
+
+        page_size = max(1, min(int(page_size), DEFAULT_PAGE_SIZE))
+        select = ','.join(columns) if columns else '*'
+        filter_username = bool(username) and self.has_column(table_name, 'username')
+        order = self._page_order(table_name)
+        start = 0
+        total = 0
+        while True:
+            page = self._fetch_page(table_name, select, username if filter_username else None, filters,
+                                    order, start, start + page_size - 1)
+            total += len(page)
+            if page:
+                yield page
+            if len(page) < page_size:
+                break
+            start += page_size
+
+        order_msg = f" ordered by {', '.join(column for column, _desc in order)}" if order else ""
+        message_bus.publish(
+            content=f"Successfully fetched {total} records from '{table_name}'{order_msg}",
+            level=MessageLevel.DEBUG,
+            metadata={"source": self.SOURCE}
+        )
+
+    def _fetch_page(self, table_name: str, select: str, username: Optional[str], filters: Optional[Dict[str, Any]],
+                    order: List[Tuple[str, bool]], start: int, end: int) -> List[Dict[str, Any]]:
+        """
+        Fetch rows ``start``..``end`` (inclusive) with retries.
         
+        If the server rejects one of the order columns, ``order`` is emptied so the remaining
+        pages are read unordered too; other errors are retried with the same order.
+        """
         attempt = 0
         last_error = None
         
         while attempt < self.max_retries:
             try:
                 # Build the query
-                query = supabase_manager.supabase.table(table_name).select('*')
-                
-                # Add username filter if provided
-                if username and self.has_column(table_name, 'username'):
+                query = supabase_manager.supabase.table(table_name).select(select)
+                if username:
                     query = query.eq('username', username)
-                      # Determine if this is a view by checking if the name ends with "_view"
-                is_view = table_name.endswith("_view")
-                
-                if is_view:
-                    # Verificar si es una vista de resumen con kdr_live
-                    is_resumen_view = "resumen" in table_name.lower() and table_name.endswith("_view")
-                    has_kdr_live = is_resumen_view and self.has_column(table_name, 'kdr_live')
-                    
-                    # For views, don't try to order by created_at as it may not exist
-                    try:
-                        if has_kdr_live:
-                            result = query.order('kdr_live', desc=True).execute()
-                        else:
-                            result = query.execute()
-                        data = result.data if hasattr(result, 'data') else []
-                        
-                        order_msg = " ordered by kdr_live DESC" if has_kdr_live else ""
-                        message_bus.publish(
-                            content=f"Successfully fetched {len(data)} records from view '{table_name}'{order_msg}",
-                            level=MessageLevel.DEBUG,
-                            metadata={"source": self.SOURCE}
-                        )
-                        return data
-                    except Exception as e:
-                        message_bus.publish(
-                            content=f"Error querying view '{table_name}': {e}",
-                            level=MessageLevel.ERROR,
-                            metadata={"source": self.SOURCE}
-                        )
-                        message_bus.publish(
-                            content=traceback.format_exc(),
-                            level=MessageLevel.DEBUG,
-                            metadata={"source": self.SOURCE}
-                        )
-                        raise  # Re-raise to handle in the outer exception block
-                else:
-                    # For regular tables, try ordered query (by created_at)
-                    try:
-                        result = query.order('created_at', desc=True).execute()
-                        data = result.data if hasattr(result, 'data') else []
-                        message_bus.publish(
-                            content=f"Successfully fetched {len(data)} records from table '{table_name}'",
-                            level=MessageLevel.DEBUG,
-                            metadata={"source": self.SOURCE}
-                        )
-                        return data
-                    except Exception as order_error:
-                        # Ordering failed, try without ordering
-                        message_bus.publish(
-                            content=f"Order by created_at failed, trying without: {order_error}",
-                            level=MessageLevel.DEBUG,
-                            metadata={"source": self.SOURCE}
-                        )
-                        result = query.execute()
-                        data = result.data if hasattr(result, 'data') else []
-                        message_bus.publish(
-                            content=f"Successfully fetched {len(data)} records from table '{table_name}' (unordered)",
-                            level=MessageLevel.DEBUG,
-                            metadata={"source": self.SOURCE}
-                        )
-                        return data
-                    
+                for column, value in (filters or {}).items():
+                    query = query.eq(column, value)
+                for column, desc in order:
+                    query = query.order(column, desc=desc)
+                result = query.range(start, end).execute()
+                return result.data if hasattr(result, 'data') and result.data else []
             except Exception as e:
+                if order and self._is_order_error(e, order):
+                    # Ordering failed, try without ordering
+                    message_bus.publish(
+                        content=f"Order by {', '.join(column for column, _desc in order)} failed on '{table_name}', "
+                                f"trying without: {e}",
+                        level=MessageLevel.DEBUG,
+                        metadata={"source": self.SOURCE}
+                    )
+                    order.clear()
+                    continue
                 last_error = str(e)
                 message_bus.publish(
-                    content=f"Error fetching from table '{table_name}' (attempt {attempt+1}/{self.max_retries}): {e}",
+                    content=f"Error fetching from table '{table_name}' rows {start}-{end} "
+                            f"(attempt {attempt+1}/{self.max_retries}): {e}",
                     level=MessageLevel.WARNING,
                     metadata={"source": self.SOURCE}
                 )
@@ -855,8 +1414,268 @@ class SupabaseDataProvider(DataProvider):
             level=MessageLevel.ERROR,
             metadata={"source": self.SOURCE}
         )
-        return []
-        
+        raise _FetchFailed(table_name)
+
+    @staticmethod
+    def _is_order_error(error: Exception, order: List[Tuple[str, bool]]) -> bool:
+        """Whether a failed query is blamed on its ORDER BY (e.g. a view without created_at)."""
+        message = str(error).lower()
+        if 'parse order' in message:
+            return True
+        return ('42703' in message or 'does not exist' in message or 'column' in message) and \
+            any(column.lower() in message for column, _desc in order)
+
+    def _summary_mode(self) -> str:
+        """
+        How the Resumen views are computed (config 'resumen_mode').
+
+        Returns:
+            str: 'view' to aggregate every kill row on each read, 'incremental' to read the
+            per-(username, month) counters kept up to date by triggers in resumen_stats
+        """
+        try:
+            from helpers.core.config_utils import get_config_manager
+            return get_config_manager().get('resumen_mode', 'view')
+        except Exception:
+            return 'view'
+
+    def _summary_view_current(self, view_name: str, incremental: bool) -> bool:
+        """Whether an existing Resumen view can be used as it is in the configured mode."""
+        applied = self._summary_view_modes.get(view_name)
+        if incremental:
+            return applied == 'incremental'
+        # A view left over from the incremental mode is rebuilt once as a plain view
+        return applied == 'view' or not supabase_manager._table_exists("resumen_stats")
+
+    def _summary_freshness(self) -> Optional[Tuple[Any, str]]:
+        """
+        Freshness stamp of the incremental summaries.
+
+        Returns:
+            (latest resumen_stats.updated_at, current UTC month), or None if it cannot be read
+        """
+        try:
+            response = supabase_manager.supabase.table("resumen_stats").select("updated_at") \
+                .order("updated_at", desc=True).limit(1).execute()
+        except Exception as e:
+            message_bus.publish(
+                content=f"Could not read resumen_stats freshness: {e}",
+                level=MessageLevel.DEBUG,
+                metadata={"source": self.SOURCE}
+            )
+            return None
+        latest = response.data[0].get('updated_at') if response.data else None
+        # The monthly views move on at the start of a month even if no counter changed
+        return latest, time.strftime('%Y-%m', time.gmtime())
+
+    def _ensure_resumen_stats_exists(self) -> bool:
+        """
+        Ensure the incremental summary table and its triggers exist.
+
+        resumen_stats keeps kills and deaths per (username, month, mode). AFTER INSERT,
+        UPDATE and DELETE triggers on sc_default (live) and ea_squadronbattle (sb) adjust
+        the counters row by row with the same rules as the plain views (reported by the
+        player, not in a tournament), so the Resumen views aggregate one row per player
+        and month instead of every kill. The table is backfilled from the existing rows
+        when it is created; both source tables are locked meanwhile so no insert is missed
+        or counted twice.
+
+        Returns:
+            bool: True if the table and triggers are in place, False otherwise
+        """
+        if self._resumen_stats_ready:
+            return True
+
+        message_bus.publish(
+            content="Creating or updating incremental Resumen summary table in Supabase",
+            level=MessageLevel.INFO,
+            metadata={"source": self.SOURCE}
+        )
+
+        create_stats_sql = """
+        -- Month bucket of an event timestamp; unparsable values only count in the all-time view
+        CREATE OR REPLACE FUNCTION resumen_stats_month(value TEXT)
+        RETURNS DATE
+        LANGUAGE plpgsql
+        STABLE
+        AS $fn$
+        BEGIN
+            RETURN COALESCE(DATE_TRUNC('month', value::timestamp)::date, '-infinity'::date);
+        EXCEPTION
+            WHEN OTHERS THEN
+                RETURN '-infinity'::date;
+        END;
+        $fn$;
+
+        -- Row trigger: undo the old row's contribution and add the new one (TG_ARGV[0] is the mode)
+        CREATE OR REPLACE FUNCTION resumen_stats_track()
+        RETURNS TRIGGER
+        LANGUAGE plpgsql
+        SECURITY DEFINER
+        AS $fn$
+        DECLARE
+            v_row RECORD;
+            v_sign INTEGER;
+            v_kills INTEGER;
+            v_deaths INTEGER;
+        BEGIN
+            FOREACH v_sign IN ARRAY CASE TG_OP WHEN 'INSERT' THEN ARRAY[1]
+                                               WHEN 'DELETE' THEN ARRAY[-1]
+                                               ELSE ARRAY[-1, 1] END
+            LOOP
+                IF v_sign < 0 THEN
+                    v_row := OLD;
+                ELSE
+                    v_row := NEW;
+                END IF;
+                CONTINUE WHEN v_row.username IS NULL OR v_row.tournament_id IS NOT NULL;
+                v_kills := CASE WHEN v_row.killer = v_row.username THEN v_sign ELSE 0 END;
+                v_deaths := CASE WHEN v_row.victim = v_row.username THEN v_sign ELSE 0 END;
+                CONTINUE WHEN v_kills = 0 AND v_deaths = 0;
+                INSERT INTO resumen_stats AS s (username, month, mode, kills, deaths, updated_at)
+                VALUES (v_row.username, resumen_stats_month(v_row."timestamp"::text), TG_ARGV[0],
+                        v_kills, v_deaths, clock_timestamp())
+                ON CONFLICT (username, month, mode) DO UPDATE
+                SET kills = s.kills + EXCLUDED.kills,
+                    deaths = s.deaths + EXCLUDED.deaths,
+                    updated_at = EXCLUDED.updated_at;
+            END LOOP;
+            RETURN NULL;
+        END;
+        $fn$;
+
+        DO $do$
+        BEGIN
+            IF to_regclass('public.resumen_stats') IS NULL THEN
+                -- Hold writers back until the backfill and the triggers are in place
+                LOCK TABLE sc_default, ea_squadronbattle IN SHARE ROW EXCLUSIVE MODE;
+
+                CREATE TABLE resumen_stats (
+                    username TEXT NOT NULL,
+                    month DATE NOT NULL,
+                    mode TEXT NOT NULL,
+                    kills BIGINT NOT NULL DEFAULT 0,
+                    deaths BIGINT NOT NULL DEFAULT 0,
+                    -- Freshness: lets clients skip refetching summaries that did not change
+                    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+                    PRIMARY KEY (username, month, mode)
+                );
+                CREATE INDEX resumen_stats_updated_at_idx ON resumen_stats (updated_at DESC);
+                ALTER TABLE resumen_stats ENABLE ROW LEVEL SECURITY;
+                CREATE POLICY "Public SELECT" ON resumen_stats FOR SELECT USING (true);
+
+                INSERT INTO resumen_stats (username, month, mode, kills, deaths)
+                SELECT
+                    username,
+                    resumen_stats_month("timestamp"::text),
+                    'live',
+                    COUNT(*) FILTER (WHERE killer = username),
+                    COUNT(*) FILTER (WHERE victim = username)
+                FROM
+                    sc_default
+                WHERE
+                    username IS NOT NULL
+                    AND tournament_id IS NULL
+                GROUP BY
+                    1, 2
+                HAVING
+                    COUNT(*) FILTER (WHERE killer = username OR victim = username) > 0
+                UNION ALL
+                SELECT
+                    username,
+                    resumen_stats_month("timestamp"::text),
+                    'sb',
+                    COUNT(*) FILTER (WHERE killer = username),
+                    COUNT(*) FILTER (WHERE victim = username)
+                FROM
+                    ea_squadronbattle
+                WHERE
+                    username IS NOT NULL
+                    AND tournament_id IS NULL
+                GROUP BY
+                    1, 2
+                HAVING
+                    COUNT(*) FILTER (WHERE killer = username OR victim = username) > 0;
+
+                CREATE TRIGGER resumen_stats_live
+                AFTER INSERT OR DELETE OR UPDATE OF username, killer, victim, tournament_id, "timestamp"
+                ON sc_default FOR EACH ROW EXECUTE FUNCTION resumen_stats_track('live');
+
+                CREATE TRIGGER resumen_stats_sb
+                AFTER INSERT OR DELETE OR UPDATE OF username, killer, victim, tournament_id, "timestamp"
+                ON ea_squadronbattle FOR EACH ROW EXECUTE FUNCTION resumen_stats_track('sb');
+            END IF;
+        END
+        $do$;
+
+        NOTIFY pgrst, 'reload schema';
+        """
+
+        success, result = supabase_manager._execute_sql(create_stats_sql)
+        if not success:
+            message_bus.publish(
+                content=f"Failed to create incremental Resumen summary table, using plain views: {result}",
+                level=MessageLevel.WARNING,
+                metadata={"source": self.SOURCE}
+            )
+            return False
+
+        self._resumen_stats_ready = True
+        if message_bus:
+            message_bus.emit("schema_change")
+        return True
+
+    def _incremental_summary_sql(self, view_name: str, view_sql: str) -> str:
+        """
+        Rewrite a Resumen view definition to aggregate resumen_stats.
+
+        Only the per-player kill and death totals change; the averages, the adjusted KDR
+        formulas and the column list are kept from the plain definition, so both modes
+        return the same rows and the view can be replaced in place.
+
+        Args:
+            view_name: The view being created
+            view_sql: Its plain CREATE OR REPLACE VIEW statement
+
+        Returns:
+            str: The CREATE OR REPLACE VIEW statement for the incremental mode
+        """
+        month_filter = SUMMARY_MONTH_FILTERS.get(view_name, "")
+        _, marker, rest = view_sql.partition("-- Calculate average kills for each mode")
+        return f"""
+        CREATE OR REPLACE VIEW {view_name} AS
+        WITH aggregated_live_stats AS (
+            SELECT
+                username,
+                SUM(kills) AS kills_live,
+                SUM(deaths) AS deaths_live
+            FROM
+                resumen_stats
+            WHERE
+                mode = 'live'{month_filter}
+            GROUP BY
+                username
+            HAVING
+                SUM(kills) <> 0 OR SUM(deaths) <> 0
+        ),
+
+        aggregated_sb_stats AS (
+            SELECT
+                username,
+                SUM(kills) AS kills_sb,
+                SUM(deaths) AS deaths_sb
+            FROM
+                resumen_stats
+            WHERE
+                mode = 'sb'{month_filter}
+            GROUP BY
+                username
+            HAVING
+                SUM(kills) <> 0 OR SUM(deaths) <> 0
+        ),
+
+        {marker}{rest}"""
+
     def _ensure_resumen_view_exists(self) -> bool:
         """
         Ensure that the Resumen view exists in the database.
@@ -865,8 +1684,9 @@ class SupabaseDataProvider(DataProvider):
         Returns:
             bool: True if the view exists or was created successfully, False otherwise
         """
+        incremental = self._summary_mode() == 'incremental'
         # Check if view already exists using the metadata cache when possible
-        if supabase_manager._table_exists("resumen_view"):
+        if supabase_manager._table_exists("resumen_view") and self._summary_view_current("resumen_view", incremental):
             return True
             
         # Before creating the view, check if the required tables exist
@@ -887,6 +1707,9 @@ class SupabaseDataProvider(DataProvider):
                 metadata={"source": self.SOURCE}
             )
             return False
+
+        if incremental and not self._ensure_resumen_stats_exists():
+            incremental = False  # Keep the leaderboard working on the plain view
             
         message_bus.publish(
             content="Creating or updating Resumen view in Supabase",
@@ -1115,10 +1938,14 @@ class SupabaseDataProvider(DataProvider):
             total_kills DESC;
         """
         
+        if incremental:
+            create_view_sql = self._incremental_summary_sql("resumen_view", create_view_sql)
+
         # Execute the SQL
         success, result = supabase_manager._execute_sql(create_view_sql)
         
         if success:
+            self._summary_view_modes["resumen_view"] = 'incremental' if incremental else 'view'
             message_bus.publish(
                 content="Successfully created or updated Resumen view",
                 level=MessageLevel.INFO,
@@ -1151,8 +1978,9 @@ class SupabaseDataProvider(DataProvider):
         Returns:
             bool: True if the view exists or was created successfully, False otherwise
         """
+        incremental = self._summary_mode() == 'incremental'
         # Check if view already exists using the metadata cache when possible
-        if supabase_manager._table_exists("resumen_mes_actual_view"):
+        if supabase_manager._table_exists("resumen_mes_actual_view") and self._summary_view_current("resumen_mes_actual_view", incremental):
             return True
             
         # Before creating the view, check if the required tables exist
@@ -1173,6 +2001,9 @@ class SupabaseDataProvider(DataProvider):
                 metadata={"source": self.SOURCE}
             )
             return False
+
+        if incremental and not self._ensure_resumen_stats_exists():
+            incremental = False  # Keep the leaderboard working on the plain view
             
         message_bus.publish(
             content="Creating or updating Resumen Mes Actual view in Supabase",
@@ -1403,10 +2234,14 @@ class SupabaseDataProvider(DataProvider):
             total_kills DESC;
         """
         
+        if incremental:
+            create_view_sql = self._incremental_summary_sql("resumen_mes_actual_view", create_view_sql)
+
         # Execute the SQL
         success, result = supabase_manager._execute_sql(create_view_sql)
         
         if success:
+            self._summary_view_modes["resumen_mes_actual_view"] = 'incremental' if incremental else 'view'
             message_bus.publish(
                 content="Successfully created or updated Resumen Mes Actual view",
                 level=MessageLevel.INFO,
@@ -1433,8 +2268,9 @@ class SupabaseDataProvider(DataProvider):
         Returns:
             bool: True if the view exists or was created successfully, False otherwise
         """
+        incremental = self._summary_mode() == 'incremental'
         # Check if view already exists using the metadata cache when possible
-        if supabase_manager._table_exists("resumen_mes_anterior_view"):
+        if supabase_manager._table_exists("resumen_mes_anterior_view") and self._summary_view_current("resumen_mes_anterior_view", incremental):
             return True
             
         # Before creating the view, check if the required tables exist
@@ -1455,6 +2291,9 @@ class SupabaseDataProvider(DataProvider):
                 metadata={"source": self.SOURCE}
             )
             return False
+
+        if incremental and not self._ensure_resumen_stats_exists():
+            incremental = False  # Keep the leaderboard working on the plain view
             
         message_bus.publish(
             content="Creating or updating Resumen Mes Anterior view in Supabase",
@@ -1685,10 +2524,14 @@ class SupabaseDataProvider(DataProvider):
             total_kills DESC;
         """
         
+        if incremental:
+            create_view_sql = self._incremental_summary_sql("resumen_mes_anterior_view", create_view_sql)
+
         # Execute the SQL
         success, result = supabase_manager._execute_sql(create_view_sql)
         
         if success:
+            self._summary_view_modes["resumen_mes_anterior_view"] = 'incremental' if incremental else 'view'
             message_bus.publish(
                 content="Successfully created or updated Resumen Mes Anterior view",
                 level=MessageLevel.INFO,
@@ -1713,6 +2556,7 @@ class SupabaseDataProvider(DataProvider):
             )
             return False
 
+    @_timed('fetch_config')
     def fetch_config(self) -> Dict[str, Any]:
         """
         Fetch configuration data from Supabase.
@@ -1811,6 +2655,7 @@ class SupabaseDataProvider(DataProvider):
         )
         return {}
 
+    @_timed('purge')
     def purge(self, table_name: str, username: Optional[str] = None) -> bool:
         """
         Delete data from the specified table in Supabase.
@@ -1840,6 +2685,11 @@ class SupabaseDataProvider(DataProvider):
                 success = supabase_manager.purge_table(table_name, username)
                 
                 if success:
+                    result_cache.clear()
+                    index = get_record_hash_index()
+                    if index is not None:
+                        # Deleted rows are not tracked incrementally
+                        index.reset(supabase_manager._sanitize_table_name(table_name))
                     return True
                 else:
                     last_error = "Purge operation failed"
@@ -2035,6 +2885,7 @@ class SupabaseDataProvider(DataProvider):
         """Delete a tournament from the database"""
         try:
             response = supabase_manager.supabase.table("tournaments").delete().eq("id", tournament_id).execute()
+            self._forget_corpse_keys()  # Its corpses are deleted in cascade
             return len(response.data) > 0
         except Exception as e:
             message_bus.publish(
@@ -2055,14 +2906,30 @@ class SupabaseDataProvider(DataProvider):
             )
             return False
 
+    def _corpse_key(self, tournament_id: str, corpse_hash: str) -> str:
+        return f"{tournament_id}:{corpse_hash}"
+
+    def _remember_corpse(self, tournament_id: str, corpse_hash: str):
+        index = get_record_hash_index()
+        if index is not None and tournament_id and corpse_hash:
+            index.add("tournament_corpses", [self._corpse_key(tournament_id, corpse_hash)])
+
+    def _forget_corpse_keys(self):
+        index = get_record_hash_index()
+        if index is not None:
+            index.reset("tournament_corpses")
+
     def store_tournament_corpse(self, corpse_data: Dict[str, Any]) -> bool:
         """Store tournament corpse with deduplication"""
         try:
             response = supabase_manager.supabase.table("tournament_corpses").insert(corpse_data).execute()
+            if response.data:
+                self._remember_corpse(corpse_data.get("tournament_id"), corpse_data.get("corpse_hash"))
             return len(response.data) > 0
         except Exception as e:
             if "duplicate key" in str(e).lower():
                 # Expected for duplicates - not an error
+                self._remember_corpse(corpse_data.get("tournament_id"), corpse_data.get("corpse_hash"))
                 return True
             message_bus.publish(
                 content=f"Error storing tournament corpse: {str(e)}",
@@ -2072,15 +2939,23 @@ class SupabaseDataProvider(DataProvider):
 
     def corpse_exists(self, tournament_id: str, corpse_hash: str) -> bool:
         """Check if corpse already exists"""
+        # The server is authoritative (corpses can be deleted by other clients); the local
+        # index is only a hint used when the server cannot be asked
+        index = get_record_hash_index()
+        key = self._corpse_key(tournament_id, corpse_hash)
         try:
             response = supabase_manager.supabase.table("tournament_corpses").select("id").eq("tournament_id", tournament_id).eq("corpse_hash", corpse_hash).execute()
+            if response.data:
+                self._remember_corpse(tournament_id, corpse_hash)
+            elif index is not None and index.contains("tournament_corpses", key):
+                self._forget_corpse_keys()  # Stale: deleted on the server since we stored it
             return len(response.data) > 0
         except Exception as e:
             message_bus.publish(
                 content=f"Error checking corpse existence: {str(e)}",
                 level=MessageLevel.ERROR
             )
-            return False
+            return index is not None and index.contains("tournament_corpses", key)
 
     def get_tournament_corpse(self, corpse_id: str) -> Optional[Dict[str, Any]]:
         """Get tournament corpse by ID"""
@@ -2122,6 +2997,7 @@ class SupabaseDataProvider(DataProvider):
         """Delete tournament corpse from database"""
         try:
             response = supabase_manager.supabase.table("tournament_corpses").delete().eq("id", corpse_id).execute()
+            self._forget_corpse_keys()
             return len(response.data) > 0
         except Exception as e:
             message_bus.publish(
@@ -2209,9 +3085,9 @@ class SupabaseDataProvider(DataProvider):
             )
             return False
 
-def get_data_provider(config_manager) -> DataProvider:
+def _create_data_provider(config_manager) -> DataProvider:
     """
-    Factory function to get the appropriate data provider based on configuration.
+    Build the appropriate data provider based on configuration.
     Returns a single data provider based on the datasource configuration.
     
     Args:
@@ -2236,11 +3112,15 @@ def get_data_provider(config_manager) -> DataProvider:
                 datasource = 'googlesheets'
                 config_manager.set('datasource', 'googlesheets')
             else:
+                result_cache.configure(ttl=config_manager.get('data_cache_ttl', 30),
+                                       max_entries=config_manager.get('data_cache_size', 64))
                 return SupabaseDataProvider(
                     max_retries=int(config_manager.data_provider_max_retries or 3),
                     retry_delay=float(config_manager.data_provider_retry_delay or 1.0)
                 )
         else:
+            result_cache.configure(ttl=config_manager.get('data_cache_ttl', 30),
+                                   max_entries=config_manager.get('data_cache_size', 64))
             return SupabaseDataProvider(
                 max_retries=int(config_manager.data_provider_max_retries or 3),
                 retry_delay=float(config_manager.data_provider_retry_delay or 1.0)
@@ -2263,4 +3143,96 @@ def get_data_provider(config_manager) -> DataProvider:
     )
     
     # Return a non-functional Google Sheets provider if nothing is configured
-    return GoogleSheetsDataProvider('')
\ No newline at end of file
+    return GoogleSheetsDataProvider('')
+
+
+class DataProviderRegistry:
+    """
+    Long-lived data providers keyed on (datasource, credentials hash).
+
+    Callers share one thread-safe instance per configuration, so HTTP sessions and warm
+    state survive UI refreshes. Instances are rebuilt only when a relevant setting
+    changes (config_updated) or the credentials differ. The relevant settings are also part
+    of the key, so a change that bypassed ConfigManager.set still yields a fresh provider.
+    """
+
+    RELEVANT_KEYS = frozenset({
+        'datasource', 'google_sheets_webhook', 'supabase_key',
+        'data_provider_max_retries', 'data_provider_retry_delay',
+        'data_cache_ttl', 'data_cache_size',
+    })
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._providers = {}  # {(datasource, credentials hash): DataProvider}
+        message_bus.on("config_updated", self._on_config_updated)
+
+    @staticmethod
+    def _key(config_manager) -> Tuple[str, str]:
+        datasource = config_manager.datasource or 'googlesheets'
+        credentials = (
+            config_manager.get('google_sheets_webhook') if datasource == 'googlesheets' else config_manager.get('supabase_key'),
+            config_manager.get('data_provider_max_retries'),
+            config_manager.get('data_provider_retry_delay'),
+            # Applied to the shared result cache when a Supabase provider is created
+            config_manager.get('data_cache_ttl'),
+            config_manager.get('data_cache_size'),
+        )
+        return datasource, hashlib.sha256(repr(credentials).encode('utf-8')).hexdigest()[:16]
+
+    def get(self, config_manager) -> DataProvider:
+        """Shared provider for the current configuration, created on first use."""
+        key = self._key(config_manager)
+        with self._lock:
+            provider = self._providers.get(key)
+            if provider is not None:
+                return provider
+            provider = _create_data_provider(config_manager)
+            # A failed Supabase connection switches the datasource to Google Sheets
+            self._providers[self._key(config_manager)] = provider
+            return provider
+
+    def invalidate(self, datasource: Optional[str] = None) -> int:
+        """
+        Forget cached providers (all, or those of one datasource) so the next get() rebuilds them.
+        
+        Returns:
+            int: Number of providers dropped
+        """
+        with self._lock:
+            keys = [key for key in self._providers if datasource is None or key[0] == datasource]
+            for key in keys:
+                del self._providers[key]
+        return len(keys)
+
+    def _on_config_updated(self, config_key):
+        if config_key.split('.')[0] in self.RELEVANT_KEYS:
+            self.invalidate()
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Health and latency statistics of every live provider, keyed on 'datasource:hash'."""
+        with self._lock:
+            providers = list(self._providers.items())
+        stats = {}
+        for (datasource, credentials_hash), provider in providers:
+            try:
+                stats[f"{datasource}:{credentials_hash}"] = provider.get_stats()
+            except Exception as e:
+                stats[f"{datasource}:{credentials_hash}"] = {'provider': provider.__class__.__name__, 'error': str(e)}
+        return stats
+
+
+data_provider_registry = DataProviderRegistry()
+
+
+def get_data_provider(config_manager) -> DataProvider:
+    """
+    Get the shared data provider for the current configuration.
+    
+    Args:
+        config_manager: The configuration manager instance
+        
+    Returns:
+        A DataProvider instance (either Supabase or Google Sheets)
+    """
+    return data_provider_registry.get(config_manager)
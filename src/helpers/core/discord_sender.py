@@ -0,0 +1,327 @@
+"""
+DiscordSender: envío asíncrono de mensajes a webhooks de Discord.
+
+Los mensajes se encolan por webhook y los envía un hilo en segundo plano, reutilizando
+una requests.Session (conexión TCP/TLS persistente) por URL. Los mensajes que llegan al
+mismo webhook dentro de una ventana corta se agrupan en un único payload respetando los
+límites de Discord (2000 caracteres de content y 10 embeds). Las respuestas 429 y las
+cabeceras X-RateLimit-* se respetan con un bucket por webhook (y el bloqueo global).
+"""
+import time
+import threading
+from collections import deque
+
+import requests
+
+from helpers.core.message_bus import message_bus, MessageLevel
+
+MAX_CONTENT_LENGTH = 2000
+MAX_EMBEDS = 10
+DEFAULT_COALESCE_MS = 250
+DEFAULT_TIMEOUT = 10
+DEFAULT_MAX_RETRIES = 5
+DEFAULT_MAX_PENDING = 1000
+RETRY_BACKOFF_MAX = 30.0
+
+
+def split_content(content, limit=MAX_CONTENT_LENGTH):
+    """Split a message longer than ``limit`` into chunks, preferably at line breaks."""
+    chunks = []
+    while len(content) > limit:
+        cut = content.rfind('\n', 0, limit)
+        if cut <= 0:
+            cut = limit
+        chunks.append(content[:cut])
+        content = content[cut:].lstrip('\n')
+    if content:
+        chunks.append(content)
+    return chunks
+
+
+class _Webhook:
+    """Pending messages and rate limit state of one webhook URL."""
+
+    __slots__ = ('url', 'session', 'pending', 'pending_chars', 'pending_embeds', 'blocked_until',
+                 'bucket', 'attempts')
+
+    def __init__(self, url, session):
+        self.url = url
+        self.session = session
+        self.pending = deque()  # (enqueued_at, content, embeds)
+        self.pending_chars = 0
+        self.pending_embeds = 0
+        self.blocked_until = 0.0
+        self.bucket = None  # X-RateLimit-Bucket, shared by webhooks Discord limits together
+        self.attempts = 0
+
+    def is_full(self):
+        return self.pending_chars >= MAX_CONTENT_LENGTH or self.pending_embeds >= MAX_EMBEDS
+
+    def push(self, entry, front=False):
+        _enqueued_at, content, embeds = entry
+        if front:
+            self.pending.appendleft(entry)
+        else:
+            self.pending.append(entry)
+        self.pending_chars += len(content) + 1 if content else 0
+        self.pending_embeds += len(embeds)
+
+    def pop(self):
+        entry = self.pending.popleft()
+        _enqueued_at, content, embeds = entry
+        self.pending_chars -= len(content) + 1 if content else 0
+        self.pending_embeds -= len(embeds)
+        return entry
+
+
+class DiscordSender:
+    """
+    Background, coalescing Discord webhook sender.
+
+    ``send`` never blocks on the network; ``flush`` and ``stop`` wait for the queued
+    messages to be delivered (or given up).
+    """
+
+    def __init__(self, coalesce_ms=DEFAULT_COALESCE_MS, timeout=DEFAULT_TIMEOUT, max_retries=DEFAULT_MAX_RETRIES,
+                 max_pending=DEFAULT_MAX_PENDING, session_factory=None):
+        """
+        Args:
+            coalesce_ms: Window during which messages to the same webhook are merged.
+            timeout: HTTP timeout in seconds.
+            max_retries: Attempts for network/5xx errors before a payload is dropped.
+            max_pending: Messages kept per webhook; the oldest are dropped beyond this.
+            session_factory: Callable returning a requests.Session-like object.
+        """
+        self.coalesce = max(0.0, float(coalesce_ms)) / 1000.0
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.max_pending = max_pending
+        self.session_factory = session_factory or requests.Session
+        self._condition = threading.Condition()
+        self._webhooks = {}  # {url: _Webhook}
+        self._buckets = {}  # {bucket id: blocked_until}
+        self._global_blocked_until = 0.0
+        self._inflight = 0
+        self._flushing = False
+        self._running = False
+        self._thread = None
+        self.stats = {'messages': 0, 'payloads': 0, 'coalesced': 0, 'rate_limited': 0, 'retries': 0, 'dropped': 0}
+
+    def send(self, url, content=None, embeds=None):
+        """
+        Queue a message for ``url``.
+
+        Args:
+            url: Discord webhook URL.
+            content: Message text (split if longer than 2000 characters).
+            embeds: Optional list of embed dicts.
+
+        Returns:
+            bool: False if there was nothing to send.
+        """
+        if not url or not (content or embeds):
+            return False
+        embeds = list(embeds or [])
+        chunks = split_content(str(content)) if content else ['']
+        now = time.monotonic()
+        with self._condition:
+            webhook = self._webhooks.get(url)
+            if webhook is None:
+                webhook = self._webhooks[url] = _Webhook(url, self.session_factory())
+            for index, chunk in enumerate(chunks):
+                # Embeds travel with the last chunk; at most MAX_EMBEDS per payload
+                chunk_embeds = embeds[:MAX_EMBEDS] if index == len(chunks) - 1 else []
+                webhook.push((now, chunk, chunk_embeds))
+                self.stats['messages'] += 1
+            while len(webhook.pending) > self.max_pending:
+                webhook.pop()
+                self.stats['dropped'] += 1
+            self._ensure_thread()
+            self._condition.notify()
+        return True
+
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._running = True
+            self._thread = threading.Thread(target=self._run, name="DiscordSender", daemon=True)
+            self._thread.start()
+
+    def _ready_at(self, webhook):
+        """Monotonic time at which ``webhook`` may send its next payload (lock held)."""
+        first_enqueued = webhook.pending[0][0]
+        ready_at = first_enqueued if (self._flushing or webhook.is_full()) else first_enqueued + self.coalesce
+        return max(ready_at, webhook.blocked_until, self._buckets.get(webhook.bucket, 0.0),
+                   self._global_blocked_until)
+
+    def _next_ready(self):
+        """Pick the webhook due first (lock held); returns (webhook or None, seconds to wait)."""
+        now = time.monotonic()
+        best, best_at = None, None
+        for webhook in self._webhooks.values():
+            if not webhook.pending:
+                continue
+            ready_at = self._ready_at(webhook)
+            if best_at is None or ready_at < best_at:
+                best, best_at = webhook, ready_at
+        if best is None:
+            return None, None
+        if best_at <= now:
+            return best, 0.0
+        return None, best_at - now
+
+    @staticmethod
+    def _take_payload(webhook):
+        """Pop as many pending messages as fit in one payload (lock held)."""
+        entries = []
+        length = 0
+        embed_count = 0
+        while webhook.pending:
+            _enqueued_at, content, embeds = webhook.pending[0]
+            extra = len(content) + (1 if entries and content else 0)
+            if entries and (length + extra > MAX_CONTENT_LENGTH or embed_count + len(embeds) > MAX_EMBEDS):
+                break
+            entries.append(webhook.pop())
+            length += extra
+            embed_count += len(embeds)
+        payload = {'content': '\n'.join(content for _t, content, _e in entries if content)}
+        embeds = [embed for _t, _c, entry_embeds in entries for embed in entry_embeds]
+        if embeds:
+            payload['embeds'] = embeds
+        return entries, payload
+
+    def _run(self):
+        with self._condition:
+            while self._running:
+                webhook, wait = self._next_ready()
+                if webhook is None:
+                    self._condition.notify_all()  # Wake flush() waiters when everything is sent
+                    self._condition.wait(wait)
+                    continue
+                entries, payload = self._take_payload(webhook)
+                self._inflight += 1
+                self._condition.release()
+                try:
+                    response, error = self._post(webhook, payload), None
+                except requests.RequestException as e:
+                    response, error = None, e
+                finally:
+                    self._condition.acquire()
+                    self._inflight -= 1
+                self._handle_response(webhook, entries, response, error)
+
+    def _post(self, webhook, payload):
+        return webhook.session.post(webhook.url, json=payload, timeout=self.timeout)
+
+    @staticmethod
+    def _header_float(headers, name):
+        try:
+            return float(headers.get(name))
+        except (TypeError, ValueError):
+            return None
+
+    def _handle_response(self, webhook, entries, response, error):
+        """Update rate limit state and requeue or drop the payload (lock held)."""
+        now = time.monotonic()
+        headers = response.headers if response is not None else {}
+        bucket = headers.get('X-RateLimit-Bucket')
+        if bucket:
+            webhook.bucket = bucket
+
+        if response is not None and response.status_code == 429:
+            retry_after = None
+            is_global = headers.get('X-RateLimit-Global', '').lower() == 'true'
+            try:
+                body = response.json()
+                retry_after = float(body.get('retry_after'))
+                is_global = is_global or bool(body.get('global'))
+            except (ValueError, TypeError, AttributeError):
+                pass
+            if retry_after is None:
+                retry_after = self._header_float(headers, 'Retry-After') or 1.0
+            blocked_until = now + retry_after
+            if is_global:
+                self._global_blocked_until = blocked_until
+            webhook.blocked_until = blocked_until
+            if webhook.bucket:
+                self._buckets[webhook.bucket] = blocked_until
+            self.stats['rate_limited'] += 1
+            self._requeue(webhook, entries)
+            return
+
+        if response is not None and 200 <= response.status_code < 300:
+            webhook.attempts = 0
+            self.stats['payloads'] += 1
+            self.stats['coalesced'] += len(entries) - 1
+            remaining = self._header_float(headers, 'X-RateLimit-Remaining')
+            reset_after = self._header_float(headers, 'X-RateLimit-Reset-After')
+            if remaining is not None and remaining <= 0 and reset_after:
+                webhook.blocked_until = now + reset_after
+                if webhook.bucket:
+                    self._buckets[webhook.bucket] = webhook.blocked_until
+            return
+
+        if response is not None and response.status_code < 500:
+            # Bad request, unknown webhook...: retrying would not help
+            self.stats['dropped'] += len(entries)
+            self._report(f"Failed to send Discord message. Status code: {response.status_code}", MessageLevel.ERROR)
+            return
+
+        webhook.attempts += 1
+        if webhook.attempts > self.max_retries:
+            webhook.attempts = 0
+            self.stats['dropped'] += len(entries)
+            reason = error if error is not None else f"status code {response.status_code}"
+            self._report(f"Giving up on Discord message after {self.max_retries} retries: {reason}", MessageLevel.ERROR)
+            return
+        webhook.blocked_until = now + min(RETRY_BACKOFF_MAX, 2 ** (webhook.attempts - 1))
+        self.stats['retries'] += 1
+        self._requeue(webhook, entries)
+
+    @staticmethod
+    def _requeue(webhook, entries):
+        for entry in reversed(entries):
+            webhook.push(entry, front=True)
+
+    @staticmethod
+    def _report(content, level):
+        message_bus.publish(content=content, level=level, metadata={"source": "discord_sender"})
+
+    def pending_count(self):
+        with self._condition:
+            return sum(len(webhook.pending) for webhook in self._webhooks.values()) + self._inflight
+
+    def flush(self, timeout=None):
+        """
+        Send everything queued without waiting for the coalescing window.
+
+        Returns:
+            bool: False if messages were still pending when the timeout expired.
+        """
+        with self._condition:
+            self._flushing = True
+            self._condition.notify_all()
+            try:
+                done = self._condition.wait_for(
+                    lambda: not self._inflight and not any(webhook.pending for webhook in self._webhooks.values())
+                    or not (self._thread and self._thread.is_alive()),
+                    timeout
+                )
+            finally:
+                self._flushing = False
+        return done and not any(webhook.pending for webhook in self._webhooks.values())
+
+    def stop(self, timeout=None):
+        """Flush pending messages, stop the sender thread and close the sessions."""
+        delivered = self.flush(timeout)
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        with self._condition:
+            for webhook in self._webhooks.values():
+                try:
+                    webhook.session.close()
+                except Exception:
+                    pass
+        return delivered
@@ -0,0 +1,285 @@
+"""
+RecordHashIndex: índice local y persistente de los hash de registros ya guardados en Supabase.
+
+Responde a "¿este registro ya está guardado?" sin descargar cada vez la columna hash_value
+completa. Un filtro de Bloom en memoria descarta al instante los hash nuevos (la mayoría)
+y un conjunto exacto en SQLite confirma los positivos, así que no hay falsos positivos.
+El índice se actualiza de forma incremental leyendo solo las filas con created_at igual o
+posterior a la última marca vista, de modo que la descarga al arrancar y la memoria
+dependen de las filas nuevas y no de todo el histórico.
+"""
+import math
+import sqlite3
+import hashlib
+import threading
+
+# Fields of the hash_value generated column (see SupabaseManager._create_table)
+HASH_FIELDS = ('username', 'killer', 'victim', 'timestamp')
+
+DEFAULT_ERROR_RATE = 0.001
+DEFAULT_CAPACITY = 100000
+DEFAULT_PAGE_SIZE = 1000
+
+
+def record_hash(record):
+    """
+    Dedup hash of a record.
+
+    This has to match the MD5 calculation in the get_table_record_hashes function
+    and the hash_value column of the Supabase tables.
+    """
+    hash_input = (
+        str(record.get('username', '')) +
+        str(record.get('killer', '')) +
+        str(record.get('victim', '')) +
+        str(record.get('timestamp', ''))
+    )
+    return hashlib.md5(hash_input.encode()).hexdigest()
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings (double hashing on a 128-bit BLAKE2b digest)."""
+
+    def __init__(self, capacity=DEFAULT_CAPACITY, error_rate=DEFAULT_ERROR_RATE, bits=None, hashes=None, data=None):
+        """
+        Args:
+            capacity: Keys the filter is sized for.
+            error_rate: False positive rate at ``capacity`` keys.
+            bits, hashes, data: Restore a filter saved with ``bit_count``/``hash_count``/``to_bytes``.
+        """
+        self.capacity = max(1, int(capacity))
+        self.error_rate = error_rate
+        if bits is None:
+            bits = int(math.ceil(-self.capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.bit_count = max(8, int(bits))
+        self.hash_count = hashes or max(1, int(round(self.bit_count / self.capacity * math.log(2))))
+        size = (self.bit_count + 7) // 8
+        self._bits = bytearray(data) if data is not None and len(data) == size else bytearray(size)
+
+    def _positions(self, key):
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.bit_count for i in range(self.hash_count)]
+
+    def add(self, key):
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key):
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+    def to_bytes(self):
+        return bytes(self._bits)
+
+
+class RecordHashIndex:
+    """
+    Per-table index of stored keys: Bloom filter in front of an exact SQLite set.
+
+    Keys come from the application's own successful inserts (``add``) and from the
+    server (``refresh``). Deleting rows is not tracked incrementally: callers ``reset`` a
+    table they purge, and ``refresh`` rebuilds a table whose remote row count dropped
+    below the local one.
+    """
+
+    def __init__(self, path, fetch_page, count_rows=None, error_rate=DEFAULT_ERROR_RATE,
+                 initial_capacity=DEFAULT_CAPACITY):
+        """
+        Args:
+            path: SQLite database file.
+            fetch_page: Callable(table, column, watermark_column, since, offset, limit) returning rows
+                with ``column`` and ``watermark_column``, ordered by the watermark; ``since`` is
+                inclusive (None reads from the start).
+            count_rows: Optional callable(table) returning the remote row count.
+            error_rate: False positive rate of the Bloom filters (answered by SQLite).
+            initial_capacity: Keys a new table's filter is sized for (it doubles when exceeded).
+        """
+        self.path = path
+        self.fetch_page = fetch_page
+        self.count_rows = count_rows
+        self.error_rate = error_rate
+        self.initial_capacity = initial_capacity
+        self._lock = threading.Lock()
+        self._refresh_locks = {}
+        self._blooms = {}  # {table: BloomFilter}
+        self._dirty = set()
+        self.bloom_rejects = 0  # Lookups answered by the Bloom filter alone
+        self.exact_lookups = 0
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS hashes ("
+            " table_name TEXT NOT NULL,"
+            " key TEXT NOT NULL,"
+            " PRIMARY KEY (table_name, key)) WITHOUT ROWID"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS tables ("
+            " table_name TEXT PRIMARY KEY,"
+            " watermark TEXT,"
+            " rows INTEGER NOT NULL DEFAULT 0,"
+            " bloom BLOB,"
+            " bloom_bits INTEGER,"
+            " bloom_hashes INTEGER,"
+            " bloom_capacity INTEGER)"
+        )
+
+    def _table_row(self, table):
+        row = self._conn.execute(
+            "SELECT watermark, rows, bloom, bloom_bits, bloom_hashes, bloom_capacity FROM tables WHERE table_name = ?",
+            (table,)
+        ).fetchone()
+        if row is None:
+            self._conn.execute("INSERT INTO tables (table_name) VALUES (?)", (table,))
+            row = (None, 0, None, None, None, None)
+        return row
+
+    def _bloom(self, table):
+        """Filter of a table, loaded from disk or rebuilt from the exact set. Call with the lock held."""
+        bloom = self._blooms.get(table)
+        if bloom is None:
+            _, rows, data, bits, hashes, capacity = self._table_row(table)
+            if data is not None and capacity and rows <= capacity:
+                bloom = BloomFilter(capacity, self.error_rate, bits=bits, hashes=hashes, data=data)
+            else:
+                bloom = self._rebuild_bloom(table, max(self.initial_capacity, rows * 2))
+            self._blooms[table] = bloom
+        return bloom
+
+    def _rebuild_bloom(self, table, capacity):
+        bloom = BloomFilter(capacity, self.error_rate)
+        for (key,) in self._conn.execute("SELECT key FROM hashes WHERE table_name = ?", (table,)):
+            bloom.add(key)
+        self._blooms[table] = bloom
+        self._dirty.add(table)
+        return bloom
+
+    def contains(self, table, key):
+        """Whether ``key`` is known to be stored in ``table`` (exact, no false positives)."""
+        with self._lock:
+            if key not in self._bloom(table):
+                self.bloom_rejects += 1
+                return False
+            self.exact_lookups += 1
+            return self._conn.execute(
+                "SELECT 1 FROM hashes WHERE table_name = ? AND key = ?", (table, key)
+            ).fetchone() is not None
+
+    def missing(self, table, keys):
+        """Keys of ``keys`` that are not stored in ``table``, in order."""
+        return [key for key in keys if not self.contains(table, key)]
+
+    def add(self, table, keys, watermark=None):
+        """
+        Record keys as stored (after a successful insert or read from the server).
+
+        Returns:
+            int: Number of keys that were new to the index.
+        """
+        keys = [key for key in keys if key]
+        with self._lock:
+            bloom = self._bloom(table)
+            _, rows, _, _, _, _ = self._table_row(table)
+            before = self._conn.total_changes
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO hashes (table_name, key) VALUES (?, ?)", [(table, key) for key in keys]
+                )
+                added = self._conn.total_changes - before
+                self._conn.execute(
+                    "UPDATE tables SET rows = rows + ?, watermark = MAX(COALESCE(watermark, ''), COALESCE(?, '')) "
+                    "WHERE table_name = ?",
+                    (added, watermark, table)
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            for key in keys:
+                bloom.add(key)
+            if added:
+                self._dirty.add(table)
+            if rows + added > bloom.capacity:
+                self._rebuild_bloom(table, bloom.capacity * 2)
+            return added
+
+    def reset(self, table):
+        """Forget everything about a table (e.g. after purging it)."""
+        with self._lock:
+            self._conn.execute("DELETE FROM hashes WHERE table_name = ?", (table,))
+            self._conn.execute("DELETE FROM tables WHERE table_name = ?", (table,))
+            self._blooms.pop(table, None)
+            self._dirty.discard(table)
+
+    def refresh(self, table, column='hash_value', watermark_column='created_at', page_size=DEFAULT_PAGE_SIZE):
+        """
+        Pull the keys stored in ``table`` since the last refresh.
+
+        Rows sharing the watermark timestamp are read again (adding them is idempotent), so
+        rows inserted in the same transaction as the last one seen are not missed.
+
+        Returns:
+            int: Number of keys that were new to the index.
+
+        Raises:
+            Whatever ``fetch_page``/``count_rows`` raise; the index keeps the pages already read.
+        """
+        with self._lock:
+            refresh_lock = self._refresh_locks.setdefault(table, threading.Lock())
+        with refresh_lock:
+            with self._lock:
+                watermark, local_rows = self._table_row(table)[:2]
+            if self.count_rows is not None and local_rows:
+                remote_rows = self.count_rows(table)
+                if remote_rows is not None and remote_rows < local_rows:
+                    # Rows were deleted on the server: incremental reads cannot see that
+                    self.reset(table)
+                    watermark = None
+
+            added = 0
+            offset = 0
+            while True:
+                rows = self.fetch_page(table, column, watermark_column, watermark or None, offset, page_size)
+                keys = [row.get(column) for row in rows]
+                page_watermark = max((str(row.get(watermark_column)) for row in rows
+                                      if row.get(watermark_column) is not None), default=None)
+                added += self.add(table, keys, page_watermark)
+                if len(rows) < page_size:
+                    break
+                offset += page_size
+            self.flush()
+            return added
+
+    def flush(self):
+        """Save the Bloom filters that changed."""
+        with self._lock:
+            for table in list(self._dirty):
+                bloom = self._blooms.get(table)
+                if bloom is not None:
+                    self._conn.execute(
+                        "UPDATE tables SET bloom = ?, bloom_bits = ?, bloom_hashes = ?, bloom_capacity = ? "
+                        "WHERE table_name = ?",
+                        (bloom.to_bytes(), bloom.bit_count, bloom.hash_count, bloom.capacity, table)
+                    )
+            self._dirty.clear()
+
+    def get_stats(self):
+        with self._lock:
+            tables = {
+                table: {'rows': rows, 'watermark': watermark}
+                for table, rows, watermark in self._conn.execute("SELECT table_name, rows, watermark FROM tables")
+            }
+            return {
+                'tables': tables,
+                'bloom_rejects': self.bloom_rejects,
+                'exact_lookups': self.exact_lookups,
+                'bloom_bytes': sum((bloom.bit_count + 7) // 8 for bloom in self._blooms.values()),
+            }
+
+    def close(self):
+        self.flush()
+        with self._lock:
+            self._conn.close()
@@ -3,11 +3,10 @@ import time
 import re
 import sys
 import json
-import requests
 import traceback
 import threading
-import queue
 import signal
+import sqlite3
 import logging  # Add logging for error handling
 from datetime import datetime  # Fix: import datetime for timestamp handling
 #from watchdog.observers import Observer
@@ -20,9 +19,15 @@ from bs4 import BeautifulSoup  # For profile scraping
 from helpers.core.config_utils import get_application_path, get_config_manager
 from helpers.core.supabase_manager import supabase_manager  # Import Supabase manager for cloud storage
 from helpers.core.message_bus import message_bus, MessageLevel  # Import at module level
-from helpers.core.data_provider import get_data_provider  # Import data provider
+from helpers.core.data_provider import get_data_provider, DataProviderUnavailable  # Import data provider
 from helpers.tournament.tournament_manager import TournamentManager
 from helpers.core.rate_limiter import MessageRateLimiter
+from helpers.core.pattern_set import PatternSet
+from helpers.core.log_tail_reader import LogTailReader
+from helpers.core import log_replay
+from helpers.core.data_outbox import DataOutbox
+from helpers.core.adaptive_batcher import AdaptiveBatcher
+from helpers.core.discord_sender import DiscordSender
 from helpers.scraping.async_profile import scrape_profile_async  # Import profile scraper helper
 from helpers import ensure_all_field
 
@@ -30,6 +35,9 @@ from helpers import ensure_all_field
 app_path = get_application_path()
 executable_name = os.path.splitext(os.path.basename(sys.argv[0]))[0]
 error_log_path = os.path.join(app_path, f"{executable_name}.log")
+checkpoint_path = os.path.join(app_path, f"{executable_name}.checkpoint.json")
+history_spill_path = os.path.join(app_path, f"{executable_name}.history.jsonl")
+outbox_path = os.path.join(app_path, f"{executable_name}.outbox.db")
 logging.basicConfig(level=logging.ERROR, filename=error_log_path, filemode='a', 
                    format='%(asctime)s - %(levelname)s - %(message)s')
 
@@ -57,11 +65,6 @@ def output_message(timestamp, message, regex_pattern=None, level=None):
         regex_pattern: The regex pattern name that matched the message (optional).
         level: Message priority level (optional).
     """
-    # Check if rate limiter exists and if message should be sent
-    rate_limiter = getattr(main, 'rate_limiter', None)
-    if rate_limiter and not rate_limiter.should_send(message, 'stdout'):
-        return  # Message is rate-limited, do not output
-
     # Map level string to MessageLevel enum if provided as string
     if level is None:
         msg_level = MessageLevel.INFO
@@ -77,6 +80,15 @@ def output_message(timestamp, message, regex_pattern=None, level=None):
     else:
         msg_level = level
     
+    # Nobody consumes this level (e.g. per-line debug output outside debug mode)
+    if not message_bus.is_enabled(msg_level, regex_pattern):
+        return
+
+    # Check if rate limiter exists and if message should be sent
+    rate_limiter = getattr(main, 'rate_limiter', None)
+    if rate_limiter and not rate_limiter.should_send(message, 'stdout'):
+        return  # Message is rate-limited, do not output
+
     # Create metadata
     metadata = {}
     if hasattr(main, 'in_gui'):
@@ -115,7 +127,12 @@ class LogFileHandler(FileSystemEventHandler):
         self.in_ea_mode = False
         
         # Initialize a single data queue instead of separate queues for Google Sheets and Supabase
-        self.data_queue = queue.Queue()
+        # Batches are flushed when full, too large or too old; their size adapts to the provider latency
+        self.data_queue = AdaptiveBatcher(
+            max_batch_size=self.config_manager.get('data_batch_max_size', 500),
+            max_latency_ms=self.config_manager.get('data_batch_max_latency_ms', 500),
+            max_bytes=self.config_manager.get('data_batch_max_bytes', 1024 * 1024)
+        )
         
         self.stop_event = threading.Event()
         self.screenshots_folder = os.path.join(os.path.dirname(self.log_file_path), "ScreenShots")
@@ -124,13 +141,30 @@ class LogFileHandler(FileSystemEventHandler):
         self._tournament_manager = None  # Lazy initialization
         self.version = get_version()
         
-        # Initialize the data provider
-        self.data_provider = get_data_provider(self.config_manager)
+        # Initialize the shared data provider (the data_provider property follows config changes)
+        get_data_provider(self.config_manager)
         
         # Create screenshots folder if it doesn't exist
         if not os.path.exists(self.screenshots_folder):
             os.makedirs(self.screenshots_folder)
 
+        # Webhook deliveries run on a background sender with pooled sessions and coalescing
+        self.discord_sender = DiscordSender(
+            coalesce_ms=self.config_manager.get('discord_coalesce_ms', 250)
+        )
+
+        # Durable outbox: queued events survive provider outages and restarts
+        self.outbox = None
+        if not self.process_once and self.config_manager.get('data_outbox', True):
+            try:
+                self.outbox = DataOutbox(
+                    outbox_path, max_attempts=self.config_manager.get('data_outbox_max_attempts', 10)
+                )
+                if self.outbox.recovered:
+                    output_message(None, f"{self.outbox.recovered} undelivered events recovered from the outbox")
+            except sqlite3.Error as e:
+                output_message(None, f"Data outbox unavailable, events will only be kept in memory: {e}", level="warning")
+
         # Start data queue processor thread if not in process_once mode
         if not self.process_once:
             self.data_thread = threading.Thread(target=self.process_data_queue)
@@ -151,13 +185,32 @@ class LogFileHandler(FileSystemEventHandler):
             r"Response\[\d+\]\[.*?\] Network\[(?P<network>\w+)\]\[\d+\] "
             r"Mode\[GameMode\.(?P<mode>EA_\w+)\]\[\d+\] Map\[(?P<map>[\w_]+)\]\[\d+\]"
         )
+        # Literal prefilter over the mode regexes so most lines skip them entirely
+        self.mode_pattern_set = PatternSet([
+            ('nickname', self.nickname_regex),
+            ('lobby_type', self.lobby_type_regex),
+            ('mode_start', self.mode_start_regex),
+            ('mode_end', self.mode_end_regex),
+            ('server_endpoint', self.server_endpoint_regex),
+        ])
         self.vip_patterns = self.compile_vip_patterns()  # Compile VIP patterns at initialization
+        self.vip_pattern_set = PatternSet((regex.pattern, regex) for regex in self.vip_patterns)
+        # Compiled set for regex_patterns/google_sheets_mapping, rebuilt when the config changes
+        self._pattern_set = None
+        self._pattern_set_sources = (None, None)
+        # Incremental reader that keeps Game.log open between watchdog events
+        self.tail_reader = LogTailReader(self.log_file_path, checkpoint_path=checkpoint_path)
         # Process entire log if requested
         if self.process_all:
             self.process_entire_log()
+        elif self.tail_reader.resume():
+            # Continue exactly where the previous run stopped
+            self.last_position = self.tail_reader.offset
+            output_message(None, f"Resuming log file from checkpoint (position {self.last_position})")
         else:
             # Move to the end of the file if we're not processing everything
             self.last_position = self._get_file_end_position()
+            self.tail_reader.seek(self.last_position)
             output_message(None, f"Skipping to the end of log file (position {self.last_position})")
         # Setup message bus listener for actor_profile events
         # Store subscription IDs for proper cleanup on handler destruction
@@ -170,6 +223,11 @@ class LogFileHandler(FileSystemEventHandler):
             message_bus.on("config_updated", self._on_config_updated)
         ]
 
+    @property
+    def data_provider(self):
+        """Shared provider from the registry, rebuilt there when the datasource or credentials change."""
+        return get_data_provider(self.config_manager)
+
     def __getattr__(self, name):
         """
         Dynamically retrieve attributes from the config_manager when they're not found
@@ -401,25 +459,39 @@ class LogFileHandler(FileSystemEventHandler):
 
         self.stop_event.set()
         output_message(None, "Stopping log analyzer...")
+        self.tail_reader.save_checkpoint()
+        self.tail_reader.close()
         self.cleanup_threads()
+        self.discord_sender.stop(timeout=10)
         output_message(None, "Log analyzer stopped successfully")
 
     def cleanup_threads(self):
         """Ensure all threads are stopped"""
         # Wait for data thread to finish processing remaining items
-        if hasattr(self, 'data_thread') and self.data_thread.is_alive():
+        # data_thread only exists outside process_once mode (__getattr__ yields None otherwise)
+        data_thread = getattr(self, 'data_thread', None)
+        if data_thread is not None and data_thread.is_alive():
             output_message(None, "Waiting for data queue to complete...")
-            self.data_queue.join()
-            # Give it a moment to exit gracefully
-            time.sleep(0.5)
+            # Closing flushes the pending items right away; the worker exits once drained
+            self.data_queue.close()
+            data_thread.join(timeout=self.config_manager.get('data_queue_shutdown_timeout', 10))
+            if data_thread.is_alive():
+                # The worker is a daemon thread: stop waiting for a slow or unreachable provider
+                if getattr(self, 'outbox', None) is not None:
+                    output_message(None, f"Data queue did not drain in time; {self.outbox.pending_count()} undelivered "
+                                         f"events stay in the outbox for the next session", level="warning")
+                else:
+                    output_message(None, f"Data queue did not drain in time; {self.data_queue.qsize()} events "
+                                         f"were not delivered", level="warning")
+                # The worker may still commit()/fail() items: leave the outbox open, the process exit closes it
+                return
+        if getattr(self, 'outbox', None) is not None:
+            self.outbox.close()
 
     def _get_file_end_position(self):
         """Get the current end position of the log file"""
         try:
-            with open(self.log_file_path, 'r', encoding='utf-8', errors='ignore') as file:
-                # Go to the end of the file
-                file.seek(0, 2)  # 0 is the offset, 2 means from the end of the file
-                return file.tell()
+            return os.path.getsize(self.log_file_path)
         except Exception as e:
             output_message(None, f"Error getting file end position: {e}")
             return 0
@@ -471,67 +543,41 @@ class LogFileHandler(FileSystemEventHandler):
                 output_message(None, f"Rate limited Discord message for pattern: {pattern_name}")
                 return
                 
-            payload = {"content": content}
-            response = requests.post(url, json=payload)
-            if response.status_code not in [200, 204]:
-                output_message(None, f"Failed to send Discord message. Status code: {response.status_code}")
+            # Queued; HTTP errors and 429s are handled by the sender thread
+            self.discord_sender.send(url, content)
         except Exception as e:
             output_message(None, f"Error sending Discord message: {e}")
 
     def process_data_queue(self):
         """Worker thread to process data queue"""
-        # Define batch parameters
-        max_batch_size = 20  # Maximum number of items to process in one batch
-        max_wait_time = 0.5  # Maximum time to wait for a batch to fill (in seconds)
-        
-        while not self.stop_event.is_set():
+        batcher = self.data_queue
+        while True:
             try:
-                # Collect batch of items
-                batch = []
-                start_time = time.time()
-                
-                # Try to fill the batch up to max_batch_size or until max_wait_time is reached
-                while len(batch) < max_batch_size and (time.time() - start_time) < max_wait_time:
-                    try:
-                        # Try to get an item with a short timeout
-                        data,sheet_name = self.data_queue.get(timeout=0.1)
-                        batch.append({'data': data, 'sheet': data.get('sheet',self.current_mode or 'None')})
-                        
-                        # If queue is empty, don't wait for more items
-                        if self.data_queue.empty():
-                            break
-                    except queue.Empty:
-                        # No items in queue, break if we have at least one item or wait longer
-                        if len(batch) > 0:
-                            break
-                        # If batch is empty, wait longer
-                        time.sleep(0.2)
-                        
-                # Process the collected batch if not empty
-                if batch:
-                    message_bus.publish(
-                        content=f"Processing batch of {len(batch)} items", 
-                        level=MessageLevel.DEBUG,
-                        metadata={"source": "log_analyzer"}
-                    )                  
-                    # Process each event type batch
-                    if self.data_provider.process_data(batch):
-                        message_bus.publish(
-                            content=f"Successfully processed batch of {len(batch)} items", 
-                            level=MessageLevel.DEBUG,
-                            metadata={"source": "log_analyzer"}
-                        )
-                    else:
-                        message_bus.publish(
-                            content=f"Failed to process batch of {len(batch)} items", 
-                            level=MessageLevel.ERROR,
-                            metadata={"source": "log_analyzer"}
+                # Outbox items whose retry time has come go first, in batches of the current size
+                retry_in = self.outbox.next_retry_in() if self.outbox is not None else None
+                if retry_in == 0 and not batcher.closed:
+                    retries = self.outbox.take_due(batcher.batch_size)
+                    if retries:
+                        self._flush_data_batch(
+                            [{'data': data, 'sheet': sheet_name} for _id, data, sheet_name, _event_type in retries],
+                            [outbox_id for outbox_id, _data, _sheet_name, _event_type in retries]
                         )
-                    
-                    # Mark all items as done
-                    for _ in range(len(batch)):
-                        self.data_queue.task_done()
-                
+                    continue
+
+                # Sleeps until a batch is ready (or the next outbox retry is due); no polling
+                batch = batcher.get_batch(timeout=retry_in)
+                if batch is None:
+                    break
+                if not batch:
+                    continue
+                try:
+                    self._flush_data_batch(
+                        [{'data': data, 'sheet': sheet_name} for data, sheet_name, _outbox_id in batch],
+                        [outbox_id for _data, _sheet_name, outbox_id in batch]
+                    )
+                finally:
+                    batcher.task_done(len(batch))
+
             except Exception as e:
                 message_bus.publish(
                     content=f"Exception in data queue worker thread: {e}", 
@@ -540,6 +586,8 @@ class LogFileHandler(FileSystemEventHandler):
                 )
                 logging.error(f"Exception in data queue worker thread: {str(e)}")
                 logging.error(traceback.format_exc())
+                # Avoid spinning if the failure repeats on every iteration
+                self.stop_event.wait(1.0)
         
         message_bus.publish(
             content="Data queue worker thread stopped", 
@@ -547,6 +595,68 @@ class LogFileHandler(FileSystemEventHandler):
             metadata={"source": "log_analyzer"}
         )
 
+    def _flush_data_batch(self, batch, outbox_ids):
+        """
+        Send one batch to the data provider and settle its outbox entries.
+
+        Only the items the provider reports as delivered are committed; the rest are
+        retried from the outbox (or parked there after too many attempts).
+
+        Args:
+            batch: List of {'data': ..., 'sheet': ...} items.
+            outbox_ids: Outbox ids of the items (None for items not persisted).
+        """
+        batcher = self.data_queue
+        started = time.monotonic()
+        delivered = []
+        unavailable = None
+        try:
+            delivered = self.data_provider.deliver_batch(batch)
+        except DataProviderUnavailable as e:
+            delivered, unavailable = e.delivered, e
+        except Exception as e:
+            if self.outbox is not None:
+                self.outbox.fail(outbox_ids, e)
+            raise
+        finally:
+            elapsed = time.monotonic() - started
+            batcher.record_flush(len(batch), elapsed, len(delivered) == len(batch))
+
+        delivered_set = set(delivered)
+        rejected_ids = [outbox_id for position, outbox_id in enumerate(outbox_ids) if position not in delivered_set]
+        if self.outbox is not None:
+            self.outbox.commit([outbox_ids[position] for position in delivered])
+
+        if len(delivered) == len(batch):
+            backlog, next_size = batcher.qsize(), batcher.batch_size
+            message_bus.publish(
+                content=lambda: (
+                    f"Processed batch of {len(batch)} items in {elapsed * 1000:.0f} ms "
+                    f"(backlog {backlog}, next batch size {next_size})"
+                ),
+                level=MessageLevel.DEBUG,
+                metadata={"source": "log_analyzer", "action": "data_batch"}
+            )
+        else:
+            parked = 0
+            if self.outbox is not None:
+                # Kept on disk and retried with exponential backoff
+                parked = self.outbox.fail(rejected_ids, unavailable or "data provider rejected the item",
+                                          transient=unavailable is not None)
+            message_bus.publish(
+                content=f"Failed to process {len(batch) - len(delivered)} of {len(batch)} items"
+                        f"{', will retry from the outbox' if self.outbox is not None else ''}", 
+                level=MessageLevel.ERROR,
+                metadata={"source": "log_analyzer"}
+            )
+            if parked:
+                message_bus.publish(
+                    content=f"{parked} items rejected {self.outbox.max_attempts} times were parked in the outbox "
+                            f"({self.outbox.parked_count()} parked in total)",
+                    level=MessageLevel.WARNING,
+                    metadata={"source": "log_analyzer"}
+                )
+
     def update_data_queue(self, data, event_type):
         """
         Add data to the data queue, including state information.
@@ -585,7 +695,17 @@ class LogFileHandler(FileSystemEventHandler):
                     level=MessageLevel.DEBUG
                 )
 
-        self.data_queue.put((data_with_state, event_type))
+        sheet_name = data_with_state.get('sheet', self.current_mode or 'None')
+        outbox_id = None
+        if self.outbox is not None:
+            try:
+                # Persist before acknowledging so the event survives outages and restarts
+                outbox_id = self.outbox.append(data_with_state, sheet_name, event_type)
+            except sqlite3.Error as e:
+                output_message(None, f"Could not persist event to the outbox: {e}", level="warning")
+        if not self.data_queue.put((data_with_state, sheet_name, outbox_id)):
+            # Shutting down: the outbox copy (if any) is sent on the next start
+            return False
         return True
 
     def on_modified(self, event):
@@ -791,28 +911,20 @@ class LogFileHandler(FileSystemEventHandler):
 
     def process_new_entries(self):
         try:
-            current_file_size = os.path.getsize(self.log_file_path)
-            
-            # Detect log truncation
-            if self.last_position > current_file_size:
-                output_message(None, "Log file truncated. Resetting position to the beginning.")
+            # Detect log truncation or replacement (new inode / creation time)
+            rotation = self.tail_reader.detect_rotation()
+            if rotation:
+                output_message(None, f"Log file {rotation}. Resetting position to the beginning.")
                 self.reset_state()
-                self.last_position = 0
 
-            with open(self.log_file_path, 'r', encoding='utf-8', errors='ignore') as file:
-                # Move to the last read position
-                file.seek(self.last_position)
-                
-                # Read new entries
-                new_entries = file.readlines()
-                
-                # Update last position
-                self.last_position = file.tell()
-                
-                # Process each new entry
-                for entry in new_entries:
-                    self.parse_log_entry(entry)
+            # Stream complete lines from the open handle, partial lines wait for the next event
+            for entry in self.tail_reader.read_lines():
+                self.parse_log_entry(entry)
+                self.last_position = self.tail_reader.offset
+
+            self.tail_reader.save_checkpoint()
         except FileNotFoundError:
+            self.tail_reader.close()
             output_message(None, "Log file not found. Waiting for it to be created...")
             time.sleep(1)  # Wait briefly for the file to reappear
         except PermissionError:
@@ -824,6 +936,13 @@ class LogFileHandler(FileSystemEventHandler):
 
     def process_entire_log(self):
         try:
+            file_size = os.path.getsize(self.log_file_path)
+            workers = log_replay.resolve_workers(self.config_manager.get('replay_workers', 0))
+            threshold = float(self.config_manager.get('replay_parallel_threshold_mb', 16)) * 1024 * 1024
+            if workers > 1 and file_size >= threshold:
+                self._process_entire_log_parallel(file_size, workers)
+                return
+
             with open(self.log_file_path, 'r', encoding='utf-8', errors='ignore') as file:
                 entries = file.readlines()
                 
@@ -840,6 +959,8 @@ class LogFileHandler(FileSystemEventHandler):
                         wx.YieldIfNeeded()
                         
                 self.last_position = file.tell()
+            self.tail_reader.seek(self.last_position)
+            self.tail_reader.save_checkpoint()
         except PermissionError:
             output_message(None, "Unable to read log file. Make sure it's not locked by another process.")
         except Exception as e:
@@ -847,12 +968,43 @@ class LogFileHandler(FileSystemEventHandler):
             logging.error("An error occurred: %s", str(e))
             logging.error("Stack trace:\n%s", traceback.format_exc())
 
+    def _process_entire_log_parallel(self, file_size, workers):
+        """
+        Replay the log using a process pool for the stateless regex scan.
+
+        Workers only return the lines matched by a mode, VIP or configured pattern; those
+        lines are then parsed here in file order so mode/nickname/shard state evolves
+        exactly as in the serial replay.
+        """
+        output_message(None, f"Replaying {file_size / (1024 * 1024):.1f} MB of log with {workers} worker processes")
+        pattern_set = self._get_pattern_set()
+        patterns = (
+            [(f"mode:{name}", self.mode_pattern_set.get(name)) for name in self.mode_pattern_set.names]
+            + [(f"vip:{name}", self.vip_pattern_set.get(name)) for name in self.vip_pattern_set.names]
+            + [(f"pattern:{name}", pattern_set.get(name)) for name in pattern_set.names]
+        )
+
+        # Check if we're in GUI mode
+        in_gui_mode = hasattr(main, 'in_gui') and main.in_gui
+
+        entries = log_replay.iter_candidate_lines(self.log_file_path, patterns, workers, end=file_size)
+        for i, entry in enumerate(entries):
+            self.parse_log_entry(entry, send_message=False)
+
+            if in_gui_mode and i % 4 == 0 and i > 0:
+                import wx
+                wx.YieldIfNeeded()
+
+        self.last_position = file_size
+        self.tail_reader.seek(self.last_position)
+        self.tail_reader.save_checkpoint()
+
     def detect_vip(self, entry, send_message=True):
         """
         Detect if any VIP appears in the log line. Use the same pattern as detect_and_emit_generic.
         """
-        for vip_regex in self.vip_patterns:
-            match = vip_regex.search(entry)
+        for vip_name in self.vip_pattern_set.candidates(entry):
+            match = self.vip_pattern_set.get(vip_name).search(entry)
             if match:
                 data = match.groupdict()
                 timestamp = data.get('timestamp',datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S'))           # Add state data to the detected data
@@ -876,18 +1028,50 @@ class LogFileHandler(FileSystemEventHandler):
         if self.detect_mode_change(entry, send_message):
             return
 
-        # First process patterns in google_sheets_mapping
-        for pattern_name in self.google_sheets_mapping:
-            success, _ = self.detect_and_emit_generic(entry, pattern_name, send_message)
-            if success:
+        # Patterns in google_sheets_mapping go first, then the rest of regex_patterns;
+        # the pattern set only runs the regexes whose literal anchor occurs in the entry
+        pattern_set = self._get_pattern_set()
+        for pattern_name in pattern_set.candidates(entry):
+            data = self.detect_generic(entry, pattern_set.get(pattern_name))
+            if data:
+                self._emit_generic_match(data, pattern_name, send_message)
                 return
 
-        # Then process patterns in regex_patterns, skipping those in google_sheets_mapping
-        for pattern_name in self.regex_patterns.keys():
-            if pattern_name not in self.google_sheets_mapping:
-                success, _ = self.detect_and_emit_generic(entry, pattern_name, send_message)
-                if success:
-                    return
+    def _get_pattern_set(self):
+        """
+        Return the compiled PatternSet for the configured patterns, rebuilding it when
+        regex_patterns or google_sheets_mapping have been replaced in the config.
+        """
+        regex_patterns = self.regex_patterns or {}
+        google_sheets_mapping = self.google_sheets_mapping or []
+        if (self._pattern_set is None
+                or self._pattern_set_sources[0] is not regex_patterns
+                or self._pattern_set_sources[1] is not google_sheets_mapping):
+            self._pattern_set = self._build_pattern_set(regex_patterns, google_sheets_mapping)
+            self._pattern_set_sources = (regex_patterns, google_sheets_mapping)
+        return self._pattern_set
+
+    def _build_pattern_set(self, regex_patterns, google_sheets_mapping):
+        """Compile regex_patterns in evaluation order (google_sheets_mapping first)."""
+        ordered = []
+        for pattern_name in google_sheets_mapping:
+            if pattern_name not in regex_patterns:
+                output_message(None, f"Pattern {pattern_name} not found in configuration")
+                continue
+            ordered.append((pattern_name, regex_patterns[pattern_name]))
+        for pattern_name, pattern in regex_patterns.items():
+            if pattern_name not in google_sheets_mapping:
+                ordered.append((pattern_name, pattern))
+
+        pattern_set = PatternSet(ordered)
+        for pattern_name, error in pattern_set.invalid.items():
+            output_message(None, f"Invalid regex for pattern {pattern_name}: {error}", level="error")
+        message_bus.publish(
+            content=f"Compiled {len(pattern_set)} log patterns",
+            level=MessageLevel.DEBUG,
+            metadata={"source": "log_analyzer"}
+        )
+        return pattern_set
 
     def compile_vip_patterns(self):
         """
@@ -911,7 +1095,11 @@ class LogFileHandler(FileSystemEventHandler):
         """
         Detect if the log entry represents a change in game mode using the new regex patterns.
         """
-        nickname_match = self.nickname_regex.search(entry)
+        candidates = self.mode_pattern_set.candidates(entry)
+        if not candidates:
+            return False
+
+        nickname_match = self.nickname_regex.search(entry) if 'nickname' in candidates else None
         if nickname_match:
             nickname_data = nickname_match.groupdict()
             new_nickname = nickname_data.get('nickname')
@@ -932,7 +1120,7 @@ class LogFileHandler(FileSystemEventHandler):
                 return True
 
         # --- BLOQUEO DE GRABACIÓN POR LOBBY PRIVADO EN MODOS EA_* ---
-        lobby_match = self.lobby_type_regex.search(entry)
+        lobby_match = self.lobby_type_regex.search(entry) if 'lobby_type' in candidates else None
         if lobby_match:
             network = lobby_match.group('network')
             mode = lobby_match.group('mode')
@@ -943,7 +1131,7 @@ class LogFileHandler(FileSystemEventHandler):
                     self.block_private_lobby_recording = False
 
         # Check for mode start (Context Establisher Done)
-        start_match = self.mode_start_regex.search(entry)
+        start_match = self.mode_start_regex.search(entry) if 'mode_start' in candidates else None
         if start_match:
             mode_data = start_match.groupdict()
             new_mode = mode_data.get('gamerules')
@@ -998,7 +1186,7 @@ class LogFileHandler(FileSystemEventHandler):
                 return True
 
         # Check for mode end (Channel Disconnected with gamerules)
-        end_match = self.mode_end_regex.search(entry)
+        end_match = self.mode_end_regex.search(entry) if 'mode_end' in candidates else None
         if end_match:
             mode_data = end_match.groupdict()
             gamerules = mode_data.get('gamerules')
@@ -1041,7 +1229,7 @@ class LogFileHandler(FileSystemEventHandler):
                 return True
                 
         # Check for server endpoint version (PU/PTU)
-        endpoint_match = self.server_endpoint_regex.search(entry)
+        endpoint_match = self.server_endpoint_regex.search(entry) if 'server_endpoint' in candidates else None
         if endpoint_match:
             endpoint_data = endpoint_match.groupdict()
             new_server_version = endpoint_data.get('server_version')
@@ -1105,33 +1293,48 @@ class LogFileHandler(FileSystemEventHandler):
             output_message(None, f"Pattern {pattern_name} not found in configuration")
             return False, None
     
-        data = self.detect_generic(entry, self.regex_patterns[pattern_name])
+        pattern = self._get_pattern_set().get(pattern_name) or self.regex_patterns[pattern_name]
+        data = self.detect_generic(entry, pattern)
         if data:
-            self.clean_trailing_ids(data)
-            # Extract player and action information
-            data['player'] = data.get('player') or data.get('owner') or data.get('entity') or 'Unknown'
-            data['action'] = pattern_name.replace('_', ' ').title()
-            timestamp = data.get('timestamp')
-            data['username'] = self.username  # Use instance attribute
-            
-            # Clean IDs - remove trailing underscores followed by 4+ consecutive digits
-            
-            # Add state data to the detected data
-            data = self.add_state_data(data)
-    
-            output_message_format = self.messages.get(pattern_name)
-            if output_message_format:
-                output_message(timestamp, output_message_format.format(**ensure_all_field(data)), regex_pattern=pattern_name)
+            return True, self._emit_generic_match(data, pattern_name, send_message)
+        return False, None
+
+    def _emit_generic_match(self, data, pattern_name, send_message=True):
+        """
+        Enrich the groups matched by a configured pattern and emit them.
+
+        Args:
+            data: Dictionary of matched groups.
+            pattern_name: Name of the pattern in regex_patterns config.
+            send_message: Whether to send the message or not.
+
+        Returns:
+            dict: The enriched data.
+        """
+        self.clean_trailing_ids(data)
+        # Extract player and action information
+        data['player'] = data.get('player') or data.get('owner') or data.get('entity') or 'Unknown'
+        data['action'] = pattern_name.replace('_', ' ').title()
+        timestamp = data.get('timestamp')
+        data['username'] = self.username  # Use instance attribute
+        
+        # Clean IDs - remove trailing underscores followed by 4+ consecutive digits
+        
+        # Add state data to the detected data
+        data = self.add_state_data(data)
     
-            if send_message:
-                self.send_discord_message(data, pattern_name=pattern_name)            # Send to data queue
-                if  pattern_name in self.google_sheets_mapping:
-                    self.update_data_queue(data, pattern_name)
-                self.send_realtime_event(data, pattern_name)            
-                self.async_profile_scraping(data, pattern_name)
+        output_message_format = self.messages.get(pattern_name)
+        if output_message_format:
+            output_message(timestamp, output_message_format.format(**ensure_all_field(data)), regex_pattern=pattern_name)
     
-            return True, data
-        return False, None
+        if send_message:
+            self.send_discord_message(data, pattern_name=pattern_name)            # Send to data queue
+            if  pattern_name in self.google_sheets_mapping:
+                self.update_data_queue(data, pattern_name)
+            self.send_realtime_event(data, pattern_name)            
+            self.async_profile_scraping(data, pattern_name)
+
+        return data
 
     def clean_trailing_ids(self, data):
         for key, value in data.items():
@@ -1151,6 +1354,7 @@ class LogFileHandler(FileSystemEventHandler):
         self.username = self.config_manager.get('username', 'Unknown')
         self.in_ea_mode = False
         self.last_position = 0
+        self.tail_reader.reopen()
         self.actor_state = {}
         # Emit events to notify subscribers about the reset
         from helpers.core.message_bus import message_bus
@@ -1333,12 +1537,16 @@ class LogFileHandler(FileSystemEventHandler):
 
     def _on_config_updated(self, config_key):
         """Handler for config_updated events from message bus"""
+        if config_key.split('.')[0] in ('regex_patterns', 'google_sheets_mapping'):
+            # Nested edits mutate the same dict, so the identity check would miss them
+            self._pattern_set = None
         if config_key == 'important_players':
             # Get old pattern count for logging
             old_count = len(self.vip_patterns) if hasattr(self, 'vip_patterns') else 0
             
             # Recompile VIP patterns
             self.vip_patterns = self.compile_vip_patterns()
+            self.vip_pattern_set = PatternSet((regex.pattern, regex) for regex in self.vip_patterns)
             new_count = len(self.vip_patterns)
             
             # Log confirmation of recompilation
@@ -1420,6 +1628,20 @@ def startup(process_all=False, use_discord=None, process_once=False, datasource=
         # Initialize environment detection (MULTI-ENV-LOG-001 Fase 3)
         config_manager.initialize_environment_detection()
         
+        # Dispatch lanes and worker pool of the message bus
+        message_bus.configure(
+            workers=config_manager.get('message_bus_workers'),
+            lane_limits=config_manager.get('message_bus_lane_limits'),
+            lane_policies=config_manager.get('message_bus_lane_policies'),
+            event_lanes=config_manager.get('message_bus_event_lanes')
+        )
+        message_bus.configure_history(
+            max_size=config_manager.get('message_history_size'),
+            spill_path=history_spill_path if config_manager.get('message_history_spill') else '',
+            min_level=config_manager.get('message_history_min_level')
+        )
+        message_bus.set_metrics_interval(config_manager.get('message_bus_metrics_interval', 0))
+        
         # Log file path must exist
         if not os.path.exists(config_manager.get('log_file_path')):
             output_message(None, f"Log file not found at {config_manager.get('log_file_path')}")
@@ -1437,6 +1659,7 @@ def startup(process_all=False, use_discord=None, process_once=False, datasource=
         if event_handler.process_once:
             output_message(None, "Processing log file once and exiting...")
             event_handler.process_entire_log()
+            event_handler.discord_sender.stop(timeout=30)
             return event_handler
 
         # Log monitoring status just before starting the observer
@@ -1502,6 +1725,9 @@ def main(process_all=False, use_discord=None, process_once=False, datasource=Non
         raise
 
 if __name__ == "__main__":
+    # Required by the process pool used by --process-all in frozen builds
+    import multiprocessing
+    multiprocessing.freeze_support()
     # Check for optional flags
     if '--help' in sys.argv or '-h' in sys.argv:
         print(f"SC Log Analyzer v{get_version()}")
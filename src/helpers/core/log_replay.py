@@ -0,0 +1,127 @@
+"""
+Reproducción paralela de Game.log completos (--process-all).
+
+El fichero se divide en rangos de bytes alineados a fin de línea y un pool de procesos
+busca en cada rango las líneas en las que encaja alguna regex (modo, VIP o patrones
+configurados). Esa parte no tiene estado. El proceso principal recibe los rangos en orden
+y vuelve a pasar por parse_log_entry solo esas líneas, así que las transiciones de
+nickname/shard/modo se aplican exactamente en el mismo orden que en la lectura en serie.
+"""
+import os
+import math
+from itertools import repeat
+from concurrent.futures import ProcessPoolExecutor
+
+from helpers.core.pattern_set import PatternSet
+from helpers.core.message_bus import message_bus, MessageLevel
+
+MAX_RANGE_BYTES = 16 * 1024 * 1024
+RANGES_PER_WORKER = 4
+
+# Pattern set of each worker process, built once by _init_worker
+_worker_patterns = None
+
+
+def resolve_workers(configured):
+    """
+    Number of worker processes to use for a replay.
+
+    Args:
+        configured: Value of the replay_workers setting (0 or None means one per spare core).
+    """
+    try:
+        configured = int(configured or 0)
+    except (TypeError, ValueError):
+        configured = 0
+    if configured > 0:
+        return configured
+    return max(1, (os.cpu_count() or 1) - 1)
+
+
+def split_line_ranges(path, end, count):
+    """
+    Split the first ``end`` bytes of ``path`` into up to ``count`` ranges on line boundaries.
+
+    Returns:
+        List of (start, stop) byte offsets covering [0, end) without gaps.
+    """
+    if end <= 0:
+        return []
+    count = max(1, count)
+    boundaries = [0]
+    with open(path, 'rb') as f:
+        for i in range(1, count):
+            target = max(boundaries[-1], end * i // count)
+            f.seek(target)
+            if target > 0:
+                f.readline()  # Move to the start of the next line
+            position = min(f.tell(), end)
+            if position > boundaries[-1]:
+                boundaries.append(position)
+    if boundaries[-1] < end:
+        boundaries.append(end)
+    return list(zip(boundaries[:-1], boundaries[1:]))
+
+
+def _init_worker(patterns):
+    global _worker_patterns
+    _worker_patterns = PatternSet(patterns)
+
+
+def _scan_range(path, start, stop):
+    """Return the lines of [start, stop) that match at least one replay pattern."""
+    with open(path, 'rb') as f:
+        f.seek(start)
+        data = f.read(stop - start)
+    hits = []
+    for raw in data.split(b'\n'):
+        if not raw:
+            continue
+        line = (raw + b'\n').decode('utf-8', errors='ignore').replace('\r\n', '\n')
+        _name, match = _worker_patterns.search(line)
+        if match:
+            hits.append(line)
+    return hits
+
+
+def iter_candidate_lines(path, patterns, workers, end=None):
+    """
+    Yield, in file order, every line of ``path`` that matches one of ``patterns``.
+
+    Lines that match nothing are dropped in the workers, so the caller only has to run
+    its stateful parsing on a small fraction of the file. If the process pool cannot be
+    used (frozen build without freeze_support, pickling or OS errors) the remaining
+    ranges are scanned in this process.
+
+    Args:
+        path: Log file to scan.
+        patterns: Iterable of (name, compiled regex) pairs; regexes must be picklable.
+        workers: Number of worker processes.
+        end: Only scan up to this byte offset (defaults to the current file size).
+    """
+    patterns = list(patterns)
+    if end is None:
+        end = os.path.getsize(path)
+    range_count = max(workers * RANGES_PER_WORKER, math.ceil(end / MAX_RANGE_BYTES))
+    ranges = split_line_ranges(path, end, range_count)
+    done = 0
+
+    if workers > 1 and len(ranges) > 1:
+        try:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(patterns,)) as executor:
+                starts = [start for start, _ in ranges]
+                stops = [stop for _, stop in ranges]
+                for lines in executor.map(_scan_range, repeat(path), starts, stops):
+                    done += 1
+                    yield from lines
+        except Exception as e:
+            message_bus.publish(
+                content=f"Parallel log replay unavailable, continuing in a single process: {e}",
+                level=MessageLevel.WARNING,
+                metadata={"source": "log_replay"}
+            )
+
+    if done < len(ranges):
+        _init_worker(patterns)
+        for start, stop in ranges[done:]:
+            yield from _scan_range(path, start, stop)
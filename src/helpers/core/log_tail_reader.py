@@ -0,0 +1,270 @@
+"""
+LogTailReader: lector incremental de Game.log con handle persistente y checkpoint en disco.
+
+Mantiene el fichero abierto entre eventos del observer, lee en bloques binarios fijos
+guardando las líneas parciales para la siguiente lectura, detecta rotación/sustitución
+del fichero por inode/dispositivo/fecha de creación además de por tamaño, y persiste
+(path, inode, offset, last_line_hash) para que un reinicio continúe donde se quedó.
+"""
+import os
+import json
+import hashlib
+import threading
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+
+def _open_shared(path):
+    """
+    Open ``path`` for binary reading without blocking the game from rotating it.
+
+    On Windows a plain ``open`` does not grant FILE_SHARE_DELETE, so Star Citizen could not
+    move Game.log to logbackups while we hold the handle. pywin32 is used when available.
+    """
+    if os.name == 'nt':
+        try:
+            import msvcrt
+            import win32file
+            handle = win32file.CreateFile(
+                path,
+                win32file.GENERIC_READ,
+                win32file.FILE_SHARE_READ | win32file.FILE_SHARE_WRITE | win32file.FILE_SHARE_DELETE,
+                None,
+                win32file.OPEN_EXISTING,
+                win32file.FILE_ATTRIBUTE_NORMAL,
+                None
+            )
+            fd = msvcrt.open_osfhandle(handle.Detach(), os.O_RDONLY | os.O_BINARY)
+            return os.fdopen(fd, 'rb', buffering=0)
+        except ImportError:
+            pass
+    return open(path, 'rb', buffering=0)
+
+
+def _file_identity(st):
+    """Identity tuple used to tell whether two stat results describe the same file."""
+    created = getattr(st, 'st_birthtime', None)
+    if created is None and os.name == 'nt':
+        created = st.st_ctime  # st_ctime is the creation time on Windows
+    return st.st_dev, st.st_ino, created
+
+
+def _line_hash(line):
+    return hashlib.md5(line).hexdigest()
+
+
+class LogTailReader:
+    """
+    Incremental reader for an append-only log file.
+
+    Lines are only returned once their terminating newline has been written, and the
+    offset always points right after the last returned line, so a half-written line is
+    never parsed twice or truncated.
+    """
+
+    def __init__(self, path, checkpoint_path=None, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Args:
+            path: Path of the log file to follow.
+            checkpoint_path: JSON file where the read position is persisted (None disables it).
+            chunk_size: Number of bytes read per ``read`` call.
+        """
+        self.path = path
+        self.checkpoint_path = checkpoint_path
+        self.chunk_size = chunk_size
+        self._file = None
+        self._identity = None
+        self._offset = 0
+        self._carry = b''
+        self._last_line = None  # bytes of the last complete line returned
+        self._last_line_hash = None  # stored hash when resuming from a checkpoint
+        self._saved_state = None
+        self._lock = threading.RLock()
+
+    @property
+    def offset(self):
+        """Byte offset right after the last complete line returned."""
+        return self._offset
+
+    def _open(self):
+        self._file = _open_shared(self.path)
+        self._identity = _file_identity(os.fstat(self._file.fileno()))
+        self._carry = b''
+
+    def close(self):
+        """Close the underlying handle (the offset is kept)."""
+        with self._lock:
+            if self._file is not None:
+                try:
+                    self._file.close()
+                except OSError:
+                    pass
+            self._file = None
+            self._identity = None
+            self._carry = b''
+
+    def reopen(self):
+        """Forget the current handle and start again from the beginning of the file."""
+        with self._lock:
+            self.close()
+            self._offset = 0
+            self._last_line = None
+            self._last_line_hash = None
+
+    def seek(self, offset):
+        """Continue reading from ``offset`` (must be at a line boundary)."""
+        with self._lock:
+            self._offset = max(0, int(offset))
+            self._carry = b''
+            self._last_line = None
+            # A checkpoint saved before the next read must still verify on resume()
+            try:
+                self._last_line_hash = self._hash_of_line_before(self._offset)
+            except OSError:
+                self._last_line_hash = None
+
+    def seek_end(self):
+        """Skip everything currently in the file. Returns the new offset."""
+        with self._lock:
+            self.seek(os.path.getsize(self.path))
+            return self._offset
+
+    def detect_rotation(self):
+        """
+        Check whether the file was truncated or replaced since it was opened.
+
+        Returns:
+            None when the current handle is still valid, otherwise 'replaced' or 'truncated'.
+            The caller decides how to reset its state and should then call ``reopen``.
+        """
+        with self._lock:
+            st = os.stat(self.path)
+            if self._file is not None:
+                identity = _file_identity(st)
+                # st_ino is 0 on filesystems that do not expose it; fall back to size only
+                if identity[1] and identity != self._identity:
+                    return 'replaced'
+            if st.st_size < self._offset:
+                return 'truncated'
+            return None
+
+    def read_lines(self):
+        """
+        Yield every complete line appended since the last call.
+
+        Lines are decoded as UTF-8 (undecodable bytes are dropped) and CRLF endings are
+        normalised to '\\n', matching what the text-mode reader produced before.
+        """
+        with self._lock:
+            if self._file is None:
+                self._open()
+            self._file.seek(self._offset + len(self._carry))
+            finished = False
+            try:
+                while True:
+                    chunk = self._file.read(self.chunk_size)
+                    if not chunk:
+                        break
+                    data = self._carry + chunk
+                    end = data.rfind(b'\n')
+                    if end < 0:
+                        self._carry = data
+                        continue
+                    self._carry = data[end + 1:]
+                    start = 0
+                    while start <= end:
+                        stop = data.index(b'\n', start) + 1
+                        raw = data[start:stop]
+                        start = stop
+                        self._offset += len(raw)
+                        self._last_line = raw
+                        yield raw.decode('utf-8', errors='ignore').replace('\r\n', '\n')
+                finished = True
+            finally:
+                if not finished:
+                    # The consumer stopped early: the carry no longer follows the offset
+                    self._carry = b''
+
+    def _checkpoint_state(self):
+        identity = self._identity or _file_identity(os.stat(self.path))
+        return {
+            'path': os.path.normcase(os.path.abspath(self.path)),
+            'device': identity[0],
+            'inode': identity[1],
+            'created': identity[2],
+            'offset': self._offset,
+            'last_line_hash': _line_hash(self._last_line) if self._last_line is not None else self._last_line_hash,
+        }
+
+    def save_checkpoint(self):
+        """
+        Persist the current position. Writes are skipped when nothing changed.
+
+        Returns:
+            bool: True if the checkpoint is up to date on disk.
+        """
+        if not self.checkpoint_path:
+            return False
+        with self._lock:
+            try:
+                state = self._checkpoint_state()
+                if state == self._saved_state:
+                    return True
+                tmp_path = f"{self.checkpoint_path}.tmp"
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(state, f)
+                os.replace(tmp_path, self.checkpoint_path)
+                self._saved_state = state
+                return True
+            except OSError:
+                return False
+
+    def _hash_of_line_before(self, offset):
+        """Hash of the complete line that ends exactly at ``offset`` (None if unavailable)."""
+        if offset <= 0:
+            return None
+        start = max(0, offset - self.chunk_size)
+        with _open_shared(self.path) as f:
+            f.seek(start)
+            data = f.read(offset - start)
+        if not data.endswith(b'\n'):
+            return None
+        previous = data.rfind(b'\n', 0, len(data) - 1)
+        if previous < 0 and start > 0:
+            return None  # Line longer than the window, cannot be verified
+        return _line_hash(data[previous + 1:])
+
+    def resume(self):
+        """
+        Restore the position stored in the checkpoint if it still describes this file.
+
+        The checkpoint is accepted only when the path and file identity match, the file is
+        at least as long as the stored offset and the line before the offset hashes to the
+        stored value.
+
+        Returns:
+            bool: True if the reader now continues from the checkpoint offset.
+        """
+        if not self.checkpoint_path or not os.path.exists(self.checkpoint_path):
+            return False
+        with self._lock:
+            try:
+                with open(self.checkpoint_path, 'r', encoding='utf-8') as f:
+                    state = json.load(f)
+                st = os.stat(self.path)
+                device, inode, created = _file_identity(st)
+                if state.get('path') != os.path.normcase(os.path.abspath(self.path)):
+                    return False
+                if (state.get('device'), state.get('inode'), state.get('created')) != (device, inode, created):
+                    return False
+                offset = int(state.get('offset', 0))
+                if offset > st.st_size:
+                    return False
+                if self._hash_of_line_before(offset) != state.get('last_line_hash'):
+                    return False
+            except (OSError, ValueError, TypeError):
+                return False
+            self.seek(offset)
+            self._last_line_hash = state.get('last_line_hash')
+            self._saved_state = state
+            return True
@@ -1,12 +1,18 @@
 import threading
 import time
-import queue
+from collections import deque
 from enum import Enum, auto
-from typing import Dict, List, Callable, Optional, Any
+from fnmatch import fnmatchcase
+from functools import partial
+from itertools import chain
+from typing import Dict, List, Callable, Optional, Any, Union
 import sys
 import logging
 import os
 
+from helpers.core.message_history import MessageHistory
+from helpers.core.bus_metrics import BusMetrics
+
 # Configure logger for components that don't use message bus
 default_logger = logging.getLogger("default")
 default_handler = logging.StreamHandler(sys.stdout)
@@ -40,7 +46,7 @@ class Message:
     """
     def __init__(
         self, 
-        content: str, 
+        content: Union[str, Callable[[], str]], 
         timestamp: Optional[str] = None, 
         level: MessageLevel = MessageLevel.INFO,
         pattern_name: Optional[str] = None,
@@ -50,13 +56,13 @@ class Message:
         Initialize a message.
         
         Args:
-            content: The message content
+            content: The message content, or a callable returning it (formatted on first access)
             timestamp: Optional timestamp (if None, current time will be used)
             level: Message priority level
             pattern_name: Optional name of the regex pattern that generated this message
             metadata: Additional metadata associated with the message
         """
-        self.content = content
+        self._content = content
         self.timestamp = timestamp
         
         # If no timestamp provided, use current time
@@ -68,6 +74,22 @@ class Message:
         self.metadata = metadata or {}
         self.creation_time = time.time()
         
+    @property
+    def content(self) -> str:
+        """The message content, formatted on first access when it was given as a callable."""
+        content = self._content
+        if callable(content):
+            try:
+                content = content()
+            except Exception as e:
+                content = f"<error formatting message: {e}>"
+            self._content = content
+        return content
+    
+    @content.setter
+    def content(self, value: Union[str, Callable[[], str]]) -> None:
+        self._content = value
+    
     def get_formatted_message(self) -> str:
         """
         Get the formatted message with timestamp.
@@ -86,9 +108,145 @@ class Message:
         return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(self.creation_time))
 
 
+def _message_to_record(message: Message) -> Dict[str, Any]:
+    """Serialise a message for the history spill file (event arguments are not kept)."""
+    metadata = {key: value for key, value in message.metadata.items() if key not in ('args', 'kwargs')}
+    return {
+        'content': message.content,
+        'timestamp': message.timestamp,
+        'level': message.level.name,
+        'pattern_name': message.pattern_name,
+        'metadata': metadata,
+        'creation_time': message.creation_time,
+    }
+
+
+def _message_from_record(record: Dict[str, Any]) -> Message:
+    """Rebuild a message read from the history spill file."""
+    message = Message(
+        content=record['content'],
+        timestamp=record.get('timestamp'),
+        level=MessageLevel[record.get('level', 'INFO')],
+        pattern_name=record.get('pattern_name'),
+        metadata=record.get('metadata') or {}
+    )
+    message.creation_time = record.get('creation_time', message.creation_time)
+    return message
+
+
+# Dispatch lanes, in priority order: the dispatcher always drains a lane before the next one
+LANE_CRITICAL = 0
+LANE_NORMAL = 1
+LANE_DEBUG = 2
+LANE_NAMES = ('critical', 'normal', 'debug')
+
+# Backpressure policies applied when a lane is full
+POLICY_BLOCK = 'block'  # Wait for room (threads of the bus itself never wait)
+POLICY_DROP_OLDEST = 'drop_oldest'
+POLICY_DROP_NEWEST = 'drop_newest'
+
+DEFAULT_WORKERS = 1  # One worker keeps every callback serial; more is opt-in (configure(workers=...))
+DEFAULT_LANE_LIMITS = (5000, 20000, 5000)
+DEFAULT_LANE_POLICIES = (POLICY_BLOCK, POLICY_BLOCK, POLICY_DROP_OLDEST)
+DEFAULT_WORKER_QUEUE_SIZE = 2000
+
+# Event classes that do not follow the level of their message (emit() always publishes at DEBUG)
+DEFAULT_EVENT_LANES = {
+    'realtime_event': LANE_CRITICAL,
+    'remote_realtime_event': LANE_CRITICAL,
+    'send_discord': LANE_CRITICAL,
+    'show_windows_notification': LANE_CRITICAL,
+    'profile_cached': LANE_DEBUG,
+}
+
+
+class _DispatchWorker:
+    """
+    Serial executor for the subscribers hashed to it.
+    
+    Every callback of a given subscriber runs on the same worker, so each subscriber
+    still sees its messages in publication order while a slow one only delays the
+    subscribers that share its worker.
+    """
+    
+    def __init__(self, bus, index: int, max_pending: int):
+        self.bus = bus
+        self.index = index
+        self.max_pending = max_pending
+        self.pending = deque()  # (lane, subscriber_id, label, callback, args, kwargs, message)
+        self.condition = threading.Condition()
+        self.running = False
+        self.thread = None
+        self.dropped = 0
+    
+    def start(self) -> None:
+        self.running = True
+        self.thread = threading.Thread(target=self._run, name=f"MessageBusWorker-{self.index}", daemon=True)
+        self.thread.start()
+    
+    def stop(self, timeout: float = 1.0) -> None:
+        """Stop after the current callback; pending items are kept for migration."""
+        with self.condition:
+            self.running = False
+            self.condition.notify_all()
+        if self.thread and self.thread is not threading.current_thread():
+            self.thread.join(timeout=timeout)
+    
+    def submit(self, item: tuple) -> None:
+        """
+        Queue a callback invocation, applying backpressure when the worker is behind.
+        
+        DEBUG items make room by dropping the oldest pending DEBUG item; anything else
+        waits (this only ever blocks the dispatcher thread, which in turn fills the lanes).
+        """
+        with self.condition:
+            while len(self.pending) >= self.max_pending and self.running:
+                if item[0] == LANE_DEBUG:
+                    for position, pending in enumerate(self.pending):
+                        if pending[0] == LANE_DEBUG:
+                            del self.pending[position]
+                            break
+                    else:
+                        self.dropped += 1
+                        return
+                    self.dropped += 1
+                    break
+                self.condition.wait(0.5)
+            self.pending.append(item)
+            self.bus.metrics.record_worker_depth(self.index, len(self.pending))
+            self.condition.notify_all()
+    
+    def _run(self) -> None:
+        self.bus._local.is_bus_thread = True
+        while True:
+            with self.condition:
+                while self.running and not self.pending:
+                    self.condition.wait()
+                if not self.running:
+                    return
+                lane, subscriber_id, label, callback, args, kwargs, message = self.pending.popleft()
+                self.condition.notify_all()
+            delivery_ms = (time.time() - message.creation_time) * 1000
+            started = time.perf_counter()
+            failed = False
+            try:
+                callback(*args, **kwargs)
+            except Exception as e:
+                # Don't let a subscriber error crash the bus
+                failed = True
+                print(f"Error in subscriber {subscriber_id}: {e}")
+            self.bus.metrics.record_callback(label, lane, delivery_ms, (time.perf_counter() - started) * 1000, failed)
+
+
 class MessageBus:
     """
     Central message bus that handles routing of messages to subscribers.
+    
+    Log messages go through the normal lane in publication order; named events enter
+    one of three priority lanes (critical, normal, debug) chosen from their event class.
+    A dispatcher thread drains the lanes in priority order and hands each subscriber
+    callback to the serial worker pool (one worker by default), hashing by subscriber
+    so per-subscriber ordering is kept.
     """
     _instance = None
     _lock = threading.Lock()
@@ -107,13 +265,42 @@ class MessageBus:
     def _initialize(self) -> None:
         """Initialize the message bus instance."""
         self.subscribers: List[Dict] = []
-        self.message_queue = queue.Queue()
         self.is_running = False
-        self.worker_thread = None
-        self.message_history: List[Message] = []
-        self.max_history_size = 1000  # Maximum number of messages to keep in history
+        self.worker_thread = None  # Dispatcher thread draining the lanes
+        # Priority lanes guarded by one condition (signals both "message available" and "room available")
+        self._lanes = tuple(deque() for _ in LANE_NAMES)
+        self._lanes_condition = threading.Condition()
+        self.lane_limits = list(DEFAULT_LANE_LIMITS)  # 0 means unbounded
+        self.lane_policies = list(DEFAULT_LANE_POLICIES)
+        self.lane_dropped = [0] * len(LANE_NAMES)
+        self.event_lanes: Dict[str, int] = dict(DEFAULT_EVENT_LANES)
+        self.worker_queue_size = DEFAULT_WORKER_QUEUE_SIZE
+        self._workers: List[_DispatchWorker] = self._create_workers(DEFAULT_WORKERS)
+        self._dispatch_lock = threading.Lock()  # Held while one message is being routed
+        self._local = threading.local()  # is_bus_thread flag for the dispatcher and workers
+        # Ring buffer with level/pattern/event indexes; evicted messages can spill to disk
+        self.message_history = MessageHistory(
+            max_size=1000, encode=_message_to_record, decode=_message_from_record
+        )
         self.filters = {}  # Filters for conditional message processing
         self.debug_mode = False  # Debug mode flag for peeking at messages
+        # Lowest level anybody consumes, so publish()/emit() can return before allocating.
+        # Recomputed by _refresh_interest() whenever subscribers, filters or debug mode change.
+        self.history_min_level = MessageLevel.DEBUG  # Everything is kept unless message_history_min_level raises it
+        self._min_level_value = MessageLevel.DEBUG.value
+        self._pattern_min_levels: Dict[str, int] = {}  # {pattern_name: min level value} for pattern-filtered subscribers
+        self._refresh_interest()
+        # Routing table for named events: {event_name: [handler, ...]}, separate from log subscribers.
+        # Lists are replaced (copy-on-write) so the worker can iterate them without locking.
+        self._event_routes: Dict[str, List[Dict]] = {}
+        self._wildcard_routes: List[Dict] = []  # Handlers subscribed with '*', 'prefix_*' or fnmatch patterns
+        self._wildcard_cache: Dict[str, List[Dict]] = {}  # {event_name: matching wildcard handlers}
+        self._event_subscriptions: Dict[str, Dict] = {}  # {subscription_id: handler}
+        self._routes_lock = threading.RLock()
+        self.event_dispatch_counts: Dict[str, Dict[str, int]] = {}  # {event_name: {'events', 'handlers'}}
+        self.metrics = BusMetrics(LANE_NAMES)
+        self.metrics_interval = 0  # Seconds between published metrics summaries (0 = off)
+        self._metrics_thread = None
         # The redirection of sys.stdout has been removed based on ARCH-001.
 
     def set_debug_mode(self, enabled: bool) -> None:
@@ -126,6 +313,7 @@ class MessageBus:
             enabled: True to enable debug mode, False to disable
         """
         self.debug_mode = enabled
+        self._refresh_interest()
         # This now prints directly to the original stdout, as redirection is removed.
         # This resolves the infinite loop issue in debug mode.
         print(f"Message bus debug mode {'enabled' if enabled else 'disabled'}")
@@ -142,74 +330,340 @@ class MessageBus:
     
     def start(self) -> None:
         """
-        Start the message bus processing thread.
+        Start the message bus dispatcher and worker threads.
         """
         if not self.is_running:
             self.is_running = True
-            self.worker_thread = threading.Thread(target=self._process_message_queue)
+            for worker in self._workers:
+                worker.start()
+            self.worker_thread = threading.Thread(target=self._process_message_queue, name="MessageBusDispatcher")
             self.worker_thread.daemon = True
             self.worker_thread.start()
     
     def stop(self) -> None:
         """
-        Stop the message bus processing thread.
+        Stop the message bus dispatcher and worker threads.
         """
         self.is_running = False
+        with self._lanes_condition:
+            self._lanes_condition.notify_all()
         if self.worker_thread and self.worker_thread.is_alive():
-            # Add a None message to unblock the queue
-            self.message_queue.put(None)
             self.worker_thread.join(timeout=1.0)
+        for worker in self._workers:
+            worker.stop()
+    
+    def configure(
+        self,
+        workers: Optional[int] = None,
+        lane_limits: Optional[Dict[str, int]] = None,
+        lane_policies: Optional[Dict[str, str]] = None,
+        event_lanes: Optional[Dict[str, str]] = None,
+        worker_queue_size: Optional[int] = None
+    ) -> None:
+        """
+        Tune the dispatch lanes and the worker pool. Can be called while running.
+        
+        Args:
+            workers: Number of serial dispatch workers
+            lane_limits: {lane name: max queued messages (0 = unbounded)}
+            lane_policies: {lane name: 'block' | 'drop_oldest' | 'drop_newest'}
+            event_lanes: {event name: lane name} overrides for named events
+            worker_queue_size: Max pending callbacks per worker before backpressure
+        """
+        with self._lanes_condition:
+            for name, limit in (lane_limits or {}).items():
+                if name in LANE_NAMES:
+                    self.lane_limits[LANE_NAMES.index(name)] = max(0, int(limit))
+            for name, policy in (lane_policies or {}).items():
+                if name in LANE_NAMES and policy in (POLICY_BLOCK, POLICY_DROP_OLDEST, POLICY_DROP_NEWEST):
+                    self.lane_policies[LANE_NAMES.index(name)] = policy
+            for event_name, lane_name in (event_lanes or {}).items():
+                if lane_name in LANE_NAMES:
+                    self.event_lanes[event_name] = LANE_NAMES.index(lane_name)
+            self._lanes_condition.notify_all()
+        
+        if worker_queue_size:
+            self.worker_queue_size = max(1, int(worker_queue_size))
+            for worker in self._workers:
+                worker.max_pending = self.worker_queue_size
+        if workers and max(1, int(workers)) != len(self._workers):
+            if self._is_bus_thread():
+                # A callback cannot wait for its own worker to stop
+                threading.Thread(target=self._resize_workers, args=(max(1, int(workers)),), daemon=True).start()
+            else:
+                self._resize_workers(max(1, int(workers)))
+    
+    def _create_workers(self, count: int) -> List[_DispatchWorker]:
+        return [_DispatchWorker(self, index, self.worker_queue_size) for index in range(count)]
+    
+    def _resize_workers(self, count: int) -> None:
+        """
+        Replace the worker pool, moving pending callbacks to the worker that now owns
+        their subscriber so per-subscriber ordering survives the resize.
+        """
+        with self._dispatch_lock:
+            old_workers = self._workers
+            new_workers = self._create_workers(count)
+            for worker in old_workers:
+                worker.stop(timeout=5.0)
+            for worker in old_workers:
+                for item in worker.pending:
+                    new_workers[hash(item[1]) % count].pending.append(item)
+                worker.pending.clear()
+            if self.is_running:
+                for worker in new_workers:
+                    worker.start()
+            self._workers = new_workers
+    
+    def _is_bus_thread(self) -> bool:
+        return getattr(self._local, 'is_bus_thread', False)
+    
+    def _lane_for(self, message: Message) -> int:
+        """
+        Choose the dispatch lane of a message.
+        
+        Named events use their configured class and default to the normal lane. Log
+        messages of every level share the normal lane, so the log stays in publication
+        order (an ERROR does not overtake the INFO lines logged before it).
+        """
+        if message.metadata.get('is_event', False):
+            return self.event_lanes.get(message.metadata.get('event_name'), LANE_NORMAL)
+        return LANE_NORMAL
+    
+    def _enqueue(self, message: Message) -> None:
+        """
+        Put a message in its lane, applying the lane backpressure policy when full.
+        
+        Args:
+            message: Message to dispatch
+        """
+        lane = self._lane_for(message)
+        pending = self._lanes[lane]
+        with self._lanes_condition:
+            limit = self.lane_limits[lane]
+            if limit and len(pending) >= limit:
+                policy = self.lane_policies[lane]
+                if policy == POLICY_DROP_OLDEST:
+                    pending.popleft()
+                    self.lane_dropped[lane] += 1
+                elif policy == POLICY_DROP_NEWEST:
+                    self.lane_dropped[lane] += 1
+                    return
+                elif lane == LANE_NORMAL and threading.current_thread() is threading.main_thread():
+                    # The GUI thread never waits for room: freezing the UI is worse than losing a line
+                    pending.popleft()
+                    self.lane_dropped[lane] += 1
+                elif not self._is_bus_thread():
+                    # Subscribers publishing from the bus threads must not wait on themselves
+                    while self.is_running and len(pending) >= self.lane_limits[lane]:
+                        self._lanes_condition.wait(0.5)
+            pending.append(message)
+            self.metrics.record_publish(lane, len(pending))
+            self._lanes_condition.notify_all()
+    
+    def _next_message(self) -> Optional[tuple]:
+        """Pop the oldest message of the highest-priority non-empty lane (lock held)."""
+        for lane, pending in enumerate(self._lanes):
+            if pending:
+                return lane, pending.popleft()
+        return None
     
     def _process_message_queue(self) -> None:
         """
-        Process messages from the queue and route them to subscribers.
+        Take messages from the lanes in priority order and route them to the workers.
         """
+        self._local.is_bus_thread = True
         while self.is_running:
-            try:
-                message = self.message_queue.get(timeout=0.5)
-                
-                # None message is a signal to stop
-                if message is None:
+            with self._lanes_condition:
+                entry = self._next_message()
+                while entry is None and self.is_running:
+                    self._lanes_condition.wait(0.5)
+                    entry = self._next_message()
+                if entry is None:
                     break
-                    
-                # Store in history before routing
-                self._add_to_history(message)
-                
-                # Debug mode: print message to stdout with level indicator
-                if self.debug_mode:
-                    level_indicators = {
-                        MessageLevel.DEBUG: "[DEBUG]",
-                        MessageLevel.INFO: "[INFO]",
-                        MessageLevel.WARNING: "[WARN]",
-                        MessageLevel.ERROR: "[ERROR]",
-                        MessageLevel.CRITICAL: "[CRIT]"
-                    }
-                    level_str = level_indicators.get(message.level, "[INFO]")
-                    pattern_str = f"[{message.pattern_name}]" if message.pattern_name else ""
-                    (f"{level_str}{pattern_str} {message.get_formatted_message()}")
-                    # This now prints directly to the original stdout, as redirection is removed.
-                    # This resolves the infinite loop issue in debug mode.
-                    print(f"{level_str} {message.get_formatted_message()}")
-                
-                # Send to all subscribers
-                for subscriber in self.subscribers:
-                    try:
-                        # Apply any filters for this subscriber
-                        if self._should_process_message(subscriber, message):
-                            # Call the subscriber's callback function
-                            subscriber['callback'](message)
-                    except Exception as e:
-                        # Don't let a subscriber error crash the bus
-                        print(f"Error in subscriber {subscriber['name']}: {e}")
-                
-                # Mark task as done
-                self.message_queue.task_done()
-            except queue.Empty:
-                # No messages, continue loop
-                continue
+                # Wake publishers waiting for room in a full lane
+                self._lanes_condition.notify_all()
+            
+            lane, message = entry
+            try:
+                with self._dispatch_lock:
+                    self._route_message(message, lane)
             except Exception as e:
                 print(f"Error processing message queue: {e}")
     
+    def _route_message(self, message: Message, lane: int) -> None:
+        """
+        Record a message and queue one callback per interested subscriber.
+        
+        Args:
+            message: Message taken from a lane
+            lane: Lane the message came from
+        """
+        # Store in history before routing
+        self._add_to_history(message)
+        
+        # Debug mode: print message to stdout with level indicator
+        if self.debug_mode:
+            level_indicators = {
+                MessageLevel.DEBUG: "[DEBUG]",
+                MessageLevel.INFO: "[INFO]",
+                MessageLevel.WARNING: "[WARN]",
+                MessageLevel.ERROR: "[ERROR]",
+                MessageLevel.CRITICAL: "[CRIT]"
+            }
+            level_str = level_indicators.get(message.level, "[INFO]")
+            # This now prints directly to the original stdout, as redirection is removed.
+            # This resolves the infinite loop issue in debug mode.
+            print(f"{level_str} {message.get_formatted_message()}")
+        
+        workers = self._workers
+        count = len(workers)
+        
+        # Named events go straight to their handlers through the routing table
+        if message.metadata.get('is_event', False):
+            self._dispatch_event(message, lane, workers)
+        
+        # Send to all subscribers
+        for subscriber in self.subscribers:
+            try:
+                # Apply any filters for this subscriber
+                if self._should_process_message(subscriber, message):
+                    name = subscriber['name']
+                    workers[hash(name) % count].submit((lane, name, name, subscriber['callback'], (message,), {}, message))
+                else:
+                    self.metrics.record_filtered()
+            except Exception as e:
+                # Don't let a subscriber error crash the bus
+                print(f"Error in subscriber {subscriber['name']}: {e}")
+    
+    def _dispatch_event(self, message: Message, lane: int, workers: List[_DispatchWorker]) -> None:
+        """
+        Queue the handlers registered with on() for the event carried by a message.
+        
+        Args:
+            message: Message published by emit()
+            lane: Lane the message came from
+            workers: Current worker pool
+        """
+        event_name = message.metadata.get('event_name')
+        args = message.metadata.get('args', ())
+        kwargs = message.metadata.get('kwargs', {})
+        handlers = self._event_routes.get(event_name, ())
+        if self._wildcard_routes:
+            handlers = chain(handlers, self._resolve_wildcard_routes(event_name))
+        
+        count = len(workers)
+        called = 0
+        for handler in handlers:
+            called += 1
+            subscription_id = handler['id']
+            workers[hash(subscription_id) % count].submit(
+                (lane, subscription_id, handler['label'], handler['callback'], args, kwargs, message)
+            )
+        
+        counts = self.event_dispatch_counts.get(event_name)
+        if counts is None:
+            counts = self.event_dispatch_counts[event_name] = {'events': 0, 'handlers': 0}
+        counts['events'] += 1
+        counts['handlers'] += called
+    
+    def get_lane_stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        Get the depth and drop counters of the dispatch lanes and workers.
+        
+        Returns:
+            Dictionary {lane name: {'queued', 'limit', 'dropped'}} plus a 'workers' list
+            of {'pending', 'dropped'} per worker
+        """
+        with self._lanes_condition:
+            stats = {
+                name: {'queued': len(self._lanes[lane]), 'limit': self.lane_limits[lane], 'dropped': self.lane_dropped[lane]}
+                for lane, name in enumerate(LANE_NAMES)
+            }
+        stats['workers'] = [{'pending': len(worker.pending), 'dropped': worker.dropped} for worker in self._workers]
+        return stats
+    
+    
+    def get_metrics(self, reader: str = 'default') -> Dict[str, Any]:
+        """
+        Get throughput and latency metrics of the bus.
+        
+        Args:
+            reader: Key of the events/sec window; each reader sees the rate since its own previous call
+            
+        Returns:
+            Dictionary with per-subscriber callback latency histograms ('callbacks', keyed
+            by subscriber name or "event -> callback"), publish-to-callback latency per lane,
+            queue depth high-water marks, current lane/worker depths ('lanes'), messages
+            published per lane, events/sec since the reader's previous call and skipped/filtered/
+            dropped counts.
+        """
+        event_counts = {name: counts['events'] for name, counts in list(self.event_dispatch_counts.items())}
+        metrics = self.metrics.snapshot(event_counts, reader)
+        metrics['lanes'] = self.get_lane_stats()
+        metrics['dropped'] = sum(self.lane_dropped) + sum(worker['dropped'] for worker in metrics['lanes']['workers'])
+        return metrics
+    
+    def reset_metrics(self) -> None:
+        """Clear all collected metrics."""
+        self.metrics.reset()
+    
+    def set_metrics_interval(self, interval: float) -> None:
+        """
+        Publish a metrics summary every ``interval`` seconds (0 disables it).
+        
+        Args:
+            interval: Seconds between summaries
+        """
+        self.metrics_interval = max(0, float(interval or 0))
+        if self.metrics_interval and (self._metrics_thread is None or not self._metrics_thread.is_alive()):
+            self._metrics_thread = threading.Thread(target=self._report_metrics, name="MessageBusMetrics", daemon=True)
+            self._metrics_thread.start()
+    
+    def _report_metrics(self) -> None:
+        """Periodically publish a one-line summary of the bus metrics."""
+        while self.metrics_interval:
+            time.sleep(self.metrics_interval)
+            if not self.metrics_interval or not self.is_running:
+                continue
+            try:
+                metrics = self.get_metrics(reader='periodic')
+                published = sum(metrics['published'].values())
+                slowest = ", ".join(
+                    f"{label} {total:.0f}ms/{samples} (max {maximum:.0f}ms)"
+                    for label, total, maximum, samples in self.metrics.slowest(3)
+                )
+                high_water = ", ".join(f"{name} {depth}" for name, depth in metrics['lane_high_water'].items())
+                self.publish(
+                    content=(f"Message bus: {published} published, {metrics['skipped']} skipped, "
+                             f"{metrics['dropped']} dropped; queue high-water {high_water}; "
+                             f"slowest subscribers: {slowest or 'none'}"),
+                    level=MessageLevel.INFO,
+                    metadata={"source": "message_bus", "action": "metrics", "metrics": metrics}
+                )
+            except Exception as e:
+                print(f"Error reporting message bus metrics: {e}")
+    def _resolve_wildcard_routes(self, event_name: str) -> List[Dict]:
+        """
+        Get the wildcard handlers matching an event name, cached per event name.
+        
+        Args:
+            event_name: Name of the emitted event
+            
+        Returns:
+            List of matching wildcard handlers
+        """
+        handlers = self._wildcard_cache.get(event_name)
+        if handlers is None:
+            with self._routes_lock:
+                handlers = [
+                    handler for handler in self._wildcard_routes
+                    if (event_name.startswith(handler['prefix']) if handler['prefix'] is not None
+                        else fnmatchcase(event_name, handler['event_name']))
+                ]
+                self._wildcard_cache[event_name] = handlers
+        return handlers
+    
     def _should_process_message(self, subscriber: Dict, message: Message) -> bool:
         """
         Check if a message should be processed by a subscriber based on filters.
@@ -248,14 +702,76 @@ class MessageBus:
         """
         Add a message to the history, removing oldest if over max size.
         
+        Events are always recorded (get_history(event_name=...) relies on them);
+        history_min_level only applies to log messages.
+        
         Args:
             message: The message to add to history
         """
-        self.message_history.append(message)
+        if (self.debug_mode or message.level.value >= self.history_min_level.value
+                or message.metadata.get('is_event', False)):
+            self.message_history.append(message)
+    
+    def _refresh_interest(self) -> None:
+        """
+        Recompute the lowest message level any consumer (history or subscriber) accepts.
+        """
+        unrestricted = [self.history_min_level.value]
+        pattern_levels: Dict[str, int] = {}
+        for subscriber in self.subscribers:
+            subscriber_filters = self.filters.get(subscriber['name'], {})
+            level = subscriber_filters.get('level')
+            level_value = level.value if level else MessageLevel.DEBUG.value
+            patterns = subscriber_filters.get('patterns')
+            if patterns:
+                for pattern_name in patterns:
+                    pattern_levels[pattern_name] = min(level_value, pattern_levels.get(pattern_name, level_value))
+            else:
+                unrestricted.append(level_value)
+        self._pattern_min_levels = pattern_levels
+        self._min_level_value = min(unrestricted)
+    
+    def is_enabled(self, level: MessageLevel, pattern_name: Optional[str] = None) -> bool:
+        """
+        Check whether a message with this level/pattern would reach any consumer.
+        
+        Callers can use it to skip building expensive content for messages nobody reads.
+        
+        Args:
+            level: Message priority level
+            pattern_name: Optional regex pattern name
+            
+        Returns:
+            True if the message would be delivered or recorded
+        """
+        if self.debug_mode or level.value >= self._min_level_value:
+            return True
+        return bool(self._pattern_min_levels) and level.value >= self._pattern_min_levels.get(pattern_name, 99)
+    
+    def configure_history(
+        self,
+        max_size: Optional[int] = None,
+        spill_path: Optional[str] = None,
+        min_level: Optional[Union[MessageLevel, str]] = None
+    ) -> None:
+        """
+        Resize the in-memory history and enable or disable spilling evicted messages to disk.
         
-        # Remove oldest messages if over max size
-        while len(self.message_history) > self.max_history_size:
-            self.message_history.pop(0)
+        Args:
+            max_size: Number of messages kept in memory
+            spill_path: JSONL file for evicted messages ('' disables spilling, None keeps the current setting)
+            min_level: Lowest log message level recorded outside debug mode (MessageLevel or its name);
+                events are recorded regardless
+        """
+        if min_level:
+            if isinstance(min_level, str):
+                min_level = MessageLevel.__members__.get(min_level.upper(), self.history_min_level)
+            self.history_min_level = min_level
+            self._refresh_interest()
+        if max_size:
+            self.message_history.resize(max_size)
+        if spill_path is not None:
+            self.message_history.set_spill_path(spill_path or None)
     
     def publish(
         self,
@@ -269,12 +785,16 @@ class MessageBus:
         Publish a message to the bus.
         
         Args:
-            content: Message content
+            content: Message content, or a callable returning it (only called if the message is consumed)
             timestamp: Optional timestamp
             level: Message priority level
             pattern_name: Optional regex pattern name
             metadata: Additional metadata
         """
+        # Fast path: nobody would receive or record this message
+        if not self.is_enabled(level, pattern_name) and not (metadata and metadata.get('is_event', False)):
+            self.metrics.record_skipped()
+            return
         message = Message(
             content=content,
             timestamp=timestamp,
@@ -282,7 +802,7 @@ class MessageBus:
             pattern_name=pattern_name,
             metadata=metadata
         )
-        self.message_queue.put(message)
+        self._enqueue(message)
     
     def subscribe(self, name: str, callback: Callable[[Message], None], 
                    replay_history: bool = False, 
@@ -310,6 +830,7 @@ class MessageBus:
                 return
                 
         self.subscribers.append(subscriber)
+        self._refresh_interest()
         
         # Replay history if requested
         if replay_history and self.message_history:
@@ -345,6 +866,10 @@ class MessageBus:
         # Also remove any filters for this subscriber
         if name in self.filters:
             del self.filters[name]
+        
+        # Event subscriptions live in the routing table
+        self._remove_event_route(name)
+        self._refresh_interest()
     
     def set_filter(
         self, 
@@ -363,12 +888,15 @@ class MessageBus:
         if subscriber_name not in self.filters:
             self.filters[subscriber_name] = {}
         self.filters[subscriber_name][filter_type] = filter_value
+        self._refresh_interest()
 
     def get_history(
         self, 
         max_messages: Optional[int] = None, 
         min_level: Optional[MessageLevel] = None,
-        pattern_name: Optional[str] = None
+        pattern_name: Optional[str] = None,
+        event_name: Optional[str] = None,
+        include_spilled: bool = False
     ) -> List[Message]:
         """
         Get a copy of the message history, optionally filtered.
@@ -377,23 +905,31 @@ class MessageBus:
             max_messages: Maximum number of messages to return
             min_level: Minimum message level to include
             pattern_name: Only include messages matching this pattern name
+            event_name: Only include events with this name
+            include_spilled: Also read older messages spilled to disk when the
+                in-memory history has fewer than max_messages matches
             
         Returns:
-            A list of messages from the history.
+            A list of messages from the history, oldest first.
         """
-        with self._lock:
-            history_copy = list(self.message_history) # Create a copy
-            
-        if min_level:
-            history_copy = [msg for msg in history_copy if msg.level.value >= min_level.value]
+        messages = self.message_history.query(
+            max_messages=max_messages,
+            min_level=min_level,
+            pattern_name=pattern_name,
+            event_name=event_name
+        )
+        if not include_spilled or (max_messages is not None and len(messages) >= max_messages):
+            return messages
         
-        if pattern_name:
-            history_copy = [msg for msg in history_copy if msg.pattern_name == pattern_name]
-            
-        if max_messages is not None:
-            return history_copy[-max_messages:]
-        else:
-            return history_copy
+        def matches(message):
+            if min_level and message.level.value < min_level.value:
+                return False
+            if pattern_name and message.pattern_name != pattern_name:
+                return False
+            return not event_name or message.metadata.get('event_name') == event_name
+        
+        remaining = None if max_messages is None else max_messages - len(messages)
+        return self.message_history.read_spilled(remaining, matches) + messages
 
     def emit(self, event_name, *args, **kwargs):
         """
@@ -403,6 +939,7 @@ class MessageBus:
             event_name: Name of the event
             *args, **kwargs: Parameters to pass to event handlers
         """
+        # No fast path here: every event is recorded in the history, even without handlers
         metadata = {
             'is_event': True,
             'event_name': event_name,
@@ -412,37 +949,48 @@ class MessageBus:
         
         # Use different logging behavior based on debug mode
         if self.debug_mode:
-            # In debug mode, format and include parameter information at DEBUG level
-            param_info = []
-            
-            # Format positional arguments
-            if args:
-                param_info.append(f"args: {repr(args)}")
-                
-            # Format keyword arguments
-            if kwargs:
-                # Format each kwarg for better readability
-                kwarg_items = [f"{k}={repr(v)}" for k, v in kwargs.items()]
-                param_info.append(f"kwargs: {{{', '.join(kwarg_items)}}}")
-                
-            # Create detailed content for debug logging
-            detailed_content = f"Event: {event_name}"
-            if param_info:
-                detailed_content += f" with {', '.join(param_info)}"
-                
-            # Publish with detailed content at DEBUG level
-            self.publish(
-                content=detailed_content,
-                level=MessageLevel.DEBUG,
-                metadata=metadata
-            )
+            # In debug mode, include parameter information; the repr is only built if the message is read
+            content = partial(self._format_event_content, event_name, args, kwargs)
         else:
-            # Normal mode - just use event name at INFO level
-            self.publish(
-                content=f"Event: {event_name}",
-                level=MessageLevel.DEBUG,
-                metadata=metadata
-            )
+            # Normal mode - just use event name
+            content = f"Event: {event_name}"
+        
+        self.publish(
+            content=content,
+            level=MessageLevel.DEBUG,
+            metadata=metadata
+        )
+    
+    @staticmethod
+    def _format_event_content(event_name: str, args: tuple, kwargs: Dict[str, Any]) -> str:
+        """
+        Build the detailed debug content of an event.
+        
+        Args:
+            event_name: Name of the event
+            args: Positional parameters of the event
+            kwargs: Keyword parameters of the event
+            
+        Returns:
+            "Event: name with args: ..., kwargs: {...}"
+        """
+        param_info = []
+        
+        # Format positional arguments
+        if args:
+            param_info.append(f"args: {repr(args)}")
+            
+        # Format keyword arguments
+        if kwargs:
+            # Format each kwarg for better readability
+            kwarg_items = [f"{k}={repr(v)}" for k, v in kwargs.items()]
+            param_info.append(f"kwargs: {{{', '.join(kwarg_items)}}}")
+            
+        # Create detailed content for debug logging
+        detailed_content = f"Event: {event_name}"
+        if param_info:
+            detailed_content += f" with {', '.join(param_info)}"
+        return detailed_content
 
     def on(self, event_name, callback):
         """
@@ -456,22 +1004,73 @@ class MessageBus:
             Subscription ID that can be used for unsubscribing
         """
         subscription_id = f"event_{event_name}_{int(time.time())}_{id(callback)}"
+        handler = {
+            'id': subscription_id,
+            'event_name': event_name,
+            'callback': callback,
+            'label': f"{event_name} -> {getattr(callback, '__qualname__', repr(callback))}",  # Name used in metrics
+            'wildcard': any(char in event_name for char in '*?['),
+            'prefix': None
+        }
         
-        # Create wrapper to extract and pass arguments
-        def event_callback_wrapper(message):
-            if (message.metadata.get('is_event', False) and 
-                message.metadata.get('event_name') == event_name):
-                args = message.metadata.get('args', ())
-                kwargs = message.metadata.get('kwargs', {})
-                callback(*args, **kwargs)
-        
-        # Subscribe the wrapper to receive messages
-        self.subscribe(
-            name=subscription_id,
-            callback=event_callback_wrapper
-        )
+        with self._routes_lock:
+            # Same callback registered again for the same event: replace it
+            self._remove_event_route(subscription_id)
+            
+            if handler['wildcard']:
+                # '*' and 'prefix_*' are plain prefix checks, anything else uses fnmatch
+                head = event_name[:-1] if event_name.endswith('*') else None
+                if head is not None and not any(char in head for char in '*?['):
+                    handler['prefix'] = head
+                self._wildcard_routes = self._wildcard_routes + [handler]
+                self._wildcard_cache = {}
+            else:
+                self._event_routes[event_name] = self._event_routes.get(event_name, []) + [handler]
+            self._event_subscriptions[subscription_id] = handler
         
         return subscription_id
+    
+    def _remove_event_route(self, subscription_id: str) -> bool:
+        """
+        Remove a handler from the routing table.
+        
+        Args:
+            subscription_id: Subscription ID returned by on()
+            
+        Returns:
+            True if the subscription existed
+        """
+        with self._routes_lock:
+            handler = self._event_subscriptions.pop(subscription_id, None)
+            if handler is None:
+                return False
+            
+            event_name = handler['event_name']
+            if handler['wildcard']:
+                self._wildcard_routes = [h for h in self._wildcard_routes if h is not handler]
+                self._wildcard_cache = {}
+            else:
+                remaining = [h for h in self._event_routes.get(event_name, []) if h is not handler]
+                if remaining:
+                    self._event_routes[event_name] = remaining
+                else:
+                    self._event_routes.pop(event_name, None)
+            return True
+    
+    def get_event_stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        Get dispatch statistics for named events.
+        
+        Returns:
+            Dictionary {event_name: {'events': emitted count, 'handlers': handler calls,
+            'subscribers': current handler count}}
+        """
+        with self._routes_lock:
+            stats = {name: dict(counts) for name, counts in self.event_dispatch_counts.items()}
+            for name in set(stats) | set(self._event_routes):
+                entry = stats.setdefault(name, {'events': 0, 'handlers': 0})
+                entry['subscribers'] = len(self._event_routes.get(name, ())) + len(self._resolve_wildcard_routes(name))
+        return stats
 
     def off(self, subscription_id):
         """
@@ -480,7 +1079,8 @@ class MessageBus:
         Args:
             subscription_id: Subscription ID returned by on()
         """
-        self.unsubscribe(subscription_id)
+        if not self._remove_event_route(subscription_id):
+            self.unsubscribe(subscription_id)
 
 
 # Create a global message bus instance
@@ -0,0 +1,250 @@
+"""
+MessageHistory: historial en anillo del MessageBus con índices secundarios.
+
+Los mensajes se guardan en un deque de tamaño fijo junto con un número de secuencia.
+Además se mantienen índices por nivel, pattern_name y event_name, de modo que las
+consultas filtradas (get_history, replay de suscriptores) recorren solo los mensajes
+que encajan en lugar de copiar y filtrar todo el buffer. Opcionalmente, los mensajes
+que salen del anillo se vuelcan a un fichero JSONL desde un hilo en segundo plano.
+"""
+import os
+import json
+import heapq
+import threading
+from collections import deque
+
+DEFAULT_SPILL_MAX_BYTES = 20 * 1024 * 1024
+SPILL_FLUSH_INTERVAL = 1.0
+SPILL_FLUSH_BATCH = 500
+
+
+class MessageHistory:
+    """
+    Bounded, indexed message history.
+
+    Every index holds its entries in sequence order and only entries still present in
+    the ring, so evicting the oldest message is O(1): it is also the oldest entry of
+    each index it belongs to.
+    """
+
+    def __init__(self, max_size=1000, spill_path=None, encode=None, decode=None,
+                 spill_max_bytes=DEFAULT_SPILL_MAX_BYTES):
+        """
+        Args:
+            max_size: Number of messages kept in memory.
+            spill_path: JSONL file receiving evicted messages (None disables spilling).
+            encode: Callable turning a message into a JSON-serialisable dict (needed to spill).
+            decode: Callable rebuilding a message from such a dict (needed to read the spill).
+            spill_max_bytes: Size at which the spill file is rotated to ``<spill_path>.1``.
+        """
+        self.max_size = max(1, int(max_size))
+        self.encode = encode
+        self.decode = decode
+        self.spill_path = spill_path
+        self.spill_max_bytes = spill_max_bytes
+        self._lock = threading.Lock()
+        # Entries are (seq, message, (level, pattern_name, event_name)): the index keys are
+        # computed once on insert, so a message whose metadata changes later is still
+        # evicted from (and matched against) the buckets it was filed under.
+        self._ring = deque()
+        self._by_level = {}  # {MessageLevel: deque(entry)}
+        self._by_pattern = {}  # {pattern_name: deque(entry)}
+        self._by_event = {}  # {event_name: deque(entry)}
+        self._seq = 0
+        self._spill_buffer = []
+        self._spill_condition = threading.Condition()
+        self._spill_thread = None
+        self._spill_lock = threading.Lock()  # Serialises file writes and reads
+        if spill_path:
+            self._start_spill_thread()
+
+    def __len__(self):
+        return len(self._ring)
+
+    def __bool__(self):
+        return bool(self._ring)
+
+    @staticmethod
+    def _keys(message):
+        metadata = message.metadata
+        event_name = metadata.get('event_name') if metadata.get('is_event', False) else None
+        return message.level, message.pattern_name, event_name
+
+    @staticmethod
+    def _index_append(index, key, entry):
+        bucket = index.get(key)
+        if bucket is None:
+            bucket = index[key] = deque()
+        bucket.append(entry)
+
+    @staticmethod
+    def _index_evict(index, key):
+        bucket = index[key]
+        bucket.popleft()
+        if not bucket:
+            del index[key]
+
+    def append(self, message):
+        """Add a message, evicting (and optionally spilling) the oldest one when full."""
+        keys = self._keys(message)
+        level, pattern_name, event_name = keys
+        with self._lock:
+            self._seq += 1
+            entry = (self._seq, message, keys)
+            self._ring.append(entry)
+            self._index_append(self._by_level, level, entry)
+            if pattern_name is not None:
+                self._index_append(self._by_pattern, pattern_name, entry)
+            if event_name is not None:
+                self._index_append(self._by_event, event_name, entry)
+            evicted = []
+            while len(self._ring) > self.max_size:
+                evicted.append(self._evict_oldest())
+        if evicted and self.spill_path and self.encode:
+            self._queue_spill(evicted)
+
+    def _evict_oldest(self):
+        _seq, message, (level, pattern_name, event_name) = self._ring.popleft()
+        self._index_evict(self._by_level, level)
+        if pattern_name is not None:
+            self._index_evict(self._by_pattern, pattern_name)
+        if event_name is not None:
+            self._index_evict(self._by_event, event_name)
+        return message
+
+    def resize(self, max_size):
+        """Change the in-memory capacity; extra old messages are evicted (and spilled)."""
+        with self._lock:
+            self.max_size = max(1, int(max_size))
+            evicted = []
+            while len(self._ring) > self.max_size:
+                evicted.append(self._evict_oldest())
+        if evicted and self.spill_path and self.encode:
+            self._queue_spill(evicted)
+
+    def _sources(self, min_level, pattern_name, event_name):
+        """Pick the smallest index able to answer a query (lock held)."""
+        if pattern_name is not None:
+            return [self._by_pattern.get(pattern_name, ())]
+        if event_name is not None:
+            return [self._by_event.get(event_name, ())]
+        if min_level is not None:
+            return [bucket for level, bucket in self._by_level.items() if level.value >= min_level.value]
+        return [self._ring]
+
+    def query(self, max_messages=None, min_level=None, pattern_name=None, event_name=None):
+        """
+        Return matching messages, oldest first.
+
+        Args:
+            max_messages: Only return the newest ``max_messages`` matches.
+            min_level: Minimum MessageLevel to include.
+            pattern_name: Only messages produced by this pattern.
+            event_name: Only events with this name.
+        """
+        if max_messages is not None and max_messages <= 0:
+            return []
+        with self._lock:
+            sources = self._sources(min_level, pattern_name, event_name)
+            if len(sources) == 1:
+                newest_first = reversed(sources[0])
+            else:
+                newest_first = heapq.merge(*(reversed(bucket) for bucket in sources), key=lambda entry: -entry[0])
+            result = []
+            for _seq, message, (level, message_pattern, message_event) in newest_first:
+                if min_level is not None and level.value < min_level.value:
+                    continue
+                if pattern_name is not None and message_pattern != pattern_name:
+                    continue
+                if event_name is not None and message_event != event_name:
+                    continue
+                result.append(message)
+                if max_messages is not None and len(result) >= max_messages:
+                    break
+        result.reverse()
+        return result
+
+    def clear(self):
+        with self._lock:
+            self._ring.clear()
+            self._by_level.clear()
+            self._by_pattern.clear()
+            self._by_event.clear()
+
+    # Spill to disk
+
+    def set_spill_path(self, spill_path):
+        """Enable spilling to ``spill_path`` (None disables it; buffered records are flushed first)."""
+        if spill_path == self.spill_path:
+            return
+        self.flush()
+        self.spill_path = spill_path
+        if spill_path:
+            self._start_spill_thread()
+
+    def _start_spill_thread(self):
+        if self._spill_thread is None or not self._spill_thread.is_alive():
+            self._spill_thread = threading.Thread(target=self._spill_worker, name="MessageHistorySpill", daemon=True)
+            self._spill_thread.start()
+
+    def _queue_spill(self, messages):
+        records = []
+        for message in messages:
+            try:
+                records.append(self.encode(message))
+            except Exception:
+                continue
+        with self._spill_condition:
+            self._spill_buffer.extend(records)
+            if len(self._spill_buffer) >= SPILL_FLUSH_BATCH:
+                self._spill_condition.notify()
+
+    def _spill_worker(self):
+        while self.spill_path:
+            with self._spill_condition:
+                self._spill_condition.wait(SPILL_FLUSH_INTERVAL)
+            self.flush()
+
+    def flush(self):
+        """Write buffered evicted messages to the spill file."""
+        with self._spill_condition:
+            records, self._spill_buffer = self._spill_buffer, []
+        if not records or not self.spill_path:
+            return
+        with self._spill_lock:
+            try:
+                if os.path.exists(self.spill_path) and os.path.getsize(self.spill_path) >= self.spill_max_bytes:
+                    os.replace(self.spill_path, f"{self.spill_path}.1")
+                with open(self.spill_path, 'a', encoding='utf-8') as f:
+                    for record in records:
+                        f.write(json.dumps(record, default=str))
+                        f.write('\n')
+            except OSError as e:
+                print(f"Error writing message history spill: {e}")
+
+    def read_spilled(self, max_messages=None, predicate=None):
+        """
+        Read evicted messages back from disk, oldest first.
+
+        Args:
+            max_messages: Only return the newest ``max_messages`` matches.
+            predicate: Optional filter called with each decoded message.
+        """
+        if not self.spill_path or not self.decode:
+            return []
+        self.flush()
+        result = deque(maxlen=max_messages)
+        with self._spill_lock:
+            for path in (f"{self.spill_path}.1", self.spill_path):
+                try:
+                    with open(path, 'r', encoding='utf-8') as f:
+                        for line in f:
+                            try:
+                                message = self.decode(json.loads(line))
+                            except (ValueError, KeyError, TypeError):
+                                continue
+                            if predicate is None or predicate(message):
+                                result.append(message)
+                except OSError:
+                    continue
+        return list(result)
@@ -0,0 +1,191 @@
+"""
+PatternSet: conjunto de regex precompiladas con prefiltro por literales obligatorios.
+
+Cada patrón se compila una sola vez y se le extrae el literal más largo que cualquier
+coincidencia debe contener (p.ej. "> [Notice] <Actor Death> CActor::Kill: '"). Antes de
+evaluar ninguna regex se comprueba si esos literales aparecen en la línea, de modo que
+las líneas que no encajan con ningún patrón cuestan unas pocas búsquedas de subcadena
+en lugar de una búsqueda de regex por patrón.
+"""
+import re
+
+try:
+    from re import _parser as sre_parse  # Python 3.11+
+except ImportError:  # pragma: no cover - older interpreters
+    import sre_parse
+
+_REPEAT_OPS = {sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT}
+if hasattr(sre_parse, 'POSSESSIVE_REPEAT'):
+    _REPEAT_OPS.add(sre_parse.POSSESSIVE_REPEAT)
+_ATOMIC_GROUP = getattr(sre_parse, 'ATOMIC_GROUP', None)
+
+
+def _mandatory_literals(parsed, ignorecase):
+    """
+    Collect the literal runs that every match of a parsed (sub)pattern must contain.
+
+    Only constructs that always consume their content are followed: plain sequences,
+    groups and repeats with a minimum of at least one. Alternations, character classes,
+    lookarounds and case-insensitive inline groups never contribute a literal.
+    """
+    runs = []
+    current = []
+
+    def flush():
+        if current:
+            runs.append(''.join(current))
+            current.clear()
+
+    for op, av in parsed:
+        if op is sre_parse.LITERAL:
+            current.append(chr(av))
+            continue
+        flush()
+        if op is sre_parse.SUBPATTERN:
+            _group, add_flags, del_flags, sub = av
+            sub_ignorecase = (ignorecase or bool(add_flags & re.IGNORECASE)) and not del_flags & re.IGNORECASE
+            if sub_ignorecase == ignorecase:
+                runs.extend(_mandatory_literals(sub, ignorecase))
+        elif op in _REPEAT_OPS:
+            min_count, _max_count, sub = av
+            if min_count >= 1:
+                runs.extend(_mandatory_literals(sub, ignorecase))
+        elif _ATOMIC_GROUP is not None and op is _ATOMIC_GROUP:
+            runs.extend(_mandatory_literals(av, ignorecase))
+    flush()
+    return runs
+
+
+def extract_anchor(regex):
+    """
+    Return the longest literal that every match of the compiled regex must contain.
+
+    Args:
+        regex: A compiled ``re.Pattern`` (str patterns only).
+
+    Returns:
+        Tuple (anchor, casefold). ``anchor`` is None when no mandatory literal exists;
+        ``casefold`` is True when the anchor has to be compared against a casefolded line.
+    """
+    if not isinstance(regex.pattern, str):
+        return None, False
+    ignorecase = bool(regex.flags & re.IGNORECASE)
+    try:
+        parsed = sre_parse.parse(regex.pattern, regex.flags)
+    except Exception:
+        return None, False
+    runs = _mandatory_literals(parsed, ignorecase)
+    if not runs:
+        return None, False
+    anchor = max(runs, key=len)
+    if ignorecase:
+        # Unicode case folding in re is richer than str.casefold for non-ASCII text
+        if not anchor.isascii():
+            return None, False
+        return anchor.casefold(), True
+    return anchor, False
+
+
+class PatternSet:
+    """
+    Ordered set of named regexes evaluated through a literal prefilter.
+
+    Patterns keep their insertion order: ``search`` returns the first pattern (in that
+    order) that matches, exactly like looping over the patterns with ``re.search``.
+    """
+
+    def __init__(self, patterns, flags=0):
+        """
+        Args:
+            patterns: Dict or iterable of (name, pattern) pairs. Patterns may be strings
+                or already compiled regexes.
+            flags: Flags used to compile string patterns.
+        """
+        if isinstance(patterns, dict):
+            patterns = patterns.items()
+        self._names = []
+        self._regexes = {}
+        self._anchors = {}
+        self.invalid = {}  # {name: error message} for patterns that failed to compile
+        self._order = {}
+        self._by_anchor = {}  # {anchor: [index, ...]}
+        self._by_folded_anchor = {}  # {casefolded anchor: [index, ...]}
+        self._always = []  # indexes of patterns without a usable anchor
+
+        for name, pattern in patterns:
+            if name in self._regexes or name in self.invalid:
+                continue
+            try:
+                regex = pattern if isinstance(pattern, re.Pattern) else re.compile(pattern, flags)
+            except (re.error, TypeError) as e:
+                self.invalid[name] = str(e)
+                continue
+            index = len(self._names)
+            self._names.append(name)
+            self._regexes[name] = regex
+            self._order[name] = index
+            anchor, casefold = extract_anchor(regex)
+            self._anchors[name] = anchor
+            if anchor is None:
+                self._always.append(index)
+            elif casefold:
+                self._by_folded_anchor.setdefault(anchor, []).append(index)
+            else:
+                self._by_anchor.setdefault(anchor, []).append(index)
+
+    def __len__(self):
+        return len(self._names)
+
+    def __contains__(self, name):
+        return name in self._regexes
+
+    @property
+    def names(self):
+        """Pattern names in evaluation order."""
+        return list(self._names)
+
+    def get(self, name):
+        """Return the compiled regex for ``name`` or None."""
+        return self._regexes.get(name)
+
+    def anchor(self, name):
+        """Return the prefilter literal chosen for ``name`` (None if always evaluated)."""
+        return self._anchors.get(name)
+
+    def _candidate_indexes(self, line):
+        hits = None
+        for anchor, indexes in self._by_anchor.items():
+            if anchor in line:
+                if hits is None:
+                    hits = set(self._always)
+                hits.update(indexes)
+        if self._by_folded_anchor:
+            folded = line.casefold()
+            for anchor, indexes in self._by_folded_anchor.items():
+                if anchor in folded:
+                    if hits is None:
+                        hits = set(self._always)
+                    hits.update(indexes)
+        if hits is None:
+            return self._always
+        return sorted(hits)
+
+    def candidates(self, line):
+        """
+        Return the names of the patterns that may match ``line``, in evaluation order.
+        """
+        return [self._names[i] for i in self._candidate_indexes(line)]
+
+    def search(self, line):
+        """
+        Find the first pattern (in insertion order) that matches ``line``.
+
+        Returns:
+            Tuple (name, match) or (None, None) when nothing matches.
+        """
+        for index in self._candidate_indexes(line):
+            name = self._names[index]
+            match = self._regexes[name].search(line)
+            if match:
+                return name, match
+        return None, None
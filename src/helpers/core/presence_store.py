@@ -0,0 +1,83 @@
+"""
+PresenceStore: estado de presencia del canal general indexado por usuario.
+
+Cada sincronización de presencia se compara con el estado anterior y solo se publican
+los usuarios que entran, salen o cambian (evento 'users_online_delta'), en lugar de la
+lista completa. La lista completa sigue disponible bajo demanda con snapshot(), y
+is_online() responde en O(1) sin recorrer el estado del canal.
+"""
+import threading
+
+
+class PresenceStore:
+    """Keyed online-users store that turns presence states into join/leave/update deltas."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._users = {}  # {username: user entry}
+
+    @staticmethod
+    def _entry(username, presence, last_active):
+        return {
+            'username': username,
+            'shard': presence.get('shard'),
+            'version': presence.get('version'),
+            'status': presence.get('status'),
+            'mode': presence.get('mode'),
+            'last_active': last_active,
+            'metadata': presence.get('metadata', {})
+        }
+
+    def apply_state(self, presence_state, last_activity=None):
+        """
+        Replace the store contents with a channel presence state.
+
+        Args:
+            presence_state: {username: [presence, ...]} as kept by the realtime channel.
+                A user present more than once (several clients) is keyed once, by its last presence.
+            last_activity: Optional {username: formatted time of the last ping}, preferred over
+                the presence's own 'last_active'.
+
+        Returns:
+            dict: Delta {'joined': [entries], 'updated': [entries], 'left': [usernames]}
+        """
+        last_activity = last_activity or {}
+        users = {}
+        for username, presences in presence_state.items():
+            if presences:
+                presence = presences[-1]
+                users[username] = self._entry(username, presence,
+                                              last_activity.get(username, presence.get('last_active')))
+        with self._lock:
+            previous, self._users = self._users, users
+        return {
+            'joined': [entry for username, entry in users.items() if username not in previous],
+            'updated': [entry for username, entry in users.items()
+                        if username in previous and previous[username] != entry],
+            'left': [username for username in previous if username not in users],
+        }
+
+    def clear(self):
+        """Forget every user (e.g. on disconnect) and return the matching delta."""
+        with self._lock:
+            previous, self._users = self._users, {}
+        return {'joined': [], 'updated': [], 'left': list(previous)}
+
+    def is_online(self, username):
+        return username in self._users
+
+    def get(self, username):
+        """Entry of an online user, or None."""
+        return self._users.get(username)
+
+    def snapshot(self):
+        """Full list of online user entries."""
+        with self._lock:
+            return [dict(entry) for entry in self._users.values()]
+
+    def __len__(self):
+        return len(self._users)
+
+    @staticmethod
+    def is_empty_delta(delta):
+        return not (delta['joined'] or delta['updated'] or delta['left'])
@@ -1,73 +1,214 @@
 """
 MessageRateLimiter: clase reutilizable para rate limiting configurable por contexto.
 Permite limitar mensajes repetidos y aplicar límites globales de eventos en ventana de tiempo.
+
+Cada mensaje se identifica por un hash de 64 bits de (tipo, contenido) en lugar de por la
+cadena completa, el límite global usa un contador de ventana deslizante (O(1) por
+comprobación) y las entradas caducan a través de una rueda de tiempos jerárquica, de
+modo que ninguna llamada recorre todas las entradas.
 """
 import time
 import threading
+from hashlib import blake2b
+
+WHEEL_SLOTS = 64
+WHEEL_LEVELS = 3  # 1 s, 64 s and 4096 s per slot; longer delays wait in an overflow list
+
+
+def message_key(message, message_type=None):
+    """
+    64-bit hash identifying a message in a rate limiter.
+
+    Args:
+        message: Message content.
+        message_type: Optional context ('discord', 'stdout', ...) hashed together with the content.
+    """
+    digest = blake2b(digest_size=8)
+    if message_type:
+        digest.update(str(message_type).encode('utf-8', 'surrogatepass'))
+        digest.update(b'\x00')
+    digest.update(str(message).encode('utf-8', 'surrogatepass'))
+    return int.from_bytes(digest.digest(), 'little')
+
+
+class TimingWheel:
+    """
+    Hierarchical timing wheel with one-second ticks.
+
+    ``schedule`` and the amortised cost of ``advance`` are O(1) per key, independent of
+    how many keys are pending.
+    """
+
+    def __init__(self, slots=WHEEL_SLOTS, levels=WHEEL_LEVELS):
+        self.slots = slots
+        self.spans = [slots ** level for level in range(levels)]
+        self.wheels = [[[] for _ in range(slots)] for _ in range(levels)]
+        self.overflow = []  # (expire_tick, key) beyond the last level
+        self.tick = None
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def schedule(self, key, expire_tick):
+        """Fire ``key`` once the wheel reaches ``expire_tick`` (at least one tick from now)."""
+        if self.tick is None:
+            self.tick = expire_tick - 1
+        self._place(key, max(expire_tick, self.tick + 1))
+
+    def _place(self, key, expire_tick):
+        delay = expire_tick - self.tick
+        self.size += 1
+        for level, span in enumerate(self.spans):
+            if delay < span * self.slots:
+                self.wheels[level][(expire_tick // span) % self.slots].append((expire_tick, key))
+                return
+        self.overflow.append((expire_tick, key))
+
+    def advance(self, now_tick):
+        """
+        Move the wheel to ``now_tick``.
+
+        Returns:
+            List of keys whose expiry tick has been reached.
+        """
+        expired = []
+        if self.tick is None:
+            self.tick = now_tick
+            return expired
+        while self.tick < now_tick:
+            if not self.size:
+                self.tick = now_tick
+                break
+            self.tick += 1
+            # When a level wraps, the next slot of the level above is spread over the lower levels
+            for level in range(1, len(self.spans)):
+                span = self.spans[level]
+                if self.tick % span:
+                    break
+                self._cascade(self.wheels[level], (self.tick // span) % self.slots)
+            else:
+                if self.overflow and self.tick % (self.spans[-1] * self.slots) == 0:
+                    pending, self.overflow = self.overflow, []
+                    self.size -= len(pending)
+                    for expire_tick, key in pending:
+                        self._place(key, expire_tick)
+            slot = self.wheels[0][self.tick % self.slots]
+            if slot:
+                self.size -= len(slot)
+                expired.extend(key for _expire_tick, key in slot)
+                slot.clear()
+        return expired
+
+    def _cascade(self, wheel, index):
+        pending = wheel[index]
+        if not pending:
+            return
+        wheel[index] = []
+        self.size -= len(pending)
+        for expire_tick, key in pending:
+            self._place(key, expire_tick)
+
+    def clear(self):
+        for wheel in self.wheels:
+            for slot in wheel:
+                slot.clear()
+        self.overflow = []
+        self.size = 0
+
 
 class MessageRateLimiter:
-    def __init__(self, timeout=300, max_duplicates=1, cleanup_interval=60, global_limit_count=None, global_limit_window=None):
+    def __init__(self, timeout=300, max_duplicates=1, cleanup_interval=60, global_limit_count=None, global_limit_window=None,
+                 clock=None):
         """
         Args:
             timeout: Tiempo en segundos antes de permitir el mismo mensaje de nuevo.
             max_duplicates: Máximo de duplicados permitidos en el periodo timeout.
-            cleanup_interval: Cada cuánto limpiar mensajes antiguos.
+            cleanup_interval: Se mantiene por compatibilidad; las entradas caducan al cumplir timeout.
             global_limit_count: Máximo de eventos globales permitidos en la ventana global_limit_window.
             global_limit_window: Ventana de tiempo (segundos) para el límite global.
+            clock: Función que devuelve el tiempo actual en segundos (por defecto time.time).
         """
-        self.messages = {}  # {message_hash: (timestamp, count)}
+        self.messages = {}  # {message_key: [window_start, count]}
         self.timeout = timeout
         self.max_duplicates = max_duplicates
         self.cleanup_interval = cleanup_interval
-        self.last_cleanup = time.time()
+        self.clock = clock or time.time
+        self.last_cleanup = self.clock()
         self._lock = threading.Lock()
-        # Límite global
+        self._wheel = TimingWheel()
+        # Límite global: contador de ventana deslizante (ventana actual + anterior ponderada)
         self.global_limit_count = global_limit_count
         self.global_limit_window = global_limit_window
-        self._recent_times = []  # [timestamp]
+        self._window_start = 0.0
+        self._window_count = 0
+        self._previous_window_count = 0
+
+    def _global_estimate(self, now):
+        """Approximate number of events in the last global_limit_window seconds."""
+        window = self.global_limit_window
+        if now - self._window_start >= window:
+            elapsed_windows = int((now - self._window_start) // window)
+            self._previous_window_count = self._window_count if elapsed_windows == 1 else 0
+            self._window_count = 0
+            self._window_start += elapsed_windows * window
+        weight = 1.0 - (now - self._window_start) / window
+        return self._previous_window_count * weight + self._window_count
 
     def should_send(self, message, message_type=None):
         """
         Devuelve True si el mensaje puede enviarse según la configuración de rate limiting.
         """
-        now = time.time()
-        key = f"{message_type}:{message}" if message_type else message
+        key = message_key(message, message_type)
+        now = self.clock()
         with self._lock:
+            self._expire(now)
             # Límite global de eventos
-            if self.global_limit_count and self.global_limit_window:
-                self._recent_times = [t for t in self._recent_times if now - t < self.global_limit_window]
-                if len(self._recent_times) >= self.global_limit_count:
-                    return False
-            # Cleanup periódico
-            if now - self.last_cleanup > self.cleanup_interval:
-                self.cleanup_messages(now)
+            global_limit = self.global_limit_count and self.global_limit_window
+            if global_limit and self._global_estimate(now) >= self.global_limit_count:
+                return False
             # Límite por mensaje
-            if key in self.messages:
-                last_time, count = self.messages[key]
+            entry = self.messages.get(key)
+            if entry is not None:
+                last_time, count = entry
                 if count >= self.max_duplicates and now - last_time < self.timeout:
-                    self.messages[key] = (last_time, count + 1)
+                    entry[1] = count + 1
                     return False
                 if now - last_time >= self.timeout:
-                    self.messages[key] = (now, 1)
+                    # The pending wheel slot reschedules itself when it finds the new window start
+                    entry[0] = now
+                    entry[1] = 1
                 else:
-                    self.messages[key] = (last_time, count + 1)
+                    entry[1] = count + 1
             else:
-                self.messages[key] = (now, 1)
+                self.messages[key] = [now, 1]
+                self._wheel.schedule(key, int(now + self.timeout) + 1)
             # Registrar evento global
-            if self.global_limit_count and self.global_limit_window:
-                self._recent_times.append(now)
+            if global_limit:
+                self._window_count += 1
         return True
 
+    def _expire(self, now):
+        """Drop the entries whose timeout has elapsed (lock held)."""
+        for key in self._wheel.advance(int(now)):
+            entry = self.messages.get(key)
+            if entry is None:
+                continue
+            expires_at = entry[0] + self.timeout
+            if expires_at <= now:
+                del self.messages[key]
+            else:
+                self._wheel.schedule(key, int(expires_at) + 1)
+        self.last_cleanup = now
+
     def cleanup_messages(self, current_time):
-        stale_keys = [key for key, (last_time, _) in self.messages.items() if current_time - last_time > self.cleanup_interval]
-        for key in stale_keys:
-            del self.messages[key]
-        self.last_cleanup = current_time
+        with self._lock:
+            self._expire(current_time)
 
     def get_stats(self, message, message_type=None):
-        key = f"{message_type}:{message}" if message_type else message
-        if key in self.messages:
-            last_time, count = self.messages[key]
-            blocked = count > self.max_duplicates and (time.time() - last_time < self.timeout)
+        entry = self.messages.get(message_key(message, message_type))
+        if entry is not None:
+            last_time, count = entry
+            blocked = count > self.max_duplicates and (self.clock() - last_time < self.timeout)
             return {"last_sent": last_time, "count": count, "blocked": blocked}
         return None
@@ -1,5 +1,5 @@
 #!/usr/bin/env python
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ThreadPoolExecutor, Future
 import uuid
 import json
 from datetime import datetime
@@ -8,9 +8,9 @@ import time
 import traceback  # Añadido para rastrear mejor los errores
 import asyncio  # Añadido para manejar coroutines
 
-# Import Supabase manager
-from helpers.core.supabase_manager import supabase_manager
 from helpers.core.message_bus import message_bus, MessageLevel
+from helpers.core.presence_store import PresenceStore
+from helpers.core.realtime_transport import create_realtime_transport
 from helpers.services.notification_manager import NotificationManager
 
 # Variable global para almacenar el singleton de RealtimeBridge
@@ -44,6 +44,104 @@ def run_coroutine(coroutine):
     # Si ya existe una instancia con un bucle de eventos, la usamos
     return _realtime_bridge_instance._run_in_loop(coroutine)
 
+def submit_coroutine(coroutine, **kwargs):
+    """
+    Versión no bloqueante de run_coroutine: programa la coroutine en el bucle del
+    RealtimeBridge singleton y devuelve enseguida (ver RealtimeBridge.submit).
+
+    Args:
+        coroutine: La coroutine a ejecutar
+        **kwargs: name, timeout y event de RealtimeBridge.submit
+
+    Returns:
+        concurrent.futures.Future con el resultado, o None si se ha rechazado
+    """
+    if _realtime_bridge_instance is None or not _realtime_bridge_instance.event_loop_running:
+        # Sin bucle dedicado no hay dónde dejarla en segundo plano: se ejecuta aquí
+        future = Future()
+        try:
+            future.set_result(run_coroutine(coroutine))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+    return _realtime_bridge_instance.submit(coroutine, **kwargs)
+
+# Eventos broadcast del canal general
+REALTIME_EVENT = 'realtime-event'
+REALTIME_EVENT_BATCH = 'realtime-event-batch'
+
+class BroadcastBatcher:
+    """Agrupa los broadcasts salientes en el bucle asyncio del bridge.
+    Los eventos se acumulan durante una ventana corta o hasta max_events y se envían
+    como un único frame 'realtime-event-batch'; un evento solo se envía como
+    'realtime-event', igual que antes, para que los clientes antiguos lo sigan entendiendo.
+    Todo el estado se modifica desde el bucle de eventos, así que no necesita locks.
+    """
+    def __init__(self, send, window_ms=0, max_events=20):
+        """
+        Args:
+            send: Coroutine function(event, payload) que envía un frame por el canal.
+            window_ms: Tiempo máximo que un evento espera a otros antes de enviarse.
+            max_events: Eventos por frame; al llegar a este número se envía sin esperar.
+        """
+        self.send = send
+        self.window = max(0, window_ms) / 1000.0
+        self.max_events = max(1, int(max_events))
+        self._pending = []
+        self._flush_handle = None
+        self.frames_sent = 0
+        self.events_sent = 0
+        self.send_errors = 0
+
+    def add(self, loop, broadcast_data):
+        """Encola un evento desde cualquier thread."""
+        loop.call_soon_threadsafe(self._enqueue, broadcast_data)
+
+    def _enqueue(self, broadcast_data):
+        self._pending.append(broadcast_data)
+        if len(self._pending) >= self.max_events:
+            asyncio.ensure_future(self.send_frame(self._take()))
+        elif self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(
+                self.window, lambda: asyncio.ensure_future(self.send_frame(self._take()))
+            )
+
+    def _take(self):
+        """Saca los eventos pendientes y cancela el envío programado."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        events, self._pending = self._pending, []
+        return events
+
+    async def flush(self):
+        """Envía los eventos pendientes (si los hay) en un solo frame."""
+        await self.send_frame(self._take())
+
+    async def send_frame(self, events):
+        """Envía una lista de eventos como un frame y actualiza los contadores."""
+        if not events:
+            return
+        if len(events) == 1:
+            event, payload = REALTIME_EVENT, events[0]
+        else:
+            event, payload = REALTIME_EVENT_BATCH, {
+                'username': events[-1].get('username'),
+                'timestamp': events[-1].get('timestamp'),
+                'events': events
+            }
+        try:
+            await self.send(event, payload)
+            self.frames_sent += 1
+            self.events_sent += len(events)
+        except Exception as e:
+            self.send_errors += 1
+            message_bus.publish(
+                content=f"Error broadcasting {len(events)} realtime event(s): {e}",
+                level=MessageLevel.ERROR,
+                metadata={"source": "realtime_bridge"}
+            )
+
 class RealtimeBridge:
     """Puente de comunicación en tiempo real para SCLogAnalyzer.
     El filtro de mensajes 'stalled' es controlado por la UI pero reside como propiedad en el backend (esta clase).
@@ -55,15 +153,17 @@ class RealtimeBridge:
         # y se asigna en __init__ de RealtimeBridge
         return _realtime_bridge_instance
 
-    def __init__(self, supabase_client, config_manager, use_singleton=True):
+    def __init__(self, supabase_client, config_manager, use_singleton=True, transport=None):
         if use_singleton:
             global _realtime_bridge_instance
             _realtime_bridge_instance = self
             
         # We'll use the async client instead of the passed sync client
         self.sync_supabase = supabase_client  # Keep reference to sync client
-        # Get the async client - inicialmente None, lo obtendremos en connect()
-        self.supabase = None
+        # Transporte de tiempo real (Supabase o hub local, ver realtime_transport)
+        self.transport = transport or create_realtime_transport(config_manager)
+        # Cliente realtime del transporte - inicialmente None, lo obtendremos en connect()
+        self.realtime = None
         
         self.config_manager = config_manager
         self.username = config_manager.get('username', None)  # Default to None instead of 'Unknown'
@@ -75,12 +175,36 @@ class RealtimeBridge:
         self.heartbeat_thread = None
         # Usar el intervalo configurable o el valor por defecto de 30 segundos (cambiado de 120)
         self.heartbeat_interval = int(config_manager.get('active_users_update_interval', 30))  # Segundos
-        
+
+        # Agrupación de broadcasts salientes (ventana 0 = enviar cada evento por separado).
+        # Desactivada por defecto: los clientes antiguos no se suscriben a 'realtime-event-batch'
+        # y perderían los eventos agrupados; activarla solo cuando todos estén actualizados.
+        self.broadcast_batcher = BroadcastBatcher(
+            self._send_broadcast_frame,
+            window_ms=int(config_manager.get('realtime_batch_window_ms', 0)),
+            max_events=int(config_manager.get('realtime_batch_max_events', 20))
+        )
+        self.frames_received = 0
+        self.events_received = 0
+        self._broadcast_stats_since = time.monotonic()
+
         # Nuevo: thread y loop dedicados para asyncio
         self.event_loop = None
         self.event_loop_thread = None
         self.event_loop_running = False
+
+        # Coroutines enviadas al bucle sin esperar (submit) y su contabilidad
+        self.coroutine_timeout = float(config_manager.get('realtime_coroutine_timeout', 10))
+        self.max_inflight = max(1, int(config_manager.get('realtime_max_inflight', 32)))
+        self._inflight = threading.BoundedSemaphore(self.max_inflight)
+        self._pending_futures = set()
+        self._coroutine_lock = threading.Lock()
+        self.coroutine_stats = {'submitted': 0, 'completed': 0, 'failed': 0,
+                                'timed_out': 0, 'cancelled': 0, 'rejected': 0}
         
+        # Usuarios online por nombre; las sincronizaciones de presencia se publican como deltas
+        self.presence_store = PresenceStore()
+
         # Nuevo: diccionario para almacenar la última actividad de cada usuario
         self.last_activity = {}  # username -> last ping timestamp
         # New: track last ping from any user
@@ -152,16 +276,16 @@ class RealtimeBridge:
             return False
         try:
             self._start_event_loop()
-            self.supabase = supabase_manager.get_async_client(self.username)
-            if not self.supabase:
+            self.realtime = self.transport.connect(self.username)
+            if not self.realtime:
                 message_bus.publish(
-                    content="Failed to get async Supabase client, cannot connect Realtime Bridge",
+                    content=f"Failed to get {self.transport.name} realtime client, cannot connect Realtime Bridge",
                     level=MessageLevel.ERROR,
                     metadata={"source": "realtime_bridge"}
                 )
                 return False
             message_bus.publish(
-                content="Successfully obtained async Supabase client",
+                content=f"Successfully obtained {self.transport.name} realtime client",
                 level=MessageLevel.DEBUG,
                 metadata={"source": "realtime_bridge"}
             )
@@ -196,17 +320,25 @@ class RealtimeBridge:
             self._stop_heartbeat()
             self._stop_ping_missing_check()  # Stop ping absence checker
 
+            # Enviar los eventos que aún esperan en el batcher
+            if self.event_loop and self.event_loop_running:
+                self._run_in_loop(self.broadcast_batcher.flush())
+
             # Desconectar todos los canales primero
             for channel in self.channels.values():
                 self._run_in_loop(channel.unsubscribe())
             self.channels = {}
+            # Sin canal no hay presencia: los usuarios vuelven a entrar al reconectar
+            delta = self.presence_store.clear()
+            if delta['left']:
+                message_bus.emit("users_online_delta", delta)
 
             # Ahora cerrar cliente async si existe y el event loop está abierto
-            if self.supabase:
+            if self.realtime:
                 try:
                     loop = self.event_loop
                     if loop and loop.is_running() and not loop.is_closed():
-                        self._run_in_loop(self.supabase.realtime.close())
+                        self._run_in_loop(self.realtime.close())
                         message_bus.publish(
                             content="RealtimeBridge: async client closed",
                             level=MessageLevel.DEBUG,
@@ -224,7 +356,7 @@ class RealtimeBridge:
                         level=MessageLevel.ERROR,
                         metadata={"source": "realtime_bridge"}
                     )
-                self.supabase = None
+                self.realtime = None
 
             # Detener el bucle de eventos dedicado
             self._stop_event_loop()
@@ -293,6 +425,9 @@ class RealtimeBridge:
             return
             
         self.event_loop_running = False
+
+        # Las coroutines que sigan en curso no terminarán con el bucle parado
+        self.cancel_pending()
         
         if self.event_loop:
             # Programar la detención del bucle desde dentro del mismo bucle
@@ -304,8 +439,10 @@ class RealtimeBridge:
             
         self.event_loop_thread = None
             
-    def _run_in_loop(self, coroutine):
-        """Ejecuta una coroutine en el bucle de eventos dedicado"""
+    def _run_in_loop(self, coroutine, timeout=None):
+        """Ejecuta una coroutine en el bucle de eventos dedicado y espera su resultado.
+        Solo para quien necesita el resultado o el orden (suscribir, desconectar); el resto usa submit().
+        """
         if not self.event_loop or not self.event_loop_running:
             # Si no hay un bucle de eventos dedicado, usamos el método estándar
             try:
@@ -317,9 +454,114 @@ class RealtimeBridge:
             
             return loop.run_until_complete(coroutine)
             
-        # Crear un objeto Future para obtener el resultado
-        future = asyncio.run_coroutine_threadsafe(coroutine, self.event_loop)
-        return future.result(10)  # Timeout de 10 segundos
+        # La coroutine se cancela en el bucle al vencer el timeout (no sigue ocupándolo)
+        timeout = self.coroutine_timeout if timeout is None else timeout
+        future = self._schedule(coroutine, self._coroutine_name(coroutine), timeout, None, limited=False)
+        return future.result(timeout + 1)
+
+    def submit(self, coroutine, name=None, timeout=None, event=None):
+        """Programa una coroutine en el bucle dedicado sin bloquear al llamante.
+
+        Args:
+            coroutine: La coroutine a ejecutar
+            name: Nombre para logs y estadísticas (por defecto el de la coroutine)
+            timeout: Segundos antes de cancelarla (por defecto 'realtime_coroutine_timeout')
+            event: Evento del MessageBus emitido al terminar con (name, result, error)
+
+        Returns:
+            concurrent.futures.Future con el resultado, o None si el bucle no está activo
+            o ya hay 'realtime_max_inflight' coroutines en curso
+        """
+        name = name or self._coroutine_name(coroutine)
+        if not self.event_loop or not self.event_loop_running:
+            reason = "event loop not running"
+        elif not self._inflight.acquire(blocking=False):
+            reason = f"{self.max_inflight} coroutines already in flight"
+        else:
+            try:
+                return self._schedule(coroutine, name, timeout, event, limited=True)
+            except Exception as e:
+                self._inflight.release()
+                reason = str(e)
+        coroutine.close()
+        with self._coroutine_lock:
+            self.coroutine_stats['rejected'] += 1
+        message_bus.publish(
+            content=f"Dropped realtime coroutine {name}: {reason}",
+            level=MessageLevel.WARNING,
+            metadata={"source": "realtime_bridge"}
+        )
+        return None
+
+    @staticmethod
+    def _coroutine_name(coroutine):
+        return getattr(coroutine, '__qualname__', None) or type(coroutine).__name__
+
+    def _schedule(self, coroutine, name, timeout, event, limited):
+        """Programa la coroutine (con timeout) y registra su finalización"""
+        timeout = self.coroutine_timeout if timeout is None else timeout
+        wrapped = asyncio.wait_for(coroutine, timeout)
+        try:
+            future = asyncio.run_coroutine_threadsafe(wrapped, self.event_loop)
+        except Exception:
+            wrapped.close()
+            raise
+        with self._coroutine_lock:
+            self.coroutine_stats['submitted'] += 1
+            self._pending_futures.add(future)
+        future.add_done_callback(lambda f: self._coroutine_done(f, name, timeout, event, limited))
+        return future
+
+    def _coroutine_done(self, future, name, timeout, event, limited):
+        """Contabiliza el final de una coroutine y lo notifica por el MessageBus si se pidió"""
+        if limited:
+            self._inflight.release()
+        result, error = None, None
+        if future.cancelled():
+            outcome = 'cancelled'
+        else:
+            error = future.exception()
+            if error is None:
+                outcome = 'completed'
+                result = future.result()
+            elif isinstance(error, asyncio.TimeoutError):
+                outcome = 'timed_out'
+            else:
+                outcome = 'failed'
+        with self._coroutine_lock:
+            self.coroutine_stats[outcome] += 1
+            self._pending_futures.discard(future)
+        if outcome == 'timed_out':
+            message_bus.publish(
+                content=f"Realtime coroutine {name} timed out after {timeout}s",
+                level=MessageLevel.WARNING,
+                metadata={"source": "realtime_bridge"}
+            )
+        elif outcome == 'failed' and limited:
+            # Los errores de _run_in_loop los recibe el llamante
+            message_bus.publish(
+                content=f"Realtime coroutine {name} failed: {error}",
+                level=MessageLevel.ERROR,
+                metadata={"source": "realtime_bridge"}
+            )
+        if event:
+            message_bus.emit(event, name, result, error)
+
+    def cancel_pending(self):
+        """Cancela las coroutines aún en curso (p. ej. al parar el bucle)"""
+        with self._coroutine_lock:
+            pending = list(self._pending_futures)
+        for future in pending:
+            future.cancel()
+        return len(pending)
+
+    def get_coroutine_stats(self):
+        """Contadores de las coroutines ejecutadas en el bucle dedicado"""
+        with self._coroutine_lock:
+            stats = dict(self.coroutine_stats)
+            stats['in_flight'] = len(self._pending_futures)
+        stats['max_inflight'] = self.max_inflight
+        return stats
         
     def _build_presence_dict(self, username=None, shard=None, version=None, status=None, mode=None):
         """Builds the presence dictionary for track() calls."""
@@ -334,7 +576,7 @@ class RealtimeBridge:
     def _init_general_channel(self):
         """Inicializa el canal 'general' para presencia y broadcast"""
         try:
-            general_channel = self.supabase.realtime.channel('general', {
+            general_channel = self.realtime.channel('general', {
                 'config': {
                     'presence': {'key': self.username},
                     'broadcast': {'self': True}
@@ -369,9 +611,13 @@ class RealtimeBridge:
             )
             # Callbacks de broadcast
             general_channel.on_broadcast(
-                event="realtime-event",
+                event=REALTIME_EVENT,
                 callback=self._handle_realtime_event_broadcast
             )
+            general_channel.on_broadcast(
+                event=REALTIME_EVENT_BATCH,
+                callback=self._handle_realtime_event_batch_broadcast
+            )
             self._run_in_loop(general_channel.subscribe(on_subscribe))
             self.channels = {'general': general_channel}
             self._handle_realtime_event({
@@ -402,16 +648,15 @@ class RealtimeBridge:
         self.current_mode = mode  # Mantener actualizado el modo
         # Se puede usar el argumento 'private' para lógica futura si se requiere
         if 'general' in self.channels and self.channels['general']:
-            state = self.channels['general'].presence.state
-            if username in state:
-                if len(state[username]) \
-                    and state[username][0].get('metadata', {}).get('mode') == mode \
-                    and state[username][0].get('shard') == shard:
-                    return
+            entry = self.presence_store.get(username)
+            if entry \
+                and entry.get('metadata', {}).get('mode') == mode \
+                and entry.get('shard') == shard:
+                return
         if 'general' in self.channels and self.channels['general'] and username != 'Unknown':
             presence_data = self._build_presence_dict(username=username, shard=shard, version=version, mode=mode)
             try:
-                self._run_in_loop(self.channels['general'].track(presence_data))
+                self.submit(self.channels['general'].track(presence_data), name='presence_track')
                 message_bus.publish(
                     content=f"Updated presence status with shard: {shard}, version: {version}, mode: {mode}, private: {private}",
                     level=MessageLevel.DEBUG,
@@ -424,26 +669,23 @@ class RealtimeBridge:
                     metadata={"source": "realtime_bridge"}
                 )
 
-    def _handle_presence_sync(self, channel):
-        """Maneja la sincronización de estados de presencia. Usa la hora de última actividad basada en pings si está disponible."""
+    def _handle_presence_sync(self, channel, force=False):
+        """Maneja la sincronización de estados de presencia. Usa la hora de última actividad basada en pings si está disponible.
+        Emite 'users_online_delta' solo con los usuarios que cambian y, si hubo cambios (o force),
+        'users_online_updated' con la lista completa para los consumidores que la necesitan.
+        """
         try:
-            presence_state = channel.presence.state
-            users_online = []
-            for username, presences in presence_state.items():
-                for presence in presences:
-                    last_active = self.last_activity.get(username, presence.get('last_active'))
-                    users_online.append({
-                        'username': username,
-                        'shard': presence.get('shard'),
-                        'version': presence.get('version'),
-                        'status': presence.get('status'),
-                        'mode': presence.get('mode'),
-                        'last_active': last_active.strftime('%Y-%m-%d %H:%M:%S') if last_active else None,
-                        'metadata': presence.get('metadata', {})
-                    })
-            message_bus.emit("users_online_updated", users_online)
+            last_activity = {username: moment.strftime('%Y-%m-%d %H:%M:%S')
+                             for username, moment in list(self.last_activity.items())}
+            delta = self.presence_store.apply_state(channel.presence.state, last_activity)
+            changed = not PresenceStore.is_empty_delta(delta)
+            if changed:
+                message_bus.emit("users_online_delta", delta)
+            if changed or force:
+                message_bus.emit("users_online_updated", self.presence_store.snapshot())
             message_bus.publish(
-                content=f"Users online updated: {len(users_online)} users",
+                content=f"Users online updated: {len(self.presence_store)} users "
+                        f"(+{len(delta['joined'])} -{len(delta['left'])} ~{len(delta['updated'])})",
                 level=MessageLevel.DEBUG,
                 metadata={"source": "realtime_bridge"}
             )
@@ -465,30 +707,11 @@ class RealtimeBridge:
         """
         if 'general' not in self.channels or not self.channels['general']:
             return []
+        return self.presence_store.snapshot()
 
-        try:
-            presence_state = self.channels['general'].presence.state
-            users = []
-            for username, presences in presence_state.items():
-                for presence in presences:
-                    last_active = self.last_activity.get(username, presence.get('last_active'))
-                    users.append({
-                        'username': username,
-                        'shard': presence.get('shard'),
-                        'version': presence.get('version'),
-                        'status': presence.get('status'),
-                        'mode': presence.get('mode'),
-                        'last_active': last_active.strftime('%Y-%m-%d %H:%M:%S') if last_active else None,
-                        'metadata': presence.get('metadata', {})
-                    })
-            return users
-        except Exception as e:
-            message_bus.publish(
-                content=f"Error getting connected users: {e}",
-                level=MessageLevel.ERROR,
-                metadata={"source": "realtime_bridge"}
-            )
-            return []
+    def is_online(self, username):
+        """Indica si el usuario está en la presencia del canal general (O(1))"""
+        return self.presence_store.is_online(username)
 
     def _handle_presence_join(self, key, current, new):
         """Maneja cuando un nuevo usuario se une al canal de presencia"""
@@ -543,7 +766,11 @@ class RealtimeBridge:
             
             # Usar el canal broadcast común en lugar de canales por shard
             if 'general' in self.channels:
-                self._run_in_loop(self.channels['general'].send_broadcast('realtime-event', broadcast_data))
+                if self.broadcast_batcher.window > 0 and self.event_loop and self.event_loop_running:
+                    # Se envía junto con los demás eventos de la ventana
+                    self.broadcast_batcher.add(self.event_loop, broadcast_data)
+                else:
+                    self.submit(self.broadcast_batcher.send_frame([broadcast_data]), name='broadcast')
                 
                 message_bus.publish(
                     content=f"Broadcasted realtime event to all users (from shard {self.shard})",
@@ -564,7 +791,44 @@ class RealtimeBridge:
                 metadata={"source": "realtime_bridge"}
             )
 
+    async def _send_broadcast_frame(self, event, payload):
+        """Envía un frame broadcast por el canal general actual (puede cambiar al reconectar)"""
+        channel = self.channels.get('general')
+        if channel is None:
+            raise RuntimeError("general channel not initialized")
+        await channel.send_broadcast(event, payload)
+
+    def _handle_realtime_event_batch_broadcast(self, payload):
+        """Desempaqueta un frame 'realtime-event-batch' y procesa cada evento como un 'realtime-event'"""
+        batch = payload.get('payload', {})
+        events = batch.get('events', [])
+        self.frames_received += 1
+        self.events_received += len(events)
+        for broadcast_data in events:
+            self._process_realtime_event_broadcast({'payload': broadcast_data})
+
     def _handle_realtime_event_broadcast(self, payload):
+        """Maneja un frame 'realtime-event' con un único evento"""
+        self.frames_received += 1
+        self.events_received += 1
+        self._process_realtime_event_broadcast(payload)
+
+    def get_broadcast_stats(self):
+        """Frames y eventos broadcast enviados/recibidos desde que se creó el bridge, con sus tasas por segundo"""
+        elapsed = max(time.monotonic() - self._broadcast_stats_since, 1e-6)
+        batcher = self.broadcast_batcher
+        return {
+            'elapsed': elapsed,
+            'frames_sent': batcher.frames_sent,
+            'events_sent': batcher.events_sent,
+            'frames_received': self.frames_received,
+            'events_received': self.events_received,
+            'send_errors': batcher.send_errors,
+            'frames_sent_per_sec': batcher.frames_sent / elapsed,
+            'frames_received_per_sec': self.frames_received / elapsed,
+        }
+
+    def _process_realtime_event_broadcast(self, payload):
         """Maneja los mensajes broadcast de eventos en tiempo real recibidos de otros usuarios.
         Aplica el filtro de 'stalled' si está activado en el singleton (controlado por la UI, almacenado en self).
         Aplica el filtro de usuarios online si filter_broadcast_usernames no está vacío (controlado por la UI).
@@ -637,15 +901,8 @@ class RealtimeBridge:
 
             # --- FILTRO DE 'STALLED' CONTROLADO POR ATRIBUTO BACKEND ---
             if self.filter_stalled_if_online and event_data.get('type') == 'actor_stall':
-                users_online = []
-                try:
-                    if 'general' in self.channels:
-                        state = self.channels['general'].presence.state
-                        users_online = list(state.keys())
-                except Exception:
-                    pass
                 player = event_data.get('raw_data',{}).get('player')
-                if player and player in users_online:
+                if player and self.presence_store.is_online(player):
                     return  # SUPRIMIR el mensaje
 
             # Filtrar y procesar pings
@@ -708,7 +965,7 @@ class RealtimeBridge:
                 # Solo actualizar si tenemos información de shard e información de presencia
                 if 'general' in self.channels and self.channels['general'] and self.username != 'Unknown':
                     presence_data = self._build_presence_dict()
-                    self._run_in_loop(self.channels['general'].track(presence_data))
+                    self.submit(self.channels['general'].track(presence_data), name='heartbeat_track')
                     message_bus.publish(
                         content="Heartbeat presence update sent",
                         level=MessageLevel.DEBUG,
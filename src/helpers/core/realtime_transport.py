@@ -0,0 +1,528 @@
+"""
+Transportes de tiempo real para RealtimeBridge.
+
+RealtimeBridge solo usa una parte pequeña del cliente de Supabase Realtime: crear un canal,
+registrar callbacks de broadcast y presencia, suscribirse, track/untrack, enviar broadcasts
+y cerrar. Este módulo define ese contrato (RealtimeTransport) con dos implementaciones:
+
+- SupabaseRealtimeTransport: el cliente async de Supabase de siempre.
+- LocalRealtimeTransport: un hub local (LocalRealtimeHub) con la misma semántica de
+  broadcast, presencia y join/leave, accesible dentro del proceso o por TCP
+  (LocalRealtimeServer, JSON por líneas) para que varios procesos compartan canal.
+  Permite ejecutar N clientes simulados en una máquina sin conexión a Supabase y medir
+  latencia y rendimiento de forma reproducible.
+
+Se elige con la clave de configuración 'realtime_transport':
+"supabase" (por defecto), "local" (hub del proceso) o "local://host:puerto" (hub TCP).
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import threading
+import uuid
+from abc import ABC, abstractmethod
+
+from helpers.core.message_bus import message_bus, MessageLevel
+
+DEFAULT_LOCAL_HOST = '127.0.0.1'
+DEFAULT_LOCAL_PORT = 8765
+
+
+class RealtimeTransport(ABC):
+    """Creates the realtime client (``channel(name, options)`` and ``async close()``) used by the bridge."""
+
+    name = 'base'
+
+    @abstractmethod
+    def connect(self, username):
+        """
+        Open a realtime client for ``username``.
+
+        Returns:
+            The realtime client, or None if it could not be created.
+        """
+        pass
+
+
+class SupabaseRealtimeTransport(RealtimeTransport):
+    """Supabase Realtime through the shared async client of supabase_manager."""
+
+    name = 'supabase'
+
+    def connect(self, username):
+        from helpers.core.supabase_manager import supabase_manager
+        client = supabase_manager.get_async_client(username)
+        return client.realtime if client else None
+
+
+class LocalRealtimeTransport(RealtimeTransport):
+    """Local hub, in this process (``address`` None) or over TCP at ``(host, port)``."""
+
+    name = 'local'
+
+    def __init__(self, hub=None, address=None, latency=0.0):
+        """
+        Args:
+            hub: In-process hub (defaults to the process-wide one); ignored with ``address``.
+            address: (host, port) of a LocalRealtimeServer.
+            latency: Extra seconds added to every in-process delivery (fixed, for benchmarks).
+        """
+        self.hub = hub
+        self.address = address
+        self.latency = latency
+
+    def connect(self, username):
+        if self.address:
+            return LocalRealtimeClient(lambda channel: _TcpLink(channel, *self.address))
+        hub = self.hub or get_local_hub()
+        return LocalRealtimeClient(lambda channel: _HubLink(channel, hub, self.latency))
+
+
+def create_realtime_transport(config_manager):
+    """
+    Transport selected by config 'realtime_transport'.
+
+    Returns:
+        RealtimeTransport: Supabase unless the config asks for "local" or "local://host:port".
+    """
+    setting = str(config_manager.get('realtime_transport', 'supabase') or 'supabase').strip()
+    if setting == 'local':
+        return LocalRealtimeTransport()
+    if setting.startswith('local://'):
+        host, _, port = setting[len('local://'):].partition(':')
+        return LocalRealtimeTransport(address=(host or DEFAULT_LOCAL_HOST, int(port or DEFAULT_LOCAL_PORT)))
+    if setting != 'supabase':
+        message_bus.publish(
+            content=f"Unknown realtime_transport '{setting}', using Supabase",
+            level=MessageLevel.WARNING,
+            metadata={"source": "realtime_transport"}
+        )
+    return SupabaseRealtimeTransport()
+
+
+class LocalRealtimeHub:
+    """
+    Channel server: members, presence metas and fan-out of broadcasts and presence diffs.
+
+    Messages are encoded to JSON once and each member decodes its own copy, as a websocket
+    client would. Thread-safe: members live on different event loops or connections.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._channels = {}  # {topic: {member_id: member}}
+        self._ids = itertools.count(1)
+        self.messages_in = 0
+        self.messages_out = 0
+
+    def join(self, topic, member):
+        """Add a member (``.key``, ``.self_broadcast``, ``.meta``, ``.push(text)``) and send it the state."""
+        with self._lock:
+            member.member_id = next(self._ids)
+            members = self._channels.setdefault(topic, {})
+            members[member.member_id] = member
+            state = self._state(members)
+        member.push(json.dumps({'type': 'subscribed'}))
+        member.push(json.dumps({'type': 'presence_state', 'state': state}))
+
+    def leave(self, topic, member):
+        self.untrack(topic, member)
+        with self._lock:
+            members = self._channels.get(topic, {})
+            members.pop(getattr(member, 'member_id', None), None)
+            if not members:
+                self._channels.pop(topic, None)
+
+    def track(self, topic, member, payload):
+        meta = dict(payload, phx_ref=uuid.uuid4().hex)
+        with self._lock:
+            previous, member.meta = member.meta, meta
+        leaves = {member.key: [previous]} if previous else {}
+        self._fan_out(topic, {'type': 'presence_diff', 'joins': {member.key: [meta]}, 'leaves': leaves})
+
+    def untrack(self, topic, member):
+        with self._lock:
+            previous, member.meta = member.meta, None
+        if previous:
+            self._fan_out(topic, {'type': 'presence_diff', 'joins': {}, 'leaves': {member.key: [previous]}})
+
+    def broadcast(self, topic, member, event, payload):
+        self._fan_out(topic, {'type': 'broadcast', 'event': event, 'payload': payload},
+                      skip=None if member.self_broadcast else member)
+
+    def _fan_out(self, topic, message, skip=None):
+        text = json.dumps(message)
+        with self._lock:
+            self.messages_in += 1
+            members = [m for m in self._channels.get(topic, {}).values() if m is not skip]
+            self.messages_out += len(members)
+        for member in members:
+            member.push(text)
+
+    @staticmethod
+    def _state(members):
+        state = {}
+        for member in members.values():
+            if member.meta:
+                state.setdefault(member.key, []).append(member.meta)
+        return state
+
+    def get_stats(self):
+        with self._lock:
+            return {
+                'channels': {topic: len(members) for topic, members in self._channels.items()},
+                'messages_in': self.messages_in,
+                'messages_out': self.messages_out,
+            }
+
+
+_local_hub = None
+_local_hub_lock = threading.Lock()
+
+
+def get_local_hub():
+    """Process-wide LocalRealtimeHub (created on first use)."""
+    global _local_hub
+    with _local_hub_lock:
+        if _local_hub is None:
+            _local_hub = LocalRealtimeHub()
+        return _local_hub
+
+
+class LocalPresence:
+    """Client-side presence state ({key: [metas]}) kept from state/diff messages like the Supabase client."""
+
+    def __init__(self):
+        self.state = {}
+
+    @staticmethod
+    def _metas(raw):
+        return {key: [dict(meta, presence_ref=meta.get('phx_ref')) for meta in metas] for key, metas in raw.items()}
+
+    def sync_state(self, raw_state, on_join, on_leave):
+        new_state = self._metas(raw_state)
+        leaves = {key: metas for key, metas in self.state.items() if key not in new_state}
+        joins = {}
+        for key, metas in new_state.items():
+            current_refs = {meta['presence_ref'] for meta in self.state.get(key, [])}
+            new_refs = {meta['presence_ref'] for meta in metas}
+            joined = [meta for meta in metas if meta['presence_ref'] not in current_refs]
+            left = [meta for meta in self.state.get(key, []) if meta['presence_ref'] not in new_refs]
+            if joined:
+                joins[key] = joined
+            if left:
+                leaves[key] = left
+        self._sync_diff(joins, leaves, on_join, on_leave)
+
+    def sync_diff(self, raw_joins, raw_leaves, on_join, on_leave):
+        self._sync_diff(self._metas(raw_joins), self._metas(raw_leaves), on_join, on_leave)
+
+    def _sync_diff(self, joins, leaves, on_join, on_leave):
+        for key, new_metas in joins.items():
+            current = self.state.get(key, [])
+            joined_refs = {meta['presence_ref'] for meta in new_metas}
+            self.state[key] = [meta for meta in current if meta['presence_ref'] not in joined_refs] + new_metas
+            if on_join:
+                on_join(key, current, new_metas)
+        for key, left_metas in leaves.items():
+            current = self.state.get(key, [])
+            if not current:
+                continue
+            left_refs = {meta['presence_ref'] for meta in left_metas}
+            current = [meta for meta in current if meta['presence_ref'] not in left_refs]
+            self.state[key] = current
+            if on_leave:
+                on_leave(key, current, left_metas)
+            if not current:
+                del self.state[key]
+
+
+class LocalChannel:
+    """Channel of a LocalRealtimeClient with the subset of the Supabase channel API used by the bridge."""
+
+    def __init__(self, client, topic, options, link_factory):
+        config = (options or {}).get('config', {})
+        self.client = client
+        self.topic = topic
+        self.key = config.get('presence', {}).get('key') or uuid.uuid4().hex
+        self.self_broadcast = bool(config.get('broadcast', {}).get('self', False))
+        self.presence = LocalPresence()
+        self._link_factory = link_factory
+        self._link = None
+        self._broadcast_callbacks = []  # [(event, callback)]
+        self._on_sync = None
+        self._on_join = None
+        self._on_leave = None
+        self._subscribe_callback = None
+        self.loop = None
+
+    def on_broadcast(self, event, callback):
+        self._broadcast_callbacks.append((event, callback))
+        return self
+
+    def on_presence_sync(self, callback):
+        self._on_sync = callback
+        return self
+
+    def on_presence_join(self, callback):
+        self._on_join = callback
+        return self
+
+    def on_presence_leave(self, callback):
+        self._on_leave = callback
+        return self
+
+    async def subscribe(self, callback=None):
+        self.loop = asyncio.get_running_loop()
+        self._subscribe_callback = callback
+        self._link = self._link_factory(self)
+        await self._link.open()
+        return self
+
+    async def unsubscribe(self):
+        if self._link is not None:
+            link, self._link = self._link, None
+            await link.close()
+        self.client.channels.pop(self.topic, None)
+
+    async def track(self, payload):
+        await self._send({'op': 'track', 'payload': payload})
+
+    async def untrack(self):
+        await self._send({'op': 'untrack'})
+
+    async def send_broadcast(self, event, data):
+        await self._send({'op': 'broadcast', 'event': event, 'payload': data})
+
+    async def _send(self, message):
+        if self._link is None:
+            raise RuntimeError(f"channel '{self.topic}' is not subscribed")
+        await self._link.send(message)
+
+    def _receive(self, text):
+        """Handle a hub message (runs on the channel's event loop)."""
+        message = json.loads(text)
+        kind = message.get('type')
+        if kind == 'broadcast':
+            payload = {'type': 'broadcast', 'event': message['event'], 'payload': message['payload']}
+            for event, callback in self._broadcast_callbacks:
+                if event == message['event']:
+                    callback(payload)
+        elif kind == 'presence_diff':
+            self.presence.sync_diff(message['joins'], message['leaves'], self._on_join, self._on_leave)
+            if self._on_sync:
+                self._on_sync()
+        elif kind == 'presence_state':
+            self.presence.sync_state(message['state'], self._on_join, self._on_leave)
+            if self._on_sync:
+                self._on_sync()
+        elif kind == 'subscribed' and self._subscribe_callback:
+            self._subscribe_callback('SUBSCRIBED', None)
+
+
+class LocalRealtimeClient:
+    """Realtime client of LocalRealtimeTransport (stands in for ``AsyncClient.realtime``)."""
+
+    def __init__(self, link_factory):
+        self._link_factory = link_factory
+        self.channels = {}
+
+    def channel(self, topic, options=None):
+        channel = LocalChannel(self, topic, options, self._link_factory)
+        self.channels[topic] = channel
+        return channel
+
+    async def connect(self):
+        return None
+
+    async def close(self):
+        for channel in list(self.channels.values()):
+            await channel.unsubscribe()
+
+
+class _HubLink:
+    """In-process connection of a channel to a LocalRealtimeHub."""
+
+    def __init__(self, channel, hub, latency=0.0):
+        self.channel = channel
+        self.hub = hub
+        self.latency = latency
+        # Hub member
+        self.key = channel.key
+        self.self_broadcast = channel.self_broadcast
+        self.meta = None
+        self.closed = False
+
+    def push(self, text):
+        """Deliver a hub message on the channel's loop (called from any thread)."""
+        loop = self.channel.loop
+        if self.closed or loop is None or loop.is_closed():
+            return
+        try:
+            if self.latency:
+                loop.call_soon_threadsafe(loop.call_later, self.latency, self._deliver, text)
+            else:
+                loop.call_soon_threadsafe(self._deliver, text)
+        except RuntimeError:
+            pass  # Loop closed while delivering
+
+    def _deliver(self, text):
+        if not self.closed:
+            self.channel._receive(text)
+
+    async def open(self):
+        self.hub.join(self.channel.topic, self)
+
+    async def send(self, message):
+        op = message['op']
+        if op == 'broadcast':
+            self.hub.broadcast(self.channel.topic, self, message['event'], message['payload'])
+        elif op == 'track':
+            self.hub.track(self.channel.topic, self, message['payload'])
+        elif op == 'untrack':
+            self.hub.untrack(self.channel.topic, self)
+
+    async def close(self):
+        self.hub.leave(self.channel.topic, self)
+        self.closed = True
+
+
+class _TcpLink:
+    """Connection of a channel to a LocalRealtimeServer (one TCP stream per channel, JSON lines)."""
+
+    def __init__(self, channel, host, port):
+        self.channel = channel
+        self.host = host
+        self.port = port
+        self._reader = None
+        self._writer = None
+        self._reader_task = None
+
+    async def open(self):
+        self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+        await self._write({'op': 'join', 'topic': self.channel.topic, 'key': self.channel.key,
+                           'self': self.channel.self_broadcast})
+        self._reader_task = asyncio.ensure_future(self._read_loop())
+
+    async def _read_loop(self):
+        try:
+            while True:
+                line = await self._reader.readline()
+                if not line:
+                    break
+                self.channel._receive(line.decode('utf-8'))
+        except (asyncio.CancelledError, ConnectionError):
+            pass
+
+    async def _write(self, message):
+        self._writer.write((json.dumps(message) + '\n').encode('utf-8'))
+        await self._writer.drain()
+
+    async def send(self, message):
+        await self._write(message)
+
+    async def close(self):
+        if self._writer is not None:
+            try:
+                await self._write({'op': 'leave'})
+            except ConnectionError:
+                pass
+            self._writer.close()
+        if self._reader_task is not None:
+            self._reader_task.cancel()
+
+
+class _ServerMember:
+    """Hub member for a TCP connection; pushes are written from the server loop."""
+
+    def __init__(self, loop, writer, key, self_broadcast):
+        self.loop = loop
+        self.writer = writer
+        self.key = key
+        self.self_broadcast = self_broadcast
+        self.meta = None
+
+    def push(self, text):
+        data = (text + '\n').encode('utf-8')
+        try:
+            self.loop.call_soon_threadsafe(self._write, data)
+        except RuntimeError:
+            pass
+
+    def _write(self, data):
+        if not self.writer.is_closing():
+            self.writer.write(data)
+
+
+class LocalRealtimeServer:
+    """Serves a LocalRealtimeHub over TCP so clients in other processes share its channels."""
+
+    def __init__(self, hub=None, host=DEFAULT_LOCAL_HOST, port=DEFAULT_LOCAL_PORT):
+        self.hub = hub or get_local_hub()
+        self.host = host
+        self.port = port
+        self._server = None
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def serve_forever(self):
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def _handle_connection(self, reader, writer):
+        member, topic = None, None
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                message = json.loads(line)
+                op = message.get('op')
+                if op == 'join' and member is None:
+                    topic = message['topic']
+                    member = _ServerMember(asyncio.get_running_loop(), writer, message['key'], message.get('self', False))
+                    self.hub.join(topic, member)
+                elif member is None:
+                    continue
+                elif op == 'broadcast':
+                    self.hub.broadcast(topic, member, message['event'], message['payload'])
+                elif op == 'track':
+                    self.hub.track(topic, member, message['payload'])
+                elif op == 'untrack':
+                    self.hub.untrack(topic, member)
+                elif op == 'leave':
+                    break
+        except (ConnectionError, ValueError):
+            pass
+        finally:
+            if member is not None:
+                self.hub.leave(topic, member)
+            writer.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local realtime hub for offline RealtimeBridge testing")
+    parser.add_argument('--host', default=DEFAULT_LOCAL_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_LOCAL_PORT)
+    args = parser.parse_args()
+    server = LocalRealtimeServer(host=args.host, port=args.port)
+    print(f"Local realtime hub listening on {args.host}:{args.port} (realtime_transport = local://{args.host}:{args.port})")
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+ResultCache: caché en memoria de resultados de consultas con caducidad (TTL) y
+expulsión LRU.
+
+La usan los proveedores de datos para que varias pestañas o refrescos seguidos que piden
+la misma hoja no repitan la lectura completa de la tabla. Las entradas se invalidan
+explícitamente cuando se insertan datos o cambia el esquema.
+"""
+import time
+import threading
+from collections import OrderedDict
+
+DEFAULT_TTL = 30.0
+DEFAULT_MAX_ENTRIES = 64
+
+
+class ResultCache:
+    """Thread-safe TTL + LRU cache."""
+
+    def __init__(self, ttl=DEFAULT_TTL, max_entries=DEFAULT_MAX_ENTRIES, clock=None):
+        """
+        Args:
+            ttl: Seconds an entry stays valid (0 disables the cache).
+            max_entries: Entries kept before the least recently used one is evicted.
+            clock: Function returning the current time in seconds (time.monotonic by default).
+        """
+        self.ttl = float(ttl)
+        self.max_entries = max(1, int(max_entries))
+        self.clock = clock or time.monotonic
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # {key: (expires_at, value)}
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def configure(self, ttl=None, max_entries=None):
+        with self._lock:
+            if ttl is not None:
+                self.ttl = float(ttl)
+            if max_entries is not None:
+                self.max_entries = max(1, int(max_entries))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get(self, key):
+        """
+        Returns:
+            (hit, value): ``value`` is None on a miss.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > self.clock():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return True, entry[1]
+                del self._entries[key]
+            self.misses += 1
+            return False, None
+
+    def put(self, key, value):
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (self.clock() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, predicate=None):
+        """
+        Drop entries whose key matches ``predicate`` (every entry when None).
+
+        Returns:
+            int: Number of entries removed.
+        """
+        with self._lock:
+            if predicate is None:
+                removed = len(self._entries)
+                self._entries.clear()
+            else:
+                keys = [key for key in self._entries if predicate(key)]
+                for key in keys:
+                    del self._entries[key]
+                removed = len(keys)
+            if removed:
+                self.invalidations += 1
+            return removed
+
+    def clear(self, *args, **kwargs):
+        """Drop every entry (accepts and ignores event arguments so it can be a bus handler)."""
+        return self.invalidate()
+
+    def get_stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'invalidations': self.invalidations,
+                'ttl': self.ttl,
+                'max_entries': self.max_entries,
+            }
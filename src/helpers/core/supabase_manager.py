@@ -10,7 +10,8 @@ from supabase import AsyncClientOptions
 from supabase import create_async_client
 
 import httpx
-from typing import Optional, Tuple, Dict, Any, Union
+from postgrest import ReturnMethod
+from typing import Optional, Tuple, Dict, Any, Union, List, Iterable
 
 # Load environment variables from config.json instead of .env
 from .config_utils import get_config_manager
@@ -55,6 +56,49 @@ def log_message(content, level="INFO", pattern_name=None, metadata=None):
         # Fallback to print if message bus not available
         print(content)
 
+# Maximum rows sent in a single bulk insert request
+BULK_INSERT_CHUNK_SIZE = 500
+
+# Column used as ON CONFLICT target so a replayed batch does not duplicate rows
+CONFLICT_COLUMN = "hash_value"
+
+# PostgREST/PostgreSQL error codes meaning the server could not handle the request right now
+# (no database connection, schema cache loading, resources, shutdown, timeouts, lock conflicts)
+UNAVAILABLE_ERROR_CODES = ('PGRST000', 'PGRST001', 'PGRST002', '08', '53', '57P', '57014', '40001', '40P01')
+
+
+def _is_unavailable_error(error) -> bool:
+    """
+    Whether an insert error means the server was unavailable rather than that it refused the rows.
+    
+    postgrest's APIError carries the HTTP status as ``code`` when the body was not JSON (e.g. a
+    gateway page); 5xx, 408 and 429 are transient. PostgreSQL/PostgREST codes are matched
+    against UNAVAILABLE_ERROR_CODES. Anything else (4xx, constraint violations...) is a rejection.
+    """
+    code = error.get('code') if isinstance(error, dict) else getattr(error, 'code', None)
+    if code is None:
+        return False
+    code = str(code)
+    if len(code) == 3 and code.isdigit():
+        status = int(code)
+        return status >= 500 or status in (408, 429)
+    return code.startswith(UNAVAILABLE_ERROR_CODES)
+
+
+class SupabaseTransportError(Exception):
+    """
+    An insert could not be carried out (no connection, timeout, target table could not
+    be created), as opposed to rows the server rejected. Retrying later may succeed.
+
+    Attributes:
+        written: Positions of the rows/items stored before the failure.
+    """
+
+    def __init__(self, message, written=None):
+        super().__init__(message)
+        self.written = list(written or [])
+
+
 class SupabaseManager:
     """
     Class to manage Supabase connection and operations.
@@ -66,6 +110,7 @@ class SupabaseManager:
         self.is_initialized = False
         self.connection_attempted = False  # Track if connection has been attempted
         self.metadata_cache = None  # Cache for metadata results
+        self._no_conflict_target = set()  # Tables whose hash_value column has no unique index
         
         # Async client attributes
         self.async_supabase = None
@@ -429,7 +474,8 @@ class SupabaseManager:
             # Add hash_value generated column only if all required fields are present
             if hash_fields_present:
                 columns.append("hash_value TEXT GENERATED ALWAYS AS"
-                " (MD5(COALESCE(username, '') || COALESCE(killer, '') || COALESCE(victim, '') || COALESCE( \"timestamp\"::TEXT, '')))  STORED")
+                " (MD5(COALESCE(username, '') || COALESCE(killer, '') || COALESCE(victim, '') || COALESCE( \"timestamp\"::TEXT, '')))  STORED"
+                " UNIQUE")
                 log_message(f"Added hash_value computed column to {table_name} as all required fields are present", "DEBUG")
             else:
                 log_message(f"Skipped hash_value column for {table_name} as some required fields are missing", "DEBUG")
@@ -663,6 +709,181 @@ class SupabaseManager:
             log_message(f"Exception inserting log into Supabase: {e}", "ERROR")
             return False
 
+    def insert_batch(self, items: Iterable[Dict[str, Any]], excluded_fields: Iterable[str] = ()) -> List[int]:
+        """
+        Insert a batch of queued log items with one bulk request per table (and chunk).
+        
+        Items are grouped by target table and by their key layout, so the table name is
+        sanitized and the keys are lowercased/filtered once per group instead of per row.
+        
+        Args:
+            items: Dictionaries with 'sheet' and 'data' keys, as queued by the log analyzer.
+            excluded_fields: Data keys that are never stored.
+            
+        Returns:
+            list: Positions (in ``items``) of the items written, ascending; rows skipped as
+            duplicates count as written. Items missing from it were rejected by the server.
+            
+        Raises:
+            SupabaseTransportError: If Supabase could not be reached; its ``written`` holds
+                the positions stored before the failure.
+        """
+        if not self.is_connected():
+            raise SupabaseTransportError("Supabase is not connected")
+        
+        excluded = set(excluded_fields)
+        table_names = {}  # {sheet: sanitized table name}
+        layouts = {}  # {(table_name, raw keys): (columns, kept keys)}
+        tables = {}  # {table_name: [row, ...]} in queue order
+        positions = {}  # {table_name: [item position, ...]} parallel to tables
+        for position, item in enumerate(items):
+            data = item.get('data', {})
+            sheet = item.get('sheet') or "game_logs"
+            table_name = table_names.get(sheet)
+            if table_name is None:
+                table_name = table_names[sheet] = self._sanitize_table_name(sheet)
+            layout_key = (table_name, tuple(data))
+            layout = layouts.get(layout_key)
+            if layout is None:
+                kept = [key for key in data if key not in excluded]
+                layout = layouts[layout_key] = ([key.lower() for key in kept], kept)
+            columns, kept = layout
+            tables.setdefault(table_name, []).append(dict(zip(columns, [data[key] for key in kept])))
+            positions.setdefault(table_name, []).append(position)
+        
+        written = []
+        for table_name, rows in tables.items():
+            table_positions = positions[table_name]
+            try:
+                written.extend(table_positions[row] for row in self.insert_rows(table_name, rows))
+            except SupabaseTransportError as e:
+                written.extend(table_positions[row] for row in e.written)
+                raise SupabaseTransportError(str(e), sorted(written)) from e
+        written.sort()
+        return written
+    
+    def insert_rows(self, table_name: str, rows: List[Dict[str, Any]]) -> List[int]:
+        """
+        Insert rows into an already sanitized table name using multi-row requests.
+        
+        When a chunk is rejected, only that chunk is retried row by row so one bad row
+        does not drop the rest of the batch.
+        
+        Args:
+            table_name (str): Sanitized table name.
+            rows (list): Row dictionaries with normalized keys.
+            
+        Returns:
+            list: Positions (in ``rows``) of the rows written, ascending.
+            
+        Raises:
+            SupabaseTransportError: If Supabase could not be reached; its ``written`` holds
+                the positions stored before the failure.
+        """
+        if not rows:
+            return []
+        if not self.is_connected():
+            raise SupabaseTransportError("Supabase is not connected")
+        
+        written = []
+        try:
+            # Same retry policy as insert_data for a table that was just created
+            max_retries = 1
+            if not self._table_exists(table_name):
+                if not self._create_table(table_name, rows[0]):
+                    log_message(f"Failed to create table {table_name}. Aborting insert of {len(rows)} rows.", "ERROR")
+                    raise SupabaseTransportError(f"Could not create table {table_name}")
+                max_retries = 3
+            
+            for start in range(0, len(rows), BULK_INSERT_CHUNK_SIZE):
+                chunk = rows[start:start + BULK_INSERT_CHUNK_SIZE]
+                if self._write_rows(table_name, chunk, max_retries):
+                    written.extend(range(start, start + len(chunk)))
+                    continue
+                # The server refused the chunk (4xx): find the rows it accepts
+                if len(chunk) > 1:
+                    log_message(f"Bulk insert of {len(chunk)} rows into {table_name} failed, retrying row by row", "WARNING")
+                    for offset, row in enumerate(chunk):
+                        if self._write_rows(table_name, [row], 1):
+                            written.append(start + offset)
+                max_retries = 1
+            
+            log_message(f"Bulk inserted {len(written)}/{len(rows)} rows into {table_name}", "DEBUG")
+            return written
+        except SupabaseTransportError as e:
+            raise SupabaseTransportError(str(e), written) from e
+        except Exception as e:
+            log_message(f"Exception bulk inserting into Supabase table {table_name}: {e}", "ERROR")
+            return written  # Chunks sent before the exception are stored
+    
+    def _conflict_target(self, table_name: str) -> Optional[str]:
+        """
+        Column to use as ON CONFLICT target for a table, or None for plain inserts.
+        """
+        if table_name in self._no_conflict_target:
+            return None
+        columns = self.get_metadata().get(table_name, {}).get('columns', {})
+        return CONFLICT_COLUMN if CONFLICT_COLUMN in columns else None
+    
+    def _write_rows(self, table_name: str, rows: List[Dict[str, Any]], max_retries: int = 1) -> bool:
+        """
+        Send one multi-row insert (or idempotent upsert on hash_value) request.
+        
+        Args:
+            table_name (str): Sanitized table name.
+            rows (list): Rows of the request.
+            max_retries (int): Attempts, with exponential backoff between them.
+            
+        Returns:
+            bool: True if the request succeeded, False if the server rejected the rows.
+            
+        Raises:
+            SupabaseTransportError: If the last attempt got no answer from the server or an
+                error saying it is unavailable (5xx, 408, 429, see _is_unavailable_error).
+        """
+        delay_seconds = 1
+        attempt = 0
+        transport_error = None
+        while attempt < max_retries:
+            if attempt > 0:
+                log_message(f"Retry attempt {attempt} for inserting into {table_name}, waiting {delay_seconds} seconds...", "DEBUG")
+                time.sleep(delay_seconds)
+                delay_seconds *= 2  # Exponential backoff
+            
+            conflict_column = self._conflict_target(table_name)
+            try:
+                query = self.supabase.table(table_name)
+                if conflict_column:
+                    request = query.upsert(rows, on_conflict=conflict_column, ignore_duplicates=True,
+                                           returning=ReturnMethod.minimal)
+                else:
+                    request = query.insert(rows, returning=ReturnMethod.minimal)
+                result = request.execute()
+                error = getattr(result, 'error', None)
+                transport_error = error if error is not None and _is_unavailable_error(error) else None
+            except httpx.TransportError as request_error:
+                error = str(request_error) or request_error.__class__.__name__
+                transport_error = request_error
+            except Exception as insert_error:
+                error = str(insert_error) or "Empty Error received from Supabase API"
+                transport_error = insert_error if _is_unavailable_error(insert_error) else None
+            
+            if error is None:
+                return True
+            
+            error_msg = str(error)
+            if conflict_column and ('42P10' in error_msg or 'no unique or exclusion constraint' in error_msg):
+                # Tables created before hash_value was unique: fall back to plain inserts
+                log_message(f"Table {table_name} has no unique {conflict_column}, using plain inserts", "DEBUG")
+                self._no_conflict_target.add(table_name)
+                continue
+            
+            log_message(f"Error inserting {len(rows)} rows into Supabase table {table_name}: {error_msg}", "ERROR")
+            attempt += 1
+        if transport_error is not None:
+            raise SupabaseTransportError(f"Supabase unavailable inserting into {table_name}: {transport_error}")
+        return False
+
     def purge_table(self, table_name: str, username: Optional[str] = None) -> bool:
         """
         Purge data from a table using raw SQL via the run_sql RPC function instead of the API.
@@ -780,6 +1001,7 @@ class SupabaseManager:
         Invalidate the metadata cache when schema changes
         """
         self.metadata_cache = None
+        self._no_conflict_target.clear()
         log_message("Metadata cache invalidated due to schema change", "DEBUG")
 
 # Create a singleton instance
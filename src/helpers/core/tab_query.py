@@ -0,0 +1,270 @@
+"""
+TabQueryEngine: consultas de las pestañas dinámicas (config['tabs']) como funciones
+parametrizadas en el servidor.
+
+Cada pestaña se convierte una sola vez en una función SQL con nombre propio
+(sclog_tab_<pestaña>_<hash de la consulta>) que recibe parámetros tipados: usuario,
+rango de fechas y LIMIT/OFFSET. Así el texto de la consulta ya no viaja en cada
+petición, el nombre de usuario nunca se concatena en el SQL y PostgreSQL puede
+reutilizar el plan. Los resultados se guardan en caché por tupla de parámetros.
+
+Las páginas (LIMIT/OFFSET) siguen un orden total: el ORDER BY final de la pestaña, si
+ordena por columnas del resultado, y después el texto JSON de la fila como desempate.
+"""
+import re
+import time
+import hashlib
+import threading
+from datetime import date, datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+TAB_FUNCTION_PREFIX = "sclog_tab_"
+# Part of the function name: bump it when build_function_sql changes so old definitions are not reused
+TAB_FUNCTION_VERSION = 2
+
+# Columns tried, in order, to apply the date range on the tab's result
+DATE_COLUMNS = ("created_at", "timestamp", "date")
+
+# PostgREST may need a moment to see a new function after the schema reload notification
+FUNCTION_VISIBLE_RETRIES = 3
+FUNCTION_VISIBLE_DELAY = 0.5
+
+
+# Trailing top-level ORDER BY made only of result column names (with optional direction)
+_ORDER_ITEM = r'[a-z_][a-z0-9_]*(?:\s+(?:asc|desc))?(?:\s+nulls\s+(?:first|last))?'
+_TRAILING_ORDER_BY = re.compile(rf'\border\s+by\s+({_ORDER_ITEM}(?:\s*,\s*{_ORDER_ITEM})*)\s*$', re.IGNORECASE)
+
+
+class TabQueryError(Exception):
+    """A tab could not be turned into a function or the call failed."""
+
+
+def tab_order_by(query: str, alias: str) -> str:
+    """
+    Deterministic ORDER BY list for paging the result of a tab query aliased as ``alias``.
+
+    Keeps the tab's own ordering when its final ORDER BY only names result columns, and
+    breaks every tie with the row's JSON text so LIMIT/OFFSET pages never overlap.
+    """
+    clean_query = ' '.join(query.split()).rstrip(';')
+    keys = []
+    match = _TRAILING_ORDER_BY.search(clean_query)
+    if match and clean_query.count('(', 0, match.start()) == clean_query.count(')', 0, match.start()):
+        items = [item.strip() for item in match.group(1).split(',')]
+        # ORDER BY may name columns that are not selected; only result columns exist on the alias
+        select_list = re.match(r'\s*select\s+(.*?)\s+from\s', clean_query, re.IGNORECASE | re.DOTALL)
+        select_list = select_list.group(1) if select_list else ''
+        if '*' in select_list or all(re.search(rf'\b{item.split()[0]}\b', select_list, re.IGNORECASE)
+                                     for item in items):
+            keys = [f"{alias}.{item}" for item in items]
+    keys.append(f"row_to_json({alias})::text")
+    return ', '.join(keys)
+
+
+def tab_function_name(tab_name: str, query: str) -> str:
+    """Stable function name for a tab; changes whenever its SQL changes."""
+    base = re.sub(r'[^a-z0-9]+', '_', tab_name.lower()).strip('_')[:32] or "tab"
+    digest = hashlib.sha1(f"{TAB_FUNCTION_VERSION}:{' '.join(query.split())}".encode('utf-8')).hexdigest()[:8]
+    return f"{TAB_FUNCTION_PREFIX}{base}_{digest}"
+
+
+def build_function_sql(function_name: str, query: str, username_filter: bool, date_column: Optional[str]) -> str:
+    """
+    CREATE FUNCTION statement wrapping a tab query.
+
+    Args:
+        function_name: Name from tab_function_name().
+        query: The tab's SELECT statement.
+        username_filter: Whether the result has a username column to filter on.
+        date_column: Result column used for the date range (None if there is none).
+    """
+    clean_query = ' '.join(query.split()).rstrip(';')
+    conditions = []
+    if username_filter:
+        conditions.append("(p_username IS NULL OR t.username = p_username)")
+    if date_column:
+        conditions.append(f"(p_from IS NULL OR t.{date_column}::timestamptz >= p_from)")
+        conditions.append(f"(p_to IS NULL OR t.{date_column}::timestamptz < p_to)")
+    where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+    return f"""
+        CREATE OR REPLACE FUNCTION {function_name}(
+            p_username TEXT DEFAULT NULL,
+            p_from TIMESTAMPTZ DEFAULT NULL,
+            p_to TIMESTAMPTZ DEFAULT NULL,
+            p_limit INTEGER DEFAULT NULL,
+            p_offset INTEGER DEFAULT 0
+        )
+        RETURNS SETOF JSON
+        LANGUAGE sql
+        STABLE
+        SECURITY DEFINER
+        AS $tab$
+            SELECT row_to_json(t) FROM ({clean_query}) t{where}
+            ORDER BY {tab_order_by(clean_query, 't')}
+            LIMIT p_limit OFFSET p_offset
+        $tab$;
+        """
+
+
+def _timestamp_param(value) -> Optional[str]:
+    """Validate a date range bound and return it as an ISO 8601 string."""
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, date):
+        return datetime(value.year, value.month, value.day).isoformat()
+    if isinstance(value, str):
+        return datetime.fromisoformat(value).isoformat()
+    raise TypeError(f"Expected a date, datetime or ISO string, got {type(value).__name__}")
+
+
+def _int_param(value, name) -> Optional[int]:
+    if value is None:
+        return None
+    if isinstance(value, bool) or int(value) != value or value < 0:
+        raise ValueError(f"{name} must be a non-negative integer")
+    return int(value)
+
+
+class TabQueryEngine:
+    """
+    Creates and calls one parameterized server-side function per dynamic tab.
+    """
+
+    def __init__(self, rpc: Callable[[str, Dict[str, Any]], Any], execute_sql: Callable[[str], Tuple[bool, Any]],
+                 cache=None):
+        """
+        Args:
+            rpc: Callable(function_name, params) returning the rows of a PostgREST RPC call.
+            execute_sql: Callable(sql) returning (success, result), e.g. supabase_manager._execute_sql.
+            cache: Optional ResultCache for results keyed on the parameter tuple.
+        """
+        self.rpc = rpc
+        self.execute_sql = execute_sql
+        self.cache = cache
+        self._lock = threading.Lock()
+        self._functions = {}  # {function name: (username_filter, date_column)}
+        self._failed = {}  # {function name: error} for tabs no variant could be created for
+
+    def ensure_function(self, tab_name: str, query: str, date_range: bool = False) -> str:
+        """
+        Create the tab's function if this process has not done it yet.
+
+        A failed creation is remembered, so later calls fail at once instead of probing
+        and trying every variant again (until forget()). A function found on the server
+        (created by an earlier session) is only probed; its filters are unknown, so with
+        ``date_range`` it is recreated to learn which date column it filters on.
+
+        Args:
+            tab_name: Tab name from config['tabs'].
+            query: The tab's SQL.
+            date_range: The caller needs to know the function's date column.
+
+        Returns:
+            str: The function name.
+
+        Raises:
+            TabQueryError: If no variant of the function could be created.
+        """
+        function_name = tab_function_name(tab_name, query)
+        known = self._functions.get(function_name)
+        if known is not None and (not date_range or known != (None, None)):
+            return function_name
+        failed = self._failed.get(function_name)
+        if failed is not None:
+            raise TabQueryError(failed)
+        with self._lock:
+            known = self._functions.get(function_name)
+            if known is not None and (not date_range or known != (None, None)):
+                return function_name
+            if function_name in self._failed:
+                raise TabQueryError(self._failed[function_name])
+            if known is None and not date_range:
+                try:
+                    # Already created by an earlier session (or another client)
+                    self.rpc(function_name, {'p_limit': 0})
+                    self._functions[function_name] = (None, None)
+                    return function_name
+                except Exception:
+                    pass
+            # The filters reference result columns, which only exist for some tabs: try the
+            # richest variant first and fall back until PostgreSQL accepts the definition
+            last_error = None
+            for username_filter in (True, False):
+                for date_column in DATE_COLUMNS + (None,):
+                    sql = build_function_sql(function_name, query, username_filter, date_column)
+                    success, result = self.execute_sql(sql)
+                    if success:
+                        # Let PostgREST pick up the new function without waiting for its poll
+                        self.execute_sql("NOTIFY pgrst, 'reload schema'")
+                        self._functions[function_name] = (username_filter, date_column)
+                        return function_name
+                    last_error = result
+            error = f"Could not create function for tab '{tab_name}': {last_error}"
+            if known is None:
+                self._failed[function_name] = error
+            # else: the existing function still serves calls without a date range
+            raise TabQueryError(error)
+
+    def execute(self, tab_name: str, query: str, username: Optional[str] = None, date_from=None, date_to=None,
+                limit: Optional[int] = None, offset: int = 0) -> List[Dict[str, Any]]:
+        """
+        Run a tab with bound parameters.
+
+        Args:
+            tab_name: Tab name from config['tabs'].
+            query: The tab's SQL.
+            username: Only rows of this user (ignored by tabs without a username column).
+            date_from: Inclusive lower bound of the date range.
+            date_to: Exclusive upper bound of the date range.
+            limit: Maximum number of rows.
+            offset: Rows to skip.
+
+        Returns:
+            List of row dictionaries.
+
+        Raises:
+            TabQueryError: If the function cannot be created or called, or a date range is
+                given for a tab without a date column.
+        """
+        params = {
+            'p_username': str(username) if username else None,
+            'p_from': _timestamp_param(date_from),
+            'p_to': _timestamp_param(date_to),
+            'p_limit': _int_param(limit, 'limit'),
+            'p_offset': _int_param(offset, 'offset') or 0,
+        }
+        date_range = params['p_from'] is not None or params['p_to'] is not None
+        function_name = self.ensure_function(tab_name, query, date_range=date_range)
+        if date_range and self._functions[function_name][1] is None:
+            # The function would ignore p_from/p_to and return every row
+            raise TabQueryError(f"Tab '{tab_name}' has no date column ({', '.join(DATE_COLUMNS)}) to filter on")
+        cache_key = ('tab', function_name) + tuple(params.values())
+        if self.cache is not None:
+            hit, rows = self.cache.get(cache_key)
+            if hit:
+                return [dict(row) for row in rows]
+
+        last_error = None
+        for attempt in range(FUNCTION_VISIBLE_RETRIES):
+            try:
+                rows = self.rpc(function_name, params)
+                break
+            except Exception as e:
+                last_error = e
+                if attempt + 1 < FUNCTION_VISIBLE_RETRIES:
+                    time.sleep(FUNCTION_VISIBLE_DELAY)
+        else:
+            raise TabQueryError(f"Call to {function_name} failed: {last_error}")
+
+        rows = [row for row in (rows or []) if isinstance(row, dict)]
+        if self.cache is not None:
+            self.cache.put(cache_key, rows)
+        return [dict(row) for row in rows]
+
+    def forget(self):
+        """Drop the list of known (and failed) functions (e.g. after a schema change)."""
+        with self._lock:
+            self._functions.clear()
+            self._failed.clear()
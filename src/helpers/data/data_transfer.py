@@ -4,20 +4,141 @@ Utility for transferring data from Google Sheets to Supabase.
 This module provides functionality to migrate data between data sources
 in the SCLogAnalyzer application. It connects to both Google Sheets
 and Supabase, fetches data from one, and imports it to the other.
+
+Sheets are transferred concurrently by a bounded pool of workers. Batch sizes
+follow the observed insert latency, and progress is checkpointed to disk after
+every committed batch so an interrupted migration resumes where it stopped.
 """
 
+import os
 import sys
 import time
 import asyncio
-from typing import List, Dict, Any, Optional, Tuple
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Tuple, Callable
 import traceback
-import hashlib
 import json
 
 from helpers.core.message_bus import message_bus, MessageLevel
-from helpers.core.config_utils import get_config_manager
-from helpers.core.data_provider import GoogleSheetsDataProvider, SupabaseDataProvider
-from helpers.core.supabase_manager import supabase_manager
+from helpers.core.config_utils import get_config_manager, get_application_path
+from helpers.core.data_provider import (GoogleSheetsDataProvider, SupabaseDataProvider, result_cache,
+                                        get_record_hash_index)
+from helpers.core.hash_index import record_hash
+from helpers.core.supabase_manager import supabase_manager, CONFLICT_COLUMN, SupabaseTransportError
+
+# Sheets transferred when config has no 'transfer_sheets'
+DEFAULT_TRANSFER_SHEETS = ["SC_Default", "EA_SquadronBattle", "Materials"]
+CHECKPOINT_FILE = "data_transfer_checkpoint.json"
+
+
+class AdaptiveBatchSize:
+    """
+    Batch size driven by insert latency: grows while inserts stay under the target
+    and halves when they get slow or fail.
+    """
+
+    def __init__(self, initial=50, minimum=10, maximum=1000, target_seconds=1.0):
+        """
+        Args:
+            initial: Starting batch size (also the additive step).
+            minimum: Smallest batch size.
+            maximum: Largest batch size.
+            target_seconds: Insert latency above which the batch size is halved.
+        """
+        self.minimum = max(1, int(minimum))
+        self.maximum = max(self.minimum, int(maximum))
+        self.step = max(self.minimum, int(initial))
+        self.size = min(self.maximum, self.step)
+        self.target = max(0.001, float(target_seconds))
+
+    def record(self, count: int, elapsed: float, ok: bool = True):
+        """
+        Adjust the size after an insert.
+
+        Args:
+            count: Rows in the batch.
+            elapsed: Seconds the insert took.
+            ok: Whether every row was written.
+        """
+        if not ok or elapsed > self.target:
+            self.size = max(self.minimum, self.size // 2)
+        elif count >= self.size and elapsed < self.target / 2:
+            self.size = min(self.maximum, self.size + self.step)
+
+
+class TransferCheckpoint:
+    """
+    Transfer progress saved to a JSON file after every committed batch.
+
+    Per sheet it keeps whether the table was purged, how many source rows are
+    committed (a prefix of the sheet, in fetch order) and the hash of the last one,
+    which tells whether the sheet still looks the same when the transfer resumes.
+    Rows Supabase refused are listed under 'rejected' and count as committed.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self.state = self._load()
+
+    def _load(self) -> Dict[str, Any]:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            if isinstance(state, dict) and isinstance(state.get('sheets'), dict):
+                return state
+        except (OSError, ValueError):
+            pass
+        return {'purge_first': None, 'sheets': {}}
+
+    def _save(self):
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f, indent=2)
+        os.replace(temp_path, self.path)
+
+    def begin(self, purge_first: bool) -> bool:
+        """
+        Start or resume a run.
+
+        Args:
+            purge_first: Transfer mode of the run; progress of a run in the other mode is discarded.
+
+        Returns:
+            bool: True if there is progress to resume.
+        """
+        with self._lock:
+            if self.state.get('purge_first') != purge_first:
+                self.state = {'purge_first': purge_first, 'sheets': {}}
+            return bool(self.state['sheets'])
+
+    def sheet(self, sheet_name: str) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self.state['sheets'].get(sheet_name, {}))
+
+    def update(self, sheet_name: str, **fields):
+        with self._lock:
+            self.state['sheets'].setdefault(sheet_name, {}).update(fields)
+            try:
+                self._save()
+            except OSError as e:
+                message_bus.publish(
+                    content=f"Could not save transfer checkpoint {self.path}: {e}",
+                    level=MessageLevel.WARNING,
+                    metadata={"source": DataTransfer.SOURCE}
+                )
+
+    def clear(self):
+        """Forget all progress (the transfer completed)."""
+        with self._lock:
+            self.state = {'purge_first': None, 'sheets': {}}
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
+
 
 class DataTransfer:
     """
@@ -25,20 +146,27 @@ class DataTransfer:
     """
     SOURCE = "data_transfer"
 
-    def __init__(self, config_manager=None, batch_size=50, max_retries=3, retry_delay=1.0):
+    def __init__(self, config_manager=None, batch_size=50, max_retries=3, retry_delay=1.0,
+                 checkpoint_path=None):
         """
         Initialize the data transfer utility.
-        
+
         Args:
             config_manager: Configuration manager instance. If None, one will be created.
-            batch_size (int): Number of records to process in a single batch
+            batch_size (int): Initial number of records per batch (adjusted from insert latency)
             max_retries (int): Maximum retry attempts for operations
             retry_delay (float): Delay between retry attempts in seconds
+            checkpoint_path (str): Progress file; defaults to the application folder
         """
         self.config_manager = config_manager or get_config_manager()
         self.batch_size = batch_size
         self.max_retries = max_retries
         self.retry_delay = retry_delay
+        self.workers = max(1, int(self.config_manager.get('transfer_workers', 3)))
+        self.target_batch_seconds = self.config_manager.get('transfer_target_batch_ms', 1000) / 1000.0
+        self.checkpoint = TransferCheckpoint(
+            checkpoint_path or os.path.join(get_application_path(), CHECKPOINT_FILE)
+        )
         self.gs_provider = None
         self.sb_provider = None
 
@@ -126,22 +254,34 @@ class DataTransfer:
     def transfer_sheet(self, sheet_name: str, purge_first: bool = True) -> Tuple[int, int]:
         """
         Transfer data from a specific Google Sheet to Supabase.
-        
+
+        Resumes from the checkpoint when an earlier run stopped part way through the sheet.
+
         Args:
             sheet_name (str): Name of the sheet to transfer
             purge_first (bool): Whether to purge existing data before transfer (default: True)
-            
+
         Returns:
             Tuple[int, int]: (Number of records processed, number of successful transfers)
         """
+        state = self.checkpoint.sheet(sheet_name)
+        if state.get('done'):
+            message_bus.publish(
+                content=f"Sheet {sheet_name} already transferred by the interrupted run, skipping",
+                level=MessageLevel.INFO,
+                metadata={"source": self.SOURCE}
+            )
+            return state.get('total', 0), state.get('written', 0)
+
         message_bus.publish(
             content=f"Starting transfer of sheet: {sheet_name}",
             level=MessageLevel.INFO,
             metadata={"source": self.SOURCE}
         )
 
-        # First, purge the existing data in the table if it exists and purge_first is True
-        if purge_first and self.sb_provider and self.sb_provider.is_connected():
+        # First, purge the existing data in the table if it exists and purge_first is True.
+        # A resumed sheet was already purged: purging again would drop the committed rows.
+        if purge_first and self.sb_provider and self.sb_provider.is_connected() and not state.get('purged'):
             message_bus.publish(
                 content=f"Purging existing data for sheet: {sheet_name}",
                 level=MessageLevel.INFO,
@@ -149,6 +289,8 @@ class DataTransfer:
             )
             # Use the purge method from the data provider
             self.sb_provider.purge(sheet_name)
+            state = {'purged': True, 'committed': 0, 'written': 0}
+            self.checkpoint.update(sheet_name, **state)
         elif not purge_first and self.sb_provider and self.sb_provider.is_connected():
             message_bus.publish(
                 content=f"Skipping purge for sheet: {sheet_name} - will check for duplicates",
@@ -158,54 +300,55 @@ class DataTransfer:
 
         # Fetch data from Google Sheets
         gs_data = self.gs_provider.fetch_data(sheet_name)
-        
+
         if not gs_data:
             message_bus.publish(
                 content=f"No data found in Google Sheets for sheet: {sheet_name}",
                 level=MessageLevel.WARNING,
                 metadata={"source": self.SOURCE}
             )
+            self.checkpoint.update(sheet_name, done=True, total=0, written=0)
             return 0, 0
-            
+
         message_bus.publish(
             content=f"Retrieved {len(gs_data)} records from Google Sheets for sheet: {sheet_name}",
             level=MessageLevel.INFO,
             metadata={"source": self.SOURCE}
         )
-        
+
+        # Resume after the committed prefix if the sheet still starts the same way
+        start = state.get('committed', 0)
+        dedup = not purge_first
+        if start:
+            if start <= len(gs_data) and record_hash(gs_data[start - 1]) == state.get('last_hash'):
+                message_bus.publish(
+                    content=f"Resuming sheet {sheet_name} at record {start + 1}/{len(gs_data)}",
+                    level=MessageLevel.INFO,
+                    metadata={"source": self.SOURCE}
+                )
+            else:
+                message_bus.publish(
+                    content=f"Sheet {sheet_name} changed since the checkpoint, restarting it with duplicate checks",
+                    level=MessageLevel.WARNING,
+                    metadata={"source": self.SOURCE}
+                )
+                start = 0
+                dedup = True
+        pending = list(enumerate(gs_data))[start:]  # (source row, record)
+
         # If we're not purging first, we need to filter out duplicates
-        filtered_gs_data = gs_data
-        if not purge_first and self.sb_provider and self.sb_provider.is_connected():
-            # Fetch only hashes from Supabase for efficient duplicate detection
-            message_bus.publish(
-                content=f"Fetching record hashes from Supabase for duplicate detection",
-                level=MessageLevel.INFO,
-                metadata={"source": self.SOURCE}
-            )
-            # Use the dedicated RPC function to get hashes
-            supabase_hashes = set(self.sb_provider.fetch_record_hashes(sheet_name))
-            
+        table_name = supabase_manager._sanitize_table_name(sheet_name)
+        index = get_record_hash_index()
+        if dedup and self.sb_provider and self.sb_provider.is_connected():
+            supabase_hashes = self._stored_hashes(sheet_name, table_name, index)
+
             if supabase_hashes:
                 # Filter out records that already exist in Supabase
-                filtered_gs_data = []
-                
-                for record in gs_data:
-                    # Calculate hash in the same way as in PostgreSQL
-                    # This has to match the MD5 calculation in the get_table_record_hashes function
-                    hash_input = (
-                        str(record.get('username', '')) +
-                        str(record.get('killer', '')) +
-                        str(record.get('victim', '')) +
-                        str(record.get('timestamp', '')) 
-                    )
-                    record_hash = hashlib.md5(hash_input.encode()).hexdigest()
-                    
-                    if record_hash not in supabase_hashes:
-                        filtered_gs_data.append(record)
-                
-                duplicate_count = len(gs_data) - len(filtered_gs_data)
+                candidates = len(pending)
+                pending = [(row, record) for row, record in pending if not supabase_hashes(record_hash(record))]
+                duplicate_count = candidates - len(pending)
                 message_bus.publish(
-                    content=f"Found {duplicate_count} duplicate records to skip ({duplicate_count * 100.0 / len(gs_data):.1f}%)",
+                    content=f"Found {duplicate_count} duplicate records to skip ({duplicate_count * 100.0 / candidates:.1f}%)",
                     level=MessageLevel.INFO,
                     metadata={"source": self.SOURCE}
                 )
@@ -215,66 +358,206 @@ class DataTransfer:
                     level=MessageLevel.INFO,
                     metadata={"source": self.SOURCE}
                 )
-        
+
+        total_processed = len(gs_data)  # Total includes duplicates we skipped
+        total_success = state.get('written', 0) if start else 0
+
         # If no records to insert after filtering, return early
-        if not filtered_gs_data:
+        if not pending:
             message_bus.publish(
                 content=f"No new records to insert for sheet: {sheet_name}",
                 level=MessageLevel.INFO,
                 metadata={"source": self.SOURCE}
             )
-            return len(gs_data), 0
-        
-        # Process in batches to avoid overloading the database
-        batches = [filtered_gs_data[i:i + self.batch_size] for i in range(0, len(filtered_gs_data), self.batch_size)]
-        
-        total_processed = len(gs_data)  # Total includes duplicates we skipped
-        total_success = 0
-        
-        for batch_idx, batch in enumerate(batches):
+            self.checkpoint.update(sheet_name, done=True, total=total_processed, written=total_success)
+            return total_processed, total_success
+
+        # Batches follow the insert latency instead of pausing between fixed-size batches
+        sizer = AdaptiveBatchSize(initial=self.batch_size, target_seconds=self.target_batch_seconds)
+        queue = deque(pending)
+        rejected = list(state.get('rejected', [])) if start else []  # Source rows the server refused
+        track_hashes = index is not None and supabase_manager._conflict_target(table_name) == CONFLICT_COLUMN
+        failures = 0
+        while queue:
+            batch = [queue.popleft() for _ in range(min(sizer.size, len(queue)))]
+            start_time = time.perf_counter()
+            transport_error = None
+            try:
+                written = supabase_manager.insert_batch(
+                    [{'data': record, 'sheet': sheet_name} for _, record in batch],
+                    self.sb_provider.excluded_fields
+                )
+            except SupabaseTransportError as e:
+                written, transport_error = e.written, e
+            elapsed = time.perf_counter() - start_time
+
+            written_positions = set(written)
+            if transport_error is None:
+                # Every row got an answer: the ones not written were refused and are not sent again
+                refused = [batch[position] for position in range(len(batch)) if position not in written_positions]
+            else:
+                # Rows without an answer go back to the front of the queue, in order
+                refused = []
+                queue.extendleft(reversed([batch[position] for position in range(len(batch))
+                                           if position not in written_positions]))
+            sizer.record(len(batch), elapsed, transport_error is None and not refused)
+
+            total_success += len(written)
+            if track_hashes and written:
+                index.add(table_name, [record_hash(batch[position][1]) for position in written])
+            if refused:
+                rejected.extend(row for row, _record in refused)
+                message_bus.publish(
+                    content=f"Supabase rejected {len(refused)} records of sheet {sheet_name} "
+                            f"(rows {', '.join(str(row + 1) for row, _record in refused[:10])}"
+                            f"{', ...' if len(refused) > 10 else ''}); they are skipped",
+                    level=MessageLevel.WARNING,
+                    metadata={"source": self.SOURCE}
+                )
+            # Every source row before the first unsettled one is written, refused or a duplicate
+            committed = queue[0][0] if queue else len(gs_data)
+            if committed and (written or refused):
+                self.checkpoint.update(sheet_name, committed=committed, last_hash=record_hash(gs_data[committed - 1]),
+                                       written=total_success, total=total_processed, rejected=rejected)
+
+            if transport_error is not None:
+                failures += 1
+                if failures > self.max_retries:
+                    message_bus.publish(
+                        content=f"Giving up on sheet {sheet_name} after {failures} failed batches; "
+                                f"the next transfer resumes at record {committed + 1}: {transport_error}",
+                        level=MessageLevel.ERROR,
+                        metadata={"source": self.SOURCE}
+                    )
+                    return total_processed, total_success
+                message_bus.publish(
+                    content=f"Batch of {len(batch)} records for sheet {sheet_name} failed "
+                            f"({len(written)} written), retrying with {sizer.size}: {transport_error}",
+                    level=MessageLevel.WARNING,
+                    metadata={"source": self.SOURCE}
+                )
+                time.sleep(self.retry_delay * failures)
+                continue
+
+            failures = 0
             message_bus.publish(
-                content=f"Processing batch {batch_idx + 1}/{len(batches)} for sheet: {sheet_name}",
+                content=f"Sheet {sheet_name}: {committed}/{total_processed} records "
+                        f"(batch of {len(batch)} in {elapsed * 1000:.0f} ms, next {sizer.size})",
                 level=MessageLevel.INFO,
                 metadata={"source": self.SOURCE}
             )
-            
-            # Format data in the expected batch format for the provider
-            supabase_batch = []
-            for item in batch:
-                supabase_batch.append({
-                    'data': item,
-                    'sheet': sheet_name
-                })
-            
-            # Submit the batch to Supabase
-            success = self.sb_provider.process_data(supabase_batch)
-            
-            # Update success counter
-            if success:
-                total_success += len(batch)  # This is approximate since we don't have item-level status
-            
-            # Add a small delay between batches to avoid rate limiting
-            if batch_idx < len(batches) - 1:  # Don't delay after the last batch
-                time.sleep(0.5)
-                
+
+        self.checkpoint.update(sheet_name, done=True)
         return total_processed, total_success
 
+    def _stored_hashes(self, sheet_name: str, table_name: str, index) -> Optional[Callable[[str], bool]]:
+        """
+        Membership test for the record hashes already stored in a table.
+
+        With the local hash index only the rows added since its last refresh are
+        downloaded; otherwise every hash_value of the table is fetched.
+
+        Returns:
+            Callable(hash) -> bool, or None if the table holds no hashes yet
+        """
+        if index is not None:
+            try:
+                added = index.refresh(table_name)
+                message_bus.publish(
+                    content=f"Record hash index for {table_name} refreshed ({added} new hashes)",
+                    level=MessageLevel.INFO,
+                    metadata={"source": self.SOURCE}
+                )
+                return lambda value: index.contains(table_name, value)
+            except Exception as e:
+                message_bus.publish(
+                    content=f"Could not refresh the record hash index for {table_name}, fetching all hashes: {e}",
+                    level=MessageLevel.WARNING,
+                    metadata={"source": self.SOURCE}
+                )
+
+        # Fetch only hashes from Supabase for efficient duplicate detection
+        message_bus.publish(
+            content=f"Fetching record hashes from Supabase for duplicate detection",
+            level=MessageLevel.INFO,
+            metadata={"source": self.SOURCE}
+        )
+        # Use the dedicated RPC function to get hashes
+        hashes = set(self.sb_provider.fetch_record_hashes(sheet_name))
+        return hashes.__contains__ if hashes else None
+
+    def get_transfer_sheets(self) -> List[str]:
+        """
+        Sheets moved by transfer_all_data, from config 'transfer_sheets'.
+
+        Returns:
+            List[str]: Sheet names, in the order they are submitted to the workers
+        """
+        sheets = self.config_manager.get('transfer_sheets', DEFAULT_TRANSFER_SHEETS)
+        if not isinstance(sheets, list) or not sheets:
+            message_bus.publish(
+                content="Config 'transfer_sheets' must be a non-empty list, using the default sheets",
+                level=MessageLevel.WARNING,
+                metadata={"source": self.SOURCE}
+            )
+            sheets = DEFAULT_TRANSFER_SHEETS
+        return list(dict.fromkeys(sheets))
+
+    def _transfer_sheet_safely(self, sheet: str, purge_first: bool) -> Tuple[int, int]:
+        """Worker body: transfer one sheet and report errors instead of raising."""
+        try:
+            # Determine whether to purge based on sheet name:
+            # - Tables WITH "_": Follow the purge_first parameter (for duplicate checking)
+            # - Tables WITHOUT "_": Always purge before transfer
+            if "_" in sheet:
+                sheet_purge_first = purge_first
+                message_bus.publish(
+                    content=f"Table {sheet} contains an underscore - {'checking for duplicates' if not purge_first else 'will be purged as requested'}",
+                    level=MessageLevel.INFO,
+                    metadata={"source": self.SOURCE}
+                )
+            else:
+                sheet_purge_first = True  # Always purge tables without underscore
+                message_bus.publish(
+                    content=f"Table {sheet} does not contain an underscore - will be purged before transfer (forced)",
+                    level=MessageLevel.INFO,
+                    metadata={"source": self.SOURCE}
+                )
+
+            return self.transfer_sheet(sheet, sheet_purge_first)
+        except Exception as e:
+            message_bus.publish(
+                content=f"Error transferring sheet '{sheet}': {e}",
+                level=MessageLevel.ERROR,
+                metadata={"source": self.SOURCE}
+            )
+            message_bus.publish(
+                content=traceback.format_exc(),
+                level=MessageLevel.DEBUG,
+                metadata={"source": self.SOURCE}
+            )
+            return 0, 0
+
     def transfer_all_data(self, purge_first: bool = True) -> Dict[str, Tuple[int, int]]:
         """
         Transfer all data from Google Sheets to Supabase.
-        
+
+        Sheets (config 'transfer_sheets') are transferred concurrently by up to
+        'transfer_workers' threads. Progress is checkpointed, so running the transfer
+        again after an interruption continues where it stopped.
+
         Args:
             purge_first (bool): Whether to check for duplicates on tables with "_" in name
             This will be overridden for:
             - Tables WITHOUT "_" in name: Always purged before transfer
             - Tables WITH "_" in name: Will respect purge_first parameter
-            
+
         Returns:
             Dict[str, Tuple[int, int]]: Results for each sheet (processed, successful)
         """
         # Set up data providers
         gs_connected, sb_connected = self.setup_providers()
-        
+
         if not gs_connected:
             message_bus.publish(
                 content="Google Sheets provider is not connected. Cannot transfer data.",
@@ -282,7 +565,7 @@ class DataTransfer:
                 metadata={"source": self.SOURCE}
             )
             return {}
-            
+
         if not sb_connected:
             message_bus.publish(
                 content="Supabase provider is not connected. Cannot transfer data.",
@@ -290,50 +573,34 @@ class DataTransfer:
                 metadata={"source": self.SOURCE}
             )
             return {}
-        
+
         # Get list of sheets to transfer
-        sheets = [
-                "SC_Default",
-                "EA_SquadronBattle",
-                "Materials"
-            ]        
-        # Transfer each sheet
-        results = {}
-        for sheet in sheets:
-            try:
-                # Determine whether to purge based on sheet name:
-                # - Tables WITH "_": Follow the purge_first parameter (for duplicate checking)
-                # - Tables WITHOUT "_": Always purge before transfer
-                if "_" in sheet:
-                    sheet_purge_first = purge_first
-                    message_bus.publish(
-                        content=f"Table {sheet} contains an underscore - {'checking for duplicates' if not purge_first else 'will be purged as requested'}",
-                        level=MessageLevel.INFO,
-                        metadata={"source": self.SOURCE}
-                    )
-                else:
-                    sheet_purge_first = True  # Always purge tables without underscore
-                    message_bus.publish(
-                        content=f"Table {sheet} does not contain an underscore - will be purged before transfer (forced)",
-                        level=MessageLevel.INFO,
-                        metadata={"source": self.SOURCE}
-                    )
-                
-                processed, success = self.transfer_sheet(sheet, sheet_purge_first)
-                results[sheet] = (processed, success)
-            except Exception as e:
-                message_bus.publish(
-                    content=f"Error transferring sheet '{sheet}': {e}",
-                    level=MessageLevel.ERROR,
-                    metadata={"source": self.SOURCE}
-                )
-                message_bus.publish(
-                    content=traceback.format_exc(),
-                    level=MessageLevel.DEBUG,
-                    metadata={"source": self.SOURCE}
-                )
-                results[sheet] = (0, 0)
-        
+        sheets = self.get_transfer_sheets()
+        if self.checkpoint.begin(purge_first):
+            message_bus.publish(
+                content=f"Resuming interrupted transfer from {self.checkpoint.path}",
+                level=MessageLevel.INFO,
+                metadata={"source": self.SOURCE}
+            )
+
+        # Transfer the sheets concurrently; each one writes to its own table
+        with ThreadPoolExecutor(max_workers=min(self.workers, len(sheets)),
+                                thread_name_prefix="DataTransfer") as executor:
+            futures = {sheet: executor.submit(self._transfer_sheet_safely, sheet, purge_first) for sheet in sheets}
+            results = {sheet: future.result() for sheet, future in futures.items()}
+
+        # Rows were written behind the providers' back
+        result_cache.clear()
+
+        if all(self.checkpoint.sheet(sheet).get('done') for sheet in sheets):
+            self.checkpoint.clear()
+        else:
+            message_bus.publish(
+                content=f"Transfer incomplete; run it again to resume from {self.checkpoint.path}",
+                level=MessageLevel.WARNING,
+                metadata={"source": self.SOURCE}
+            )
+
         # Summarize results
         total_processed = sum(processed for processed, _ in results.values())
         total_success = sum(success for _, success in results.values())
@@ -342,9 +609,9 @@ class DataTransfer:
             level=MessageLevel.INFO,
             metadata={"source": self.SOURCE}
         )
-        
+
         return results
-        
+
     def transfer_config(self) -> bool:
         """
         Transfer configuration data from Google Sheets to Supabase.
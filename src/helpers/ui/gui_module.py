@@ -882,9 +882,9 @@ class DataTransferDialog(wx.Dialog):
 
         # Batch size setting
         batch_sizer = wx.BoxSizer(wx.HORIZONTAL)
-        batch_label = wx.StaticText(options_box, label="Batch size:")
+        batch_label = wx.StaticText(options_box, label="Initial batch size:")
         self.batch_size_ctrl = wx.SpinCtrl(options_box, min=10, max=100, initial=50)
-        batch_tip = wx.StaticText(options_box, label="(Smaller batches are safer, but slower)")
+        batch_tip = wx.StaticText(options_box, label="(Adjusted during the transfer from insert speed)")
         batch_sizer.Add(batch_label, 0, wx.ALL | wx.ALIGN_CENTER_VERTICAL, 5)
         batch_sizer.Add(self.batch_size_ctrl, 0, wx.ALL | wx.ALIGN_CENTER_VERTICAL, 5)
         batch_sizer.Add(batch_tip, 0, wx.ALL | wx.ALIGN_CENTER_VERTICAL, 5)
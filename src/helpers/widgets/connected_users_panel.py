@@ -39,12 +39,13 @@ class ConnectedUsersPanel(wx.Panel):
         self._init_ui()
         
         # Suscribirse a eventos relevantes del MessageBus
-        message_bus.on("users_online_updated", self.update_users_list)
+        message_bus.on("users_online_delta", self.apply_users_delta)
         message_bus.on("shard_version_update", self.on_shard_version_update)
         message_bus.on("broadcast_ping_missing", lambda *a, **k: wx.CallAfter(self._on_broadcast_ping_missing))
         
         # Lista de usuarios actualmente conectados
         self.users_online = []
+        self.users_by_name = {}  # username -> entrada de presencia (mantenida con los deltas)
         
     def _init_ui(self):
         """Inicializa los componentes de la interfaz de usuario"""
@@ -318,39 +319,66 @@ class ConnectedUsersPanel(wx.Panel):
                 elif isinstance(child, wx.CheckBox):
                     child.SetForegroundColour(dark_row_fg)
 
+    def _ensure_image_list(self):
+        if getattr(self, 'img_list', None) is None:
+            self.img_list = wx.ImageList(16, 16)
+            self.img_list.Add(self.CHECKED_IMG)
+            self.img_list.Add(self.UNCHECKED_IMG)
+            self.users_list.AssignImageList(self.img_list, wx.IMAGE_LIST_SMALL)
+
+    def _set_user_row(self, index, user):
+        """Escribe los datos de un usuario en una fila existente de la lista"""
+        username = user.get('username', 'Unknown')
+        shard = user.get('shard', 'Unknown')
+        version = user.get('version', 'Unknown')
+        status = user.get('status', 'Unknown')
+        mode = user.get('mode', 'Unknown') or 'Unknown'  # fallback seguro
+        last_active = user.get('last_active', 'Unknown')
+
+        # Convertir timestamp ISO a formato más legible
+        try:
+            dt = datetime.fromisoformat(last_active.replace('Z', '+00:00'))
+            last_active_str = dt.strftime('%Y-%m-%d %H:%M:%S')
+        except:
+            last_active_str = last_active
+
+        # Checkbox state
+        checked = self.user_filter_states.get(username, False)
+        self.users_list.SetItemImage(index, 0 if checked else 1)
+        self.users_list.SetItem(index, 1, username)
+        self.users_list.SetItem(index, 2, str(shard))
+        self.users_list.SetItem(index, 3, str(version))
+        self.users_list.SetItem(index, 4, str(status))
+        self.users_list.SetItem(index, 5, str(mode))
+        self.users_list.SetItem(index, 6, str(last_active_str))
+
+    def _find_user_row(self, username):
+        for index in range(self.users_list.GetItemCount()):
+            if self.users_list.GetItemText(index, 1) == username:
+                return index
+        return -1
+
     def _update_ui_users_list(self):
         """Actualiza la UI con la lista de usuarios conectados"""
         self.users_list.DeleteAllItems()
+        self._ensure_image_list()
         for i, user in enumerate(self.users_online):
-            username = user.get('username', 'Unknown')
-            shard = user.get('shard', 'Unknown')
-            version = user.get('version', 'Unknown')
-            status = user.get('status', 'Unknown')
-            mode = user.get('mode', 'Unknown') or 'Unknown'  # fallback seguro
-            last_active = user.get('last_active', 'Unknown')
-            
-            # Convertir timestamp ISO a formato más legible
-            try:
-                dt = datetime.fromisoformat(last_active.replace('Z', '+00:00'))
-                last_active_str = dt.strftime('%Y-%m-%d %H:%M:%S')
-            except:
-                last_active_str = last_active
-            
-            # Checkbox state
-            checked = self.user_filter_states.get(username, False)
-            img_idx = 0 if checked else 1
-            if i == 0:
-                self.img_list = wx.ImageList(16, 16)
-                self.img_list.Add(self.CHECKED_IMG)
-                self.img_list.Add(self.UNCHECKED_IMG)
-                self.users_list.AssignImageList(self.img_list, wx.IMAGE_LIST_SMALL)
-            index = self.users_list.InsertItem(i, "", img_idx)
-            self.users_list.SetItem(index, 1, username)
-            self.users_list.SetItem(index, 2, str(shard))
-            self.users_list.SetItem(index, 3, str(version))
-            self.users_list.SetItem(index, 4, str(status))
-            self.users_list.SetItem(index, 5, str(mode))
-            self.users_list.SetItem(index, 6, str(last_active_str))
+            index = self.users_list.InsertItem(i, "", 1)
+            self._set_user_row(index, user)
+        self.users_list.Refresh()
+
+    def _apply_users_delta_ui(self, delta):
+        """Aplica un delta de presencia tocando solo las filas afectadas"""
+        self._ensure_image_list()
+        for username in delta.get('left', []):
+            index = self._find_user_row(username)
+            if index != -1:
+                self.users_list.DeleteItem(index)
+        for user in delta.get('joined', []) + delta.get('updated', []):
+            index = self._find_user_row(user.get('username'))
+            if index == -1:
+                index = self.users_list.InsertItem(self.users_list.GetItemCount(), "", 1)
+            self._set_user_row(index, user)
         self.users_list.Refresh()
 
     def on_user_filter_toggle(self, event):
@@ -359,16 +387,28 @@ class ConnectedUsersPanel(wx.Panel):
         username = self.users_list.GetItemText(index, 1)
         current = self.user_filter_states.get(username, False)
         self.user_filter_states[username] = not current
-        self._update_ui_users_list()
+        self.users_list.SetItemImage(index, 0 if not current else 1)
         self._update_backend_user_filter()
 
     def update_users_list(self, users_online):
         """
         Actualiza la lista de usuarios conectados. El control de pings ya no depende de presencia ni de broadcast_ping_received.
         """
-        self.users_online = users_online
+        self.users_by_name = {user.get('username'): user for user in users_online}
+        self.users_online = list(self.users_by_name.values())
         wx.CallAfter(self._update_ui_users_list)
 
+    def apply_users_delta(self, delta):
+        """
+        Aplica un evento 'users_online_delta' (usuarios que entran, cambian o salen) sin redibujar la lista entera.
+        """
+        for username in delta.get('left', []):
+            self.users_by_name.pop(username, None)
+        for user in delta.get('joined', []) + delta.get('updated', []):
+            self.users_by_name[user.get('username')] = user
+        self.users_online = list(self.users_by_name.values())
+        wx.CallAfter(self._apply_users_delta_ui, delta)
+
     def on_shard_version_update(self, shard, version, username, mode=None, private=None):
         """
         Maneja las actualizaciones de shard y versión, ahora con info de lobby privado (argumento extra).
@@ -444,7 +484,8 @@ class ConnectedUsersPanel(wx.Panel):
             main_frame = wx.GetTopLevelParent(self)
             realtime_bridge = main_frame.realtime_bridge
             if 'general' in realtime_bridge.channels:
-                realtime_bridge._handle_presence_sync(realtime_bridge.channels['general'])
+                realtime_bridge._handle_presence_sync(realtime_bridge.channels['general'], force=True)
+                self.update_users_list(realtime_bridge.get_connected_users())
         except Exception as e:
             message_bus.publish(
                 content=f"Error refreshing users list: {e}",
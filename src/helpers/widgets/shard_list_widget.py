@@ -38,7 +38,7 @@ class ShardListWidget(wx.Panel):
         
     def _subscribe_events(self):
         message_bus.on('shard_version_update', self._on_local_shard)
-        message_bus.on('users_online_updated', self._on_users_online_updated)
+        message_bus.on('users_online_delta', self._on_users_online_delta)
         message_bus.on('mode_change', self._on_mode_change)
         
     def _parse_shard(self, shard_full):
@@ -57,8 +57,9 @@ class ShardListWidget(wx.Panel):
     def _on_local_shard(self, shard, version, username, mode=None, private=None):
         self._add_shard_entry(username, shard)
         
-    def _on_users_online_updated(self, users_online):
-        for user in users_online:
+    def _on_users_online_delta(self, delta):
+        # Solo los usuarios que entran o cambian pueden traer un shard nuevo
+        for user in delta.get('joined', []) + delta.get('updated', []):
             username = user.get('username')
             shard = user.get('shard')
             if username and shard and shard != 'Unknown':
@@ -2,52 +2,143 @@
 CLI de test de presencia y broadcast para SCLogAnalyzer
 Permite simular múltiples usuarios, cada uno con su propia instancia de RealtimeBridge.
 No usa wx ni GUI, solo stdout. Uso: python src/test_realtime_cli.py --users 3
+
+Modo carga (--duration): todos los usuarios empiezan a la vez y envían eventos durante
+--duration segundos con la tasa (--rate, eventos/s por usuario, llegadas de Poisson) y la
+mezcla (--mix) indicadas. Cada evento lleva número de secuencia y hora de envío; cada
+cliente anota cuándo lo recibe del canal ('received', antes de los filtros) y cuándo sale
+por remote_realtime_event ('delivered', lo que ve la UI; los pings no llegan a esta fase).
+Al terminar se muestran latencias p50/p95/p99, pérdidas, frames/s y CPU/memoria por
+cliente, y con --json se exporta todo. Las latencias usan el reloj de la máquina: los
+procesos deben compartir máquina (o tener los relojes sincronizados).
+
+Con --transport local no hace falta Supabase: el proceso principal arranca un hub local
+por TCP que comparten todos los usuarios simulados.
+Ejemplo: python src/test_realtime_cli.py --users 20 --transport local --duration 60 --rate 2 --json load.json
 """
 import argparse
+import asyncio
+import json
 import subprocess
 import sys
+import tempfile
+import threading
 import time
 import os
+from collections import Counter, defaultdict
 from datetime import datetime
 import random
 
+import psutil
+
 # Desactivar la redirección de stdout a message_bus
 os.environ['SCLOG_DISABLE_STDOUT_REDIRECT'] = '1'
 
 sys.path.append('./src')
 from helpers.core.realtime_bridge import RealtimeBridge
+from helpers.core.realtime_transport import LocalRealtimeServer
 from helpers.core.config_utils import ConfigManager
 from helpers.core.message_bus import message_bus, setup_console_handler
 from helpers.core import supabase_manager
 
-setup_console_handler(debug=True, replay_history=False)
-message_bus.set_debug_mode(True)
+# Tipos de evento simulados: nombre en --mix -> 'type' del evento realtime
+EVENT_TYPES = {
+    'kill': 'player_death',
+    'stall': 'actor_stall',
+    'chat': 'chat_message',
+    'ping': 'ping',
+}
+DEFAULT_MIX = 'kill=50,stall=20,chat=20,ping=10'
+PERCENTILES = (50, 95, 99)
+
+
+def parse_mix(text):
+    """Parse 'kill=50,stall=20,...' into {kind: weight}."""
+    mix = {}
+    for part in text.split(','):
+        kind, _, weight = part.partition('=')
+        kind = kind.strip()
+        if kind not in EVENT_TYPES:
+            raise argparse.ArgumentTypeError(f"unknown event kind '{kind}' (use {', '.join(EVENT_TYPES)})")
+        mix[kind] = float(weight or 1)
+    if not any(weight > 0 for weight in mix.values()):
+        raise argparse.ArgumentTypeError("the event mix needs at least one positive weight")
+    return mix
+
+
+def build_event(kind, username, seq):
+    """Realtime event of the given kind carrying the load-test probe (sender, seq, send time)."""
+    now = datetime.now().isoformat()
+    # NPC names keep stalls clear of the stalled-if-online filter
+    npc = f"NPC_{random.randint(1, 500)}"
+    if kind == 'kill':
+        event = {'type': 'player_death', 'timestamp': now, 'content': f"{username} killed {npc}",
+                 'raw_data': {'killer': username, 'victim': npc, 'weapon': 'load_test'}}
+    elif kind == 'stall':
+        event = {'type': 'actor_stall', 'timestamp': now, 'content': f"{npc} stalled",
+                 'raw_data': {'player': npc}}
+    elif kind == 'chat':
+        message = {'sender': username, 'text': f"load test message {seq}", 'timestamp': now}
+        event = {'type': 'chat_message', 'chat': 'general', 'message': message,
+                 'timestamp': now, 'sender': username}
+    else:
+        event = {'type': 'ping', 'username': username, 'timestamp': now}
+    event['load_test'] = {'sender': username, 'seq': seq, 'sent_at': time.time()}
+    return event
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(1, int(round(pct / 100.0 * len(sorted_values) + 0.5)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
 
 class TestUser:
-    def __init__(self, username, shard="TestShard", version="test-v1.0"):
+    def __init__(self, username, shard="TestShard", version="test-v1.0", interval=None, verbose=True):
         self.username = username
+        self.interval = interval  # Segundos entre broadcasts (None = aleatorio entre 10 y 20)
         self.shard = shard
         self.version = version
+        self.verbose = verbose
         self.bridge = None
         self.running = False
+        # Modo carga
+        self.sent = Counter()  # kind -> eventos enviados
+        self.samples = {'received': [], 'delivered': []}  # [sender, seq, type, latency_ms]
+        self._samples_lock = threading.Lock()
+        self.resources = []  # (cpu %, rss bytes)
 
-    def start(self):
-        try:
-            print(f"[{self.username}] Starting simulated user...")
-            config = ConfigManager()
+    def log(self, text):
+        if self.verbose:
+            print(f"[{self.username}] {text}")
+
+    def connect(self, transport='supabase', batch_ms=None):
+        print(f"[{self.username}] Starting simulated user...")
+        config = ConfigManager()
+        config.set('realtime_transport', transport)
+        if batch_ms is not None:
+            config.set('realtime_batch_window_ms', batch_ms)
+        supabase_client = None
+        if transport == 'supabase':
             supabase_client = supabase_manager.supabase_manager.connect(config)
-            print(f"[{self.username}] Obtenido supabase_client: {supabase_client}")
-            self.bridge = RealtimeBridge(config_manager=config, supabase_client=supabase_client, use_singleton=True)
-            print(f"[{self.username}] Instanciado RealtimeBridge")
-            self.bridge.shard = self.shard
-            self.bridge.version = self.version
-            print(f"[{self.username}] Seteados username, shard y version")
-            self.bridge.set_username(self.username)
-            print(f"[{self.username}] RealtimeBridge conectado (canales y heartbeat inicializados)")
-            self.running = True
-            message_bus.on("users_online_updated", self.on_users_online)
-            message_bus.on("remote_realtime_event", self.on_remote_event)
-            print(f"[{self.username}] Suscrito a eventos de presencia y broadcast")
+            self.log(f"Obtenido supabase_client: {supabase_client}")
+        self.bridge = RealtimeBridge(config_manager=config, supabase_client=supabase_client, use_singleton=True)
+        self.log("Instanciado RealtimeBridge")
+        self.bridge.shard = self.shard
+        self.bridge.version = self.version
+        self.log("Seteados username, shard y version")
+        self.bridge.set_username(self.username)
+        self.log("RealtimeBridge conectado (canales y heartbeat inicializados)")
+        self.running = True
+        message_bus.on("users_online_updated", self.on_users_online)
+        message_bus.on("remote_realtime_event", self.on_remote_event)
+        self.log("Suscrito a eventos de presencia y broadcast")
+
+    def start(self, transport='supabase', batch_ms=None):
+        try:
+            self.connect(transport, batch_ms)
             self.activity_loop()
         except Exception as e:
             print(f"[{self.username}] ERROR en start: {e}")
@@ -65,14 +156,95 @@ class TestUser:
                 }
                 self.bridge._handle_realtime_event(msg)
                 print(f"[{self.username}] Sent broadcast message: {msg}")
+                self.print_broadcast_stats()
             except Exception as e:
                 print(f"[{self.username}] ERROR enviando broadcast: {e}")
-            time.sleep(random.randint(10, 20))
+            time.sleep(self.interval if self.interval else random.randint(10, 20))
+
+    def print_broadcast_stats(self):
+        stats = self.bridge.get_broadcast_stats()
+        cpu = time.process_time() / stats['elapsed'] * 100
+        print(f"[{self.username}] [stats] sent {stats['events_sent']} events in {stats['frames_sent']} frames "
+              f"({stats['frames_sent_per_sec']:.2f} frames/s), received {stats['events_received']} events in "
+              f"{stats['frames_received']} frames ({stats['frames_received_per_sec']:.2f} frames/s), CPU {cpu:.1f}%")
+
+    # --- Modo carga ---
+
+    def _record(self, stage, event_data):
+        probe = event_data.get('load_test') if isinstance(event_data, dict) else None
+        if not probe:
+            return
+        latency_ms = (time.time() - probe['sent_at']) * 1000
+        with self._samples_lock:
+            self.samples[stage].append([probe['sender'], probe['seq'], event_data.get('type'), round(latency_ms, 3)])
+
+    def _probe_received(self):
+        """Note every event the channel hands to the bridge, before its filters (batches already unpacked)."""
+        process = self.bridge._process_realtime_event_broadcast
+
+        def recording(payload):
+            self._record('received', payload.get('payload', {}).get('event_data', {}))
+            process(payload)
+        self.bridge._process_realtime_event_broadcast = recording
+
+    def _sample_resources(self, until):
+        process = psutil.Process()
+        process.cpu_percent(None)
+        while self.running and time.time() < until:
+            time.sleep(1)
+            self.resources.append((process.cpu_percent(None), process.memory_info().rss))
+
+    def run_load(self, start_at, duration, rate, mix, drain):
+        """Send events from start_at for duration seconds, then wait drain seconds for stragglers."""
+        self._probe_received()
+        end = start_at + duration
+        threading.Thread(target=self._sample_resources, args=(end + drain,), daemon=True).start()
+        self.log(f"Waiting {max(0.0, start_at - time.time()):.1f}s for the synchronized start")
+        time.sleep(max(0.0, start_at - time.time()))
+
+        kinds = list(mix)
+        weights = [mix[kind] for kind in kinds]
+        seq = 0
+        next_at = start_at
+        while self.running:
+            next_at += random.expovariate(rate)
+            if next_at >= end:
+                break
+            time.sleep(max(0.0, next_at - time.time()))
+            kind = random.choices(kinds, weights)[0]
+            seq += 1
+            try:
+                self.bridge._handle_realtime_event(build_event(kind, self.username, seq))
+                self.sent[kind] += 1
+            except Exception as e:
+                print(f"[{self.username}] ERROR enviando broadcast: {e}")
+        time.sleep(max(0.0, end + drain - time.time()))
+        return self.result()
+
+    def result(self):
+        cpu = [cpu for cpu, _ in self.resources]
+        with self._samples_lock:
+            samples = {stage: list(values) for stage, values in self.samples.items()}
+        return {
+            'username': self.username,
+            'pid': os.getpid(),
+            'sent': dict(self.sent),
+            'sent_total': sum(self.sent.values()),
+            'cpu_avg': sum(cpu) / len(cpu) if cpu else None,
+            'cpu_max': max(cpu) if cpu else None,
+            'rss_max_mb': max(rss for _, rss in self.resources) / 2 ** 20 if self.resources else None,
+            'broadcast': self.bridge.get_broadcast_stats(),
+            'coroutines': self.bridge.get_coroutine_stats(),
+            'samples': samples,
+        }
 
     def on_users_online(self, users_online):
-        print(f"[{self.username}] Users online (evento): {users_online}")
+        self.log(f"Users online (evento): {users_online}")
 
     def on_remote_event(self, username, event_data):
+        self._record('delivered', event_data)
+        if not self.verbose:
+            return
         print(f"[{self.username}] Received event from {username}: {event_data}")
         if username != self.username:
             print(f"[{self.username}] (evento externo) {event_data}")
@@ -84,10 +256,104 @@ class TestUser:
             self.bridge.disconnect()
         print(f"[{self.username}] Stopped.")
 
+
+def aggregate(results, config, hub_stats=None):
+    """
+    Combine the clients' results into the load report.
+
+    Every client receives every event (the channel echoes to the sender too), so a stage's
+    expected count is the events sent multiplied by the number of clients; pings never
+    reach 'delivered'.
+    """
+    sent_by_type = Counter()
+    for result in results:
+        for kind, count in result['sent'].items():
+            sent_by_type[EVENT_TYPES[kind]] += count
+    receivers = len(results)
+
+    stages = {}
+    for stage in ('received', 'delivered'):
+        by_type = defaultdict(list)
+        seen = set()
+        duplicates = 0
+        for result in results:
+            for sender, seq, event_type, latency_ms in result['samples'][stage]:
+                key = (result['username'], sender, seq)
+                if key in seen:
+                    duplicates += 1
+                    continue
+                seen.add(key)
+                by_type[event_type].append(latency_ms)
+        expected_types = [t for t in sent_by_type if stage == 'received' or t != 'ping']
+        expected = sum(sent_by_type[t] for t in expected_types) * receivers
+        latency = {}
+        for event_type in sorted(set(by_type) | set(expected_types)):
+            values = sorted(by_type.get(event_type, []))
+            type_expected = sent_by_type.get(event_type, 0) * receivers
+            latency[event_type] = {
+                'count': len(values),
+                'expected': type_expected,
+                'loss_pct': (1 - len(values) / type_expected) * 100 if type_expected else None,
+                **{f'p{pct}': percentile(values, pct) for pct in PERCENTILES},
+                'max': values[-1] if values else None,
+            }
+        all_values = sorted(value for values in by_type.values() for value in values)
+        stages[stage] = {
+            'expected': expected,
+            'count': len(seen),
+            'lost': max(0, expected - len(seen)),
+            'loss_pct': (1 - len(seen) / expected) * 100 if expected else None,
+            'duplicates': duplicates,
+            'latency_ms': {**{f'p{pct}': percentile(all_values, pct) for pct in PERCENTILES},
+                           'max': all_values[-1] if all_values else None},
+            'by_type': latency,
+        }
+
+    clients = {
+        result['username']: {key: result[key] for key in
+                             ('pid', 'sent', 'sent_total', 'cpu_avg', 'cpu_max', 'rss_max_mb', 'broadcast', 'coroutines')}
+        for result in results
+    }
+    return {'config': config, 'sent': dict(sent_by_type), 'stages': stages, 'clients': clients, 'hub': hub_stats}
+
+
+def _fmt(value, spec='.1f'):
+    return '-' if value is None else format(value, spec)
+
+
+def print_report(report):
+    config = report['config']
+    print(f"\n=== Realtime load: {config['users']} users, {config['rate']} events/s each, "
+          f"{config['duration']}s, transport {config['transport']} ===")
+    for stage, data in report['stages'].items():
+        latency = data['latency_ms']
+        print(f"\n[{stage}] {data['count']}/{data['expected']} events, loss {_fmt(data['loss_pct'], '.2f')}%, "
+              f"duplicates {data['duplicates']}, latency ms p50 {_fmt(latency['p50'])} "
+              f"p95 {_fmt(latency['p95'])} p99 {_fmt(latency['p99'])} max {_fmt(latency['max'])}")
+        for event_type, values in data['by_type'].items():
+            print(f"    {event_type:<14} {values['count']:>7}/{values['expected']:<7} loss {_fmt(values['loss_pct'], '.2f'):>6}%  "
+                  f"p50 {_fmt(values['p50']):>8}  p95 {_fmt(values['p95']):>8}  p99 {_fmt(values['p99']):>8}")
+    print("\nClients:")
+    for username, client in sorted(report['clients'].items()):
+        broadcast = client['broadcast']
+        print(f"    {username:<12} sent {client['sent_total']:>6}  frames out {broadcast['frames_sent_per_sec']:>6.2f}/s  "
+              f"in {broadcast['frames_received_per_sec']:>7.2f}/s  CPU avg {_fmt(client['cpu_avg']):>5}% "
+              f"max {_fmt(client['cpu_max']):>5}%  RSS {_fmt(client['rss_max_mb'])} MB")
+    if report.get('hub'):
+        print(f"\nHub: {report['hub']}")
+
+
+def start_local_hub(port):
+    """Run a LocalRealtimeServer on a background loop; returns (server, loop)."""
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, name="LocalRealtimeHub", daemon=True).start()
+    server = asyncio.run_coroutine_threadsafe(LocalRealtimeServer(port=port).start(), loop).result(10)
+    return server, loop
+
+
 def print_all_messages(*args, **kwargs):
     print(f"[MessageBus] args={args} kwargs={kwargs}")
 
-message_bus.on("*", print_all_messages)
 
 def main():
     parser = argparse.ArgumentParser(description="Test CLI for SCLogAnalyzer RealtimeBridge (multiproceso)")
@@ -96,22 +362,67 @@ def main():
     group.add_argument('--username', type=str, help='Nombre de usuario simulado (modo usuario único)')
     parser.add_argument('--shard', type=str, default='TestShard', help='Shard a usar (opcional)')
     parser.add_argument('--version', type=str, default='test-v1.0', help='Versión a usar (opcional)')
+    parser.add_argument('--interval', type=float, default=None, help='Segundos entre broadcasts de cada usuario (opcional, por defecto aleatorio 10-20)')
+    parser.add_argument('--transport', type=str, default='supabase', help="'supabase', 'local' (hub TCP arrancado por este proceso) o 'local://host:puerto'")
+    parser.add_argument('--hub-port', type=int, default=0, help='Puerto del hub local con --transport local (0 = libre)')
+    parser.add_argument('--stagger', type=float, default=2.0, help='Segundos entre el arranque de cada proceso de usuario')
+    parser.add_argument('--batch-ms', type=int, default=None, help='Ventana de agrupación de broadcasts (realtime_batch_window_ms, 0 = sin agrupar)')
+    parser.add_argument('--verbose', action='store_true', help='Mostrar todos los mensajes (por defecto solo fuera del modo carga)')
+    load = parser.add_argument_group('modo carga')
+    load.add_argument('--duration', type=float, default=None, help='Segundos de envío; activa el modo carga')
+    load.add_argument('--rate', type=float, default=1.0, help='Eventos por segundo de cada usuario')
+    load.add_argument('--mix', type=parse_mix, default=parse_mix(DEFAULT_MIX), help=f'Mezcla de eventos (por defecto {DEFAULT_MIX})')
+    load.add_argument('--drain', type=float, default=5.0, help='Segundos de espera tras el envío para eventos en vuelo')
+    load.add_argument('--warmup', type=float, default=5.0, help='Segundos extra antes del inicio sincronizado')
+    load.add_argument('--json', type=str, default=None, help='Exportar el informe a este fichero JSON')
+    load.add_argument('--start-at', type=float, default=None, help=argparse.SUPPRESS)
+    load.add_argument('--result-file', type=str, default=None, help=argparse.SUPPRESS)
     args = parser.parse_args()
 
+    verbose = args.verbose or not args.duration
+    setup_console_handler(debug=verbose, replay_history=False)
+    message_bus.set_debug_mode(verbose)
+    if verbose:
+        message_bus.on("*", print_all_messages)
+    mix_arg = ','.join(f"{kind}={weight:g}" for kind, weight in args.mix.items())
+
     if args.users:
         # Multiproceso: lanzar N procesos independientes
+        hub, transport = None, args.transport
+        if transport == 'local':
+            hub, _ = start_local_hub(args.hub_port)
+            transport = f"local://127.0.0.1:{hub.port}"
+            print(f"[Main] Hub local escuchando en 127.0.0.1:{hub.port}")
+        result_dir = tempfile.mkdtemp(prefix='realtime_load_') if args.duration else None
+        start_at = time.time() + args.users * args.stagger + args.warmup if args.duration else None
+
         processes = []
         for i in range(args.users):
             username = f"testuser{i+1}"
-            cmd = [sys.executable, __file__, '--username', username, '--shard', args.shard, '--version', args.version]
+            cmd = [sys.executable, __file__, '--username', username, '--shard', args.shard, '--version', args.version,
+                   '--transport', transport]
+            if args.interval:
+                cmd += ['--interval', str(args.interval)]
+            if args.batch_ms is not None:
+                cmd += ['--batch-ms', str(args.batch_ms)]
+            if args.verbose:
+                cmd.append('--verbose')
+            if args.duration:
+                cmd += ['--duration', str(args.duration), '--rate', str(args.rate), '--mix', mix_arg,
+                        '--drain', str(args.drain), '--start-at', str(start_at),
+                        '--result-file', os.path.join(result_dir, f"{username}.json")]
             print(f"[Main] Lanzando proceso para {username}: {cmd}")
             proc = subprocess.Popen(cmd)
             processes.append(proc)
-            time.sleep(2)  # Escalonar conexiones
+            time.sleep(args.stagger)  # Escalonar conexiones
         print(f"[Main] Lanzados {args.users} procesos de usuario. Ctrl+C para detener.")
         try:
-            while True:
-                time.sleep(1)
+            if args.duration:
+                for proc in processes:
+                    proc.wait()
+            else:
+                while True:
+                    time.sleep(1)
         except KeyboardInterrupt:
             print("\n[Main] Deteniendo todos los procesos de usuario...")
             for proc in processes:
@@ -119,15 +430,57 @@ def main():
             for proc in processes:
                 proc.wait()
             print("[Main] Todos los procesos detenidos.")
+        if args.duration:
+            results = []
+            for name in sorted(os.listdir(result_dir)):
+                with open(os.path.join(result_dir, name), encoding='utf-8') as result_file:
+                    results.append(json.load(result_file))
+            if len(results) < args.users:
+                print(f"[Main] Solo {len(results)}/{args.users} usuarios entregaron resultados")
+            if results:
+                finish(results, args, transport, hub.hub.get_stats() if hub else None)
     elif args.username:
         # Modo usuario único: simular un usuario en este proceso
-        user = TestUser(args.username, shard=args.shard, version=args.version)
+        user = TestUser(args.username, shard=args.shard, version=args.version, interval=args.interval, verbose=verbose)
         user.running = True
+        if not args.duration:
+            try:
+                user.start(args.transport, args.batch_ms)
+            except KeyboardInterrupt:
+                print("\n[SingleUser] Deteniendo usuario...")
+                user.stop()
+            return
         try:
-            user.start()
+            hub = None
+            transport = args.transport
+            if transport == 'local':
+                hub, _ = start_local_hub(args.hub_port)
+                transport = f"local://127.0.0.1:{hub.port}"
+            user.connect(transport, args.batch_ms)
+            start_at = args.start_at or time.time() + args.warmup
+            result = user.run_load(start_at, args.duration, args.rate, args.mix, args.drain)
         except KeyboardInterrupt:
             print("\n[SingleUser] Deteniendo usuario...")
             user.stop()
+            return
+        user.stop()
+        if args.result_file:
+            with open(args.result_file, 'w', encoding='utf-8') as result_file:
+                json.dump(result, result_file)
+        else:
+            finish([result], args, transport, hub.hub.get_stats() if hub else None)
+
+
+def finish(results, args, transport, hub_stats):
+    config = {'users': len(results), 'rate': args.rate, 'duration': args.duration,
+              'mix': args.mix, 'transport': transport, 'batch_ms': args.batch_ms}
+    report = aggregate(results, config, hub_stats)
+    print_report(report)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as report_file:
+            json.dump(report, report_file, indent=2)
+        print(f"\n[Main] Informe exportado a {args.json}")
+
 
 if __name__ == "__main__":
     main()